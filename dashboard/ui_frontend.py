@@ -4,23 +4,36 @@ Secure Streamlit Dashboard for NIFTY Options Trading System
 
 # -*- coding: utf-8 -*-
 import streamlit as st
+import streamlit.components.v1 as components
 # import streamlit_authenticator as stauth  # Temporarily disabled
 import yaml
-from yaml.loader import SafeLoader
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml C binding when available
+except ImportError:
+    from yaml.loader import SafeLoader
+import numpy as np
 import pandas as pd
-from datetime import datetime, date, timedelta, timezone as dt_timezone
+from datetime import datetime, date, time as dt_time, timedelta, timezone as dt_timezone
 import os
 import sys
 import io
+import base64
+import logging
 import wave
 import math
 from logzero import logger
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+import asyncio
 import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
+from functools import lru_cache
 import pytz
+from zoneinfo import ZoneInfo
 from typing import Any, Dict, Optional
 
 
@@ -218,7 +231,13 @@ from engine.event_bus import get_event_bus
 from engine.state_store import get_state_store
 from engine.state_persistence import get_state_persistence
 from engine.websocket_server import start_websocket_server, stop_websocket_server
+from engine.performance_cache import TokenBucket
 from engine.websocket_client import get_websocket_client
+from engine.db import get_session, init_database
+from engine.models import MissedTrade
+from engine.pnl_service import compute_realized_pnl, max_trade_id, pnl_timeseries
+from engine.ai_analysis import analyze_trades
+from sqlalchemy.exc import OperationalError
 from dashboard.auth_page import (
     render_login_page,
     load_persisted_firebase_session,
@@ -320,11 +339,219 @@ def load_config():
     
     return config
 
-# Initialize database on startup
-try:
-    from engine.db import init_database
+@st.cache_resource(show_spinner=False)
+def _ensure_database() -> bool:
+    """Run the create_all DDL once per process instead of on every rerun."""
     init_database(create_all=True)
     logger.info("Database initialized successfully")
+    return True
+
+
+def _trades_version(org_id: str, user_id: str) -> int:
+    """Change token for the tenant's trades table (0 when it is unreadable)."""
+    try:
+        return max_trade_id(org_id, user_id)
+    except Exception:
+        return 0
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_realized_pnl(org_id: str, user_id: str, version: int = 0) -> Dict[str, Any]:
+    """Realized P&L snapshot; ``version`` (max trade id) invalidates it when a trade lands."""
+    try:
+        return compute_realized_pnl(org_id, user_id)
+    except OperationalError:
+        # Tables may have been dropped underneath us; recreate and retry once
+        _ensure_database.clear()
+        _ensure_database()
+        return compute_realized_pnl(org_id, user_id)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_pnl_timeseries(org_id: str, user_id: str, version: int = 0) -> list:
+    """Daily net cash-flow series, recomputed only when ``version`` moves or the TTL lapses."""
+    return pnl_timeseries(org_id, user_id)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_analyze_trades(org_id: str, user_id: str, lookback: int, version: int = 0) -> Dict[str, Any]:
+    """Insights aggregates; the TTL also lets the lookback window slide forward."""
+    return analyze_trades(org_id, user_id, lookback_days=lookback)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_recent_trades(n: int, log_version: tuple, _trade_logger) -> pd.DataFrame:
+    """Last ``n`` logged trades; ``log_version`` re-reads them once the trade log changes."""
+    return _trade_logger.get_recent_trades(n)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_pnl_series(log_version: tuple, _trade_logger) -> np.ndarray:
+    """Timestamp-ordered per-trade P&L, re-read only when the trade log changes."""
+    return _trade_logger.get_pnl_series_sorted()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_trade_stats(log_version: tuple, _trade_logger) -> Dict[str, Any]:
+    """Trade log summary statistics, recomputed only when the log changes."""
+    return _trade_logger.get_trade_stats()
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _cached_csv_bytes(fingerprint: tuple, _df: pd.DataFrame) -> bytes:
+    """CSV download payload; ``fingerprint`` identifies ``_df`` so it is serialised once per change."""
+    return _df.to_csv(index=False).encode('utf-8')
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_journal_trades(log_version: tuple, _trade_logger) -> pd.DataFrame:
+    """Full trade log with parsed timestamps, re-read only when the log changes."""
+    return _trade_logger.get_all_trades(parse_timestamps=True)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_pnl_kpis(log_version: tuple, lookback: int, _trade_logger) -> Dict[str, float]:
+    """
+    Win/loss counts, averages, win rate and risk:reward over the last ``lookback`` days.
+    
+    The TTL lets the window slide forward, matching _cached_analyze_trades.
+    """
+    pnl = _trade_logger.get_pnl_series_sorted(since=datetime.now() - timedelta(days=lookback))
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+    avg_win = float(wins.mean()) if wins.size else 0.0
+    avg_loss = float(losses.mean()) if losses.size else 0.0
+    return {
+        'winning_trades': int(wins.size),
+        'losing_trades': int(losses.size),
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'win_rate': (wins.size / pnl.size * 100) if pnl.size else 0.0,
+        'risk_reward': (avg_win / abs(avg_loss)) if avg_loss else 0.0,
+    }
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _pnl_breakdown_figure(realized_pnl: float, unrealized_pnl: float) -> Dict[str, Any]:
+    """Realized vs unrealized bar chart as a Plotly dict."""
+    fig = go.Figure(data=[
+        go.Bar(name='Realized P&L', x=['P&L'], y=[realized_pnl], marker_color='green' if realized_pnl >= 0 else 'red'),
+        go.Bar(name='Unrealized P&L', x=['P&L'], y=[unrealized_pnl], marker_color='orange')
+    ])
+    fig.update_layout(
+        title="P&L Breakdown",
+        xaxis_title="",
+        yaxis_title="Amount (₹)",
+        height=400,
+        showlegend=True
+    )
+    return fig.to_dict()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _daily_pnl_figure(series: list) -> Optional[Dict[str, Any]]:
+    """Daily P&L trend as a Plotly dict, or None when the series has no dates."""
+    s_df = pd.DataFrame(series)
+    if 'date' not in s_df.columns:
+        return None
+    s_df['date'] = pd.to_datetime(s_df['date'])
+    s_df = s_df.sort_values('date')
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=s_df['date'],
+        y=s_df['pnl'] if 'pnl' in s_df.columns else s_df.iloc[:, 1],
+        mode='lines+markers',
+        name='Daily P&L',
+        line=dict(color='#1f77b4', width=2),
+        fill='tonexty' if len(s_df.columns) > 1 else None
+    ))
+    fig.update_layout(
+        title="Daily P&L Trend",
+        xaxis_title="Date",
+        yaxis_title="P&L (₹)",
+        height=400,
+        hovermode='x unified'
+    )
+    return fig.to_dict()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _win_loss_figure(win_count: int, loss_count: int) -> Dict[str, Any]:
+    """Win/loss pie chart as a Plotly dict."""
+    fig = go.Figure(data=[go.Pie(
+        labels=['Wins', 'Losses'],
+        values=[win_count, loss_count],
+        hole=0.3,
+        marker_colors=['green', 'red']
+    )])
+    fig.update_layout(
+        title="Win/Loss Distribution",
+        height=400
+    )
+    return fig.to_dict()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cumulative_pnl_figure(log_version: tuple, _trade_logger) -> Optional[Dict[str, Any]]:
+    """Cumulative P&L line as a Plotly dict, rebuilt only when the trade log changes."""
+    pnl_values = _cached_pnl_series(log_version, _trade_logger)
+    if not pnl_values.size:
+        return None
+    cumulative_pnl = np.cumsum(pnl_values)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=np.arange(cumulative_pnl.size),
+        y=cumulative_pnl,
+        mode='lines+markers',
+        name='Cumulative P&L',
+        line=dict(color='#1f77b4', width=2),
+        fill='tozeroy'
+    ))
+    fig.update_layout(
+        title="Cumulative P&L Over Time",
+        xaxis_title="Trade Number",
+        yaxis_title="Cumulative P&L (₹)",
+        height=400
+    )
+    return fig.to_dict()
+
+
+_STRATEGY_CONFIG_PATH = 'config/config.yaml'
+
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _load_strategy_config(mtime: float) -> Dict[str, Any]:
+    """Parsed config.yaml; keyed on the file's mtime so edits are picked up on the next rerun."""
+    with open(_STRATEGY_CONFIG_PATH, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+
+def _strategy_config() -> Dict[str, Any]:
+    """Current config.yaml contents without re-parsing the file on every rerun."""
+    return _load_strategy_config(os.path.getmtime(_STRATEGY_CONFIG_PATH))
+
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def _load_filter_flags(mtime: float) -> Dict[str, bool]:
+    """``strategy.filters`` from config.yaml reduced to booleans, once per file change."""
+    strategy = _load_strategy_config(mtime).get('strategy')
+    filters = strategy.get('filters') if isinstance(strategy, dict) else None
+    if not isinstance(filters, dict):
+        return {}
+    return {name: bool(enabled) for name, enabled in filters.items()}
+
+
+def _filter_flags() -> Dict[str, bool]:
+    """Current on/off state of each strategy filter."""
+    try:
+        return _load_filter_flags(os.path.getmtime(_STRATEGY_CONFIG_PATH))
+    except Exception:
+        return {}
+
+
+# Initialize database on startup
+try:
+    _ensure_database()
 except Exception as e:
     logger.warning(f"Database initialization failed (non-critical): {e}")
 
@@ -337,22 +564,20 @@ config = load_config()
 
 # Merge config.yaml into config (for timeframes, strategy, etc.)
 try:
-    import yaml as yaml_lib
     config_yaml_path = 'config/config.yaml'
     if os.path.exists(config_yaml_path):
-        with open(config_yaml_path, 'r') as f:
-            yaml_config = yaml_lib.safe_load(f)
-            if yaml_config:
-                # Merge yaml config into secrets config (yaml takes precedence for non-secret values)
-                for key, value in yaml_config.items():
-                    if key not in config or not isinstance(config.get(key), dict):
-                        config[key] = value
-                    elif isinstance(value, dict):
-                        # Deep merge for nested dicts
-                        if key not in config:
-                            config[key] = {}
-                        config[key].update(value)
-                logger.debug("Merged config.yaml into config")
+        yaml_config = _strategy_config()
+        if yaml_config:
+            # Merge yaml config into secrets config (yaml takes precedence for non-secret values)
+            for key, value in yaml_config.items():
+                if key not in config or not isinstance(config.get(key), dict):
+                    config[key] = value
+                elif isinstance(value, dict):
+                    # Deep merge for nested dicts
+                    if key not in config:
+                        config[key] = {}
+                    config[key].update(value)
+            logger.debug("Merged config.yaml into config")
 except Exception as e:
     logger.warning(f"Could not load config.yaml: {e}")
 
@@ -1062,11 +1287,138 @@ def _build_metric_tile_html(title: str, value: str, subtitle: Optional[str] = No
     )
 
 
+def _pnl_card_template(card_class: str, title_color: str, icon: str) -> str:
+    """Cumulative P&L card markup with a ``{value}`` slot for the formatted amount."""
+    return (
+        f'<div class="status-card {card_class}">'
+        f'<h3 style="margin:0; color: {title_color};">📊 Cumulative P&L</h3>'
+        f'<p style="font-size:2rem; margin:0.5rem 0; font-weight:bold;">{icon} ₹{{value}}</p>'
+        f'</div>'
+    )
+
+
+_PNL_CARD_GREEN = _pnl_card_template("status-green", "#155724", "🟢")
+_PNL_CARD_RED = _pnl_card_template("status-red", "#721c24", "🔴")
+
+
+def _market_open_now(runner) -> bool:
+    """
+    Market-open flag for the status UI, False when no runner or the check fails.
+    
+    The runner memoises the check per minute, so no UI-side cache is layered on top.
+    """
+    if runner is None or not hasattr(runner, '_is_market_open'):
+        return False
+    try:
+        return bool(runner._is_market_open())
+    except Exception:
+        return False
+
+
+@st.cache_resource
+def _get_broker_type() -> str:
+    """Display name of the configured broker, resolved once per process."""
+    broker_config = config.get('broker', {})
+    if not isinstance(broker_config, dict) and config.get('_from_streamlit_secrets') and hasattr(st, 'secrets'):
+        try:
+            broker_secrets = getattr(st.secrets, 'broker', None)
+            broker_type = getattr(broker_secrets, 'type', 'Not Configured') if broker_secrets else 'Not Configured'
+        except Exception:
+            broker_type = 'Not Configured'
+    else:
+        broker_type = broker_config.get('type', 'Not Configured') if broker_config else 'Not Configured'
+    return (broker_type or 'Not Configured').capitalize()
+
+
+_STATUS_FRAGMENT_INTERVAL = "10s"
+
+
+def _status_fragment(func):
+    """Run ``func`` as a self-refreshing fragment when this Streamlit supports it."""
+    fragment = getattr(st, "fragment", None)
+    if fragment is None:
+        return func
+    return fragment(run_every=_STATUS_FRAGMENT_INTERVAL)(func)
+
+
+@_status_fragment
+def _render_status_chip_row(broker_type: str) -> None:
+    """
+    Render the Algo/Broker/Market chips and tick-stream caption.
+
+    Runs as a fragment so the chips stay current between full reruns without
+    re-executing the rest of the Dashboard tab.
+    """
+    live_runner = st.session_state.get('live_runner')
+    engine_status = st.session_state.get('algo_running', False)
+    broker_connected = st.session_state.get('broker') is not None
+
+    market_open = _market_open_now(live_runner)
+
+    streamer_health = None
+    if live_runner is not None:
+        try:
+            snapshot = live_runner.get_active_pnl_snapshot()
+            streamer_health = snapshot.get("streamer") if isinstance(snapshot, dict) else None
+        except Exception as snapshot_err:
+            logger.debug(f"Streamer health unavailable: {snapshot_err}")
+
+    status_chips = [
+        _build_status_chip_html(
+            "Algo",
+            "Running" if engine_status else "Stopped",
+            state="success" if engine_status else "danger",
+            subtitle="Execution armed" if st.session_state.get('execution_armed') else "Execution disarmed",
+        ),
+        _build_status_chip_html(
+            "Broker",
+            "Connected" if broker_connected else "Not Connected",
+            state="info" if broker_connected else "danger",
+            subtitle=broker_type if broker_connected else "Re-auth required",
+        ),
+        _build_status_chip_html(
+            "Market",
+            "Open" if market_open else "Closed",
+            state="warning" if market_open else "danger",
+            subtitle="Live session" if market_open else "Outside NSE hours",
+        ),
+    ]
+    st.markdown(f"<div class='status-chip-row'>{''.join(status_chips)}</div>", unsafe_allow_html=True)
+    if streamer_health:
+        tick_status_icon = "🟢" if streamer_health.get("connected") else "🔴"
+        last_tick_age = streamer_health.get("last_tick_age_sec")
+        if isinstance(last_tick_age, (int, float)):
+            st.caption(f"{tick_status_icon} Tick stream age: {last_tick_age:.1f}s")
+        else:
+            st.caption(f"{tick_status_icon} Tick stream {'connected' if streamer_health.get('connected') else 'idle'}")
+
+
+def _render_auto_refresh_timer(interval_sec: float) -> None:
+    """
+    Browser-paced timer that reruns the app once the auto-refresh slot is due.
+    
+    The fragment re-executes on Streamlit's own schedule, so no script thread
+    sleeps while waiting; the auto-refresh scheduler still decides whether the
+    rerun actually pulls fresh data.
+    """
+    fragment = getattr(st, "fragment", None)
+    if fragment is None:
+        return
+
+    @fragment(run_every=f"{max(1, int(interval_sec))}s")
+    def _auto_refresh_timer() -> None:
+        if time.monotonic() >= st.session_state.next_auto_refresh_ts:
+            st.rerun()
+
+    _auto_refresh_timer()
+
+
 def _render_strategy_settings_popover(form_key: str = "strategy_settings_form") -> None:
     st.caption("Adjust live trading parameters. Changes apply to the next signal.")
+    runner = st.session_state.get('live_runner')
     config_source: Dict[str, Any] = config if isinstance(config, dict) else {}
-    if st.session_state.get('live_runner') is not None:
-        config_source = st.session_state.live_runner.config
+    if runner is not None:
+        config_source = runner.config
 
     strategy_cfg = config_source.get('strategy', {}) or {}
     pm_cfg = config_source.get('position_management', {}) or {}
@@ -1079,14 +1431,11 @@ def _render_strategy_settings_popover(form_key: str = "strategy_settings_form")
     current_atm_offset = strategy_cfg.get('atm_offset', 0)
     current_daily_loss_limit_pct = risk_cfg.get('daily_loss_limit_pct', 5.0)
 
-    if st.session_state.get('live_runner') is not None:
-        runner = st.session_state.live_runner
+    if runner is not None:
+        # config_source is already runner.config, so trail/ATM values above are current.
         current_sl_points = getattr(runner, 'sl_points', current_sl_points)
         current_order_lots = getattr(runner, 'order_lots', current_order_lots)
         current_lot_size = getattr(runner, 'lot_size', current_lot_size)
-        runner_pm_cfg = runner.config.get('position_management', {}) or {}
-        current_trail_points = runner_pm_cfg.get('trail_points', current_trail_points)
-        current_atm_offset = runner.config.get('strategy', {}).get('atm_offset', current_atm_offset)
         current_daily_loss_limit_pct = getattr(runner, 'daily_loss_limit_pct', current_daily_loss_limit_pct)
 
     with st.form(form_key, clear_on_submit=False):
@@ -1152,8 +1501,8 @@ def _render_strategy_settings_popover(form_key: str = "strategy_settings_form")
 
     if submitted:
         try:
-            if st.session_state.get('live_runner') is not None:
-                st.session_state.live_runner.update_strategy_config(
+            if runner is not None:
+                runner.update_strategy_config(
                     sl_points=int(sl_points_input),
                     atm_offset=int(atm_offset_input),
                     order_lots=int(sl_lots_input),
@@ -1179,6 +1528,98 @@ def _render_active_trade_metric_row(buy_value: str, tp_value: str, sl_value: str
     )
     st.markdown(f"<div class='trade-box-grid'>{tiles}</div>", unsafe_allow_html=True)
 
+def _trades_file_mtime(trade_logger) -> Optional[float]:
+    """Modification time of the trade log, used as a cache key for trade lookups."""
+    try:
+        return os.path.getmtime(trade_logger.trades_file)
+    except (AttributeError, OSError):
+        return None
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _cached_latest_open_trade(trades_mtime: Optional[float], _trade_logger) -> Optional[Dict[str, Any]]:
+    """Latest open trade, re-read only when the trade log changes (or every 2s)."""
+    return _trade_logger.get_latest_open_trade()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_1h_candles(bar_key: str, provider_id: int, window_hours: int, _provider) -> pd.DataFrame:
+    """
+    Closed 1h candles, refetched only when ``bar_key`` (the last closed NSE hour) moves.
+    
+    The TTL only bounds staleness if the broker delivers a closed bar late.
+    """
+    return _provider.get_1h_data(window_hours=window_hours)
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def _cached_15m_candles(bar_key: int, provider_id: int, window_hours: int, _provider) -> pd.DataFrame:
+    """Closed 15m candles, refetched once per 15-minute bucket (``bar_key``)."""
+    return _provider.get_15m_data(window_hours=window_hours)
+
+
+def _bar_cache_key(df: pd.DataFrame) -> tuple:
+    """Hashable identity for an OHLC frame: last bar time, length and last OHLC."""
+    try:
+        last_bar = df.iloc[-1]
+        return (
+            str(last_bar.get('Date')),
+            len(df),
+            *(float(last_bar.get(col, 0) or 0) for col in ('Open', 'High', 'Low', 'Close')),
+        )
+    except Exception:
+        return (len(df), time.time())
+
+
+def _to_arrow_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Arrow-backed copy of ``df`` so st.dataframe skips per-cell object conversion."""
+    try:
+        return df.convert_dtypes(dtype_backend='pyarrow')
+    except (ImportError, TypeError, ValueError):
+        # pyarrow missing or an older pandas without dtype_backend
+        return df
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _inside_bar_snapshot(bar_key: tuple, _df_ib: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Run inside-bar detection, mother lookup and breakout confirmation once per bar state.
+    
+    ``bar_key`` identifies the 1h frame (last bar time, length and last OHLC) so the
+    pipeline reruns only when a bar is added or the forming bar moves; the
+    DataFrame itself is passed unhashed. Entries are bounded by count rather than
+    age, so an unchanged bar (quiet market, after hours) never repeats the scan.
+    """
+    result: Dict[str, Any] = {"inside_indices": [], "mother_idx": None, "breakout_direction": None}
+    try:
+        inside_indices = detect_inside_bar(_df_ib)
+    except Exception as e:
+        logger.warning(f"Inside bar detection failed in snapshot: {e}")
+        return result
+    result["inside_indices"] = inside_indices
+    if not inside_indices:
+        return result
+    latest_inside_idx = inside_indices[-1]
+    mother_idx = find_mother_index(_df_ib, latest_inside_idx)
+    result["mother_idx"] = mother_idx
+    if mother_idx is None:
+        return result
+    mother_row = _df_ib.iloc[mother_idx]
+    try:
+        result["breakout_direction"] = confirm_breakout(
+            _df_ib,
+            float(mother_row['High']),
+            float(mother_row['Low']),
+            latest_inside_idx,
+            mother_idx=mother_idx,
+            volume_threshold_multiplier=1.0,
+            symbol="NIFTY"
+        )
+    except Exception as e:
+        logger.warning(f"Inside bar snapshot breakout check failed: {e}")
+    return result
+
+
 # Helper function to safely get config value from either source
 def get_config_value(section, key, default=None):
     """Safely get config value from secrets.toml or st.secrets"""
@@ -1233,6 +1674,19 @@ def align_dataframe_to_ist(df: pd.DataFrame, column: str = 'Date') -> pd.DataFra
     return aligned
 
 
+_IST = ZoneInfo("Asia/Kolkata")
+
+
+def _format_ist(ts_value) -> str:
+    """Short IST label (e.g. 05-Nov 10:15 AM) for candle timestamps."""
+    try:
+        ts = pd.Timestamp(ts_value)
+        ts = ts.tz_localize(_IST) if ts.tzinfo is None else ts.tz_convert(_IST)
+        return ts.strftime("%d-%b %I:%M %p")
+    except Exception:
+        return str(ts_value)
+
+
 def format_ist_timestamp(value) -> str:
     """Format timestamps into 12-hour IST representation."""
     if value is None or (isinstance(value, float) and pd.isna(value)):
@@ -1253,6 +1707,22 @@ def format_ist_timestamp(value) -> str:
 
     return ts.strftime("%d-%b-%Y %I:%M %p IST")
 
+
+def _format_countdown(remaining_seconds: float) -> str:
+    """Compact countdown such as "2 days, 3 h" or "4 h, 12 min" (minutes only under a day)."""
+    days, rem = divmod(int(remaining_seconds), 86400)
+    hours, rem = divmod(rem, 3600)
+    minutes = rem // 60
+    parts = []
+    if days > 0:
+        parts.append(f"{days} day{'s' if days != 1 else ''}")
+    if hours > 0:
+        parts.append(f"{hours} h")
+    if days == 0 and minutes > 0:
+        parts.append(f"{minutes} min")
+    return ", ".join(parts) if parts else "< 1 min"
+
+
 # ===================================================================
 # FIREBASE AUTHENTICATION
 # ===================================================================
@@ -1263,19 +1733,17 @@ if 'config' not in globals() or not config:
     config = load_config()
     # Merge config.yaml if not already merged
     try:
-        import yaml as yaml_lib
         config_yaml_path = 'config/config.yaml'
         if os.path.exists(config_yaml_path):
-            with open(config_yaml_path, 'r') as f:
-                yaml_config = yaml_lib.safe_load(f)
-                if yaml_config:
-                    for key, value in yaml_config.items():
-                        if key not in config or not isinstance(config.get(key), dict):
-                            config[key] = value
-                        elif isinstance(value, dict):
-                            if key not in config:
-                                config[key] = {}
-                            config[key].update(value)
+            yaml_config = _strategy_config()
+            if yaml_config:
+                for key, value in yaml_config.items():
+                    if key not in config or not isinstance(config.get(key), dict):
+                        config[key] = value
+                    elif isinstance(value, dict):
+                        if key not in config:
+                            config[key] = {}
+                        config[key].update(value)
     except Exception as e:
         logger.warning(f"Could not load config.yaml: {e}")
 
@@ -1701,13 +2169,102 @@ else:
 # # Main Dashboard (after authentication)
 # st.sidebar.success(f"👋 Welcome, {name}")
 
+@dataclass(frozen=True)
+class BrokerCfg:
+    """Immutable broker credentials; hashable so it can key cached resources."""
+    type: str = 'angel'
+    api_key: Optional[str] = None
+    client_id: Optional[str] = None
+    username: Optional[str] = None
+    pwd: Optional[str] = None
+    token: Optional[str] = None
+    api_secret: Optional[str] = None
+    access_token: Optional[str] = None
+
+    @classmethod
+    def from_source(cls, source) -> "BrokerCfg":
+        """Build from a plain dict or a Streamlit secrets section in one pass."""
+        getter = source.get if isinstance(source, dict) else (lambda name, default: getattr(source, name, default))
+        values = {f.name: getter(f.name, f.default) for f in fields(cls)}
+        return cls(**{k: (str(v) if v is not None else None) for k, v in values.items()})
+
+    def as_dict(self) -> Dict[str, str]:
+        return {k: v for k, v in asdict(self).items() if v is not None}
+
+
+@st.cache_resource(show_spinner=False)
+def get_broker_interface(broker_cfg: BrokerCfg):
+    """Process-wide broker interface keyed on its (hashable) configuration."""
+    return create_broker_interface({'broker': broker_cfg.as_dict()})
+
+
+@st.cache_resource(show_spinner=False)
+def get_signal_handler(config_path: str):
+    """Shared SignalHandler built from the strategy config file (None if empty)."""
+    with open(config_path, 'r') as f:
+        strategy_config = yaml.load(f, Loader=SafeLoader)
+    if not strategy_config:
+        return None
+    return SignalHandler(strategy_config)
+
+
+@st.cache_resource(show_spinner=False)
+def get_trade_logger():
+    return TradeLogger()
+
+
+@st.cache_resource(show_spinner=False)
+def get_market_data_provider(broker_key: Optional[BrokerCfg], _broker, historical_app_items: Optional[tuple] = None):
+    """Shared MarketDataProvider; ``_broker`` is not hashed, ``broker_key`` identifies it."""
+    historical_app_config = dict(historical_app_items) if historical_app_items else None
+    try:
+        return MarketDataProvider(_broker, historical_app_config=historical_app_config)
+    except TypeError as type_err:
+        logger.warning(
+            "MarketDataProvider does not support historical_app_config parameter (%s). Falling back to legacy initialization.",
+            type_err,
+        )
+        return MarketDataProvider(_broker)
+
+
+@st.cache_resource(show_spinner=False)
+def get_tick_streamer(broker_key: Optional[BrokerCfg], _broker, nifty_token: Optional[str]):
+    """Shared LiveTickStreamer so each new session does not open another socket."""
+    default_symbols = [{
+        "tradingsymbol": "NIFTY",
+        "exchange": "NSE",
+        "token": str(nifty_token) if nifty_token else None,
+    }]
+    streamer = LiveTickStreamer(_broker, default_symbols=default_symbols)
+    streamer.start()
+    return streamer
+
+
 # Initialize session state
-if 'algo_running' not in st.session_state:
-    st.session_state.algo_running = _runtime_state.get("algo_running", False)
-if 'strategy_settings_feedback' not in st.session_state:
-    st.session_state.strategy_settings_feedback = None
-if 'market_refresh_feedback' not in st.session_state:
-    st.session_state.market_refresh_feedback = None
+# Plain defaults are merged in one pass; keys whose initial value has side
+# effects (broker, providers, runner, audio) keep their own guarded blocks.
+_SESSION_DEFAULTS: Dict[str, Any] = {
+    'strategy_settings_feedback': None,
+    'market_refresh_feedback': None,
+    'execution_armed': False,
+    'auto_refresh_enabled': True,
+    'auto_refresh_interval_sec': 30,
+    'auto_refresh_counter': 0,
+    'background_refresh_enabled': True,
+    'background_refresh_interval_sec': 10,
+    'last_breakout_alert_key': None,
+    'last_breakout_alert_timestamp': None,
+    'last_missed_trade': None,
+    'last_refresh_error': None,
+    'last_refresh_time': None,
+    'last_refresh_reason': None,
+    'selected_main_tab': "Dashboard",
+    '_last_change_key': None,
+    '_last_refresh_minute': None,
+}
+for _key, _value in _SESSION_DEFAULTS.items():
+    st.session_state.setdefault(_key, _value)
+st.session_state.setdefault('algo_running', _runtime_state.get("algo_running", False))
 if 'live_runner' not in st.session_state:
     st.session_state.live_runner = _runtime_state.get("live_runner")
 if 'broker' not in st.session_state:
@@ -1720,24 +2277,16 @@ if 'broker' not in st.session_state:
             try:
                 broker_secrets = getattr(st.secrets, 'broker', None)
                 if broker_secrets:
-                    # Convert to dict safely
-                    broker_config_for_interface = {
-                        'type': getattr(broker_secrets, 'type', 'angel'),
-                        'api_key': getattr(broker_secrets, 'api_key', ''),
-                        'client_id': getattr(broker_secrets, 'client_id', ''),
-                        'username': getattr(broker_secrets, 'username', ''),
-                        'pwd': getattr(broker_secrets, 'pwd', ''),
-                        'token': getattr(broker_secrets, 'token', ''),
-                    }
+                    broker_config_for_interface = broker_secrets
             except Exception as e:
                 logger.warning(f"Could not access broker from Streamlit secrets: {e}")
         
         # Create broker interface with config that has broker section
         if broker_config_for_interface:
-            # Ensure config dict has broker section for create_broker_interface
-            temp_config = {'broker': broker_config_for_interface}
-            st.session_state['_broker_interface_config'] = broker_config_for_interface
-            st.session_state.broker = create_broker_interface(temp_config)
+            broker_cfg = BrokerCfg.from_source(broker_config_for_interface)
+            st.session_state['_broker_interface_config'] = broker_cfg.as_dict()
+            st.session_state['_broker_cache_key'] = broker_cfg
+            st.session_state.broker = get_broker_interface(broker_cfg)
         else:
             st.session_state.broker = None
             logger.warning("No broker configuration found")
@@ -1747,27 +2296,22 @@ if 'broker' not in st.session_state:
 if 'signal_handler' not in st.session_state:
     # Load strategy config
     try:
-        import yaml as yaml_lib
         config_path = 'config/config.yaml'
         if not os.path.exists(config_path):
             logger.error(f"Configuration file not found: {config_path}")
             st.warning(f"⚠️ Configuration file not found: {config_path}. Some features may not work.")
             st.session_state.signal_handler = None
         else:
-            with open(config_path, 'r') as f:
-                strategy_config = yaml_lib.safe_load(f)
-            if strategy_config:
-                st.session_state.signal_handler = SignalHandler(strategy_config)
-            else:
+            st.session_state.signal_handler = get_signal_handler(config_path)
+            if st.session_state.signal_handler is None:
                 logger.warning(f"Config file {config_path} is empty or invalid")
                 st.warning(f"⚠️ Config file {config_path} is empty or invalid. Some features may not work.")
-                st.session_state.signal_handler = None
     except Exception as e:
         logger.error(f"Failed to initialize signal handler: {e}", exc_info=True)
         st.error(f"❌ Failed to initialize signal handler: {e}")
         st.session_state.signal_handler = None
 if 'trade_logger' not in st.session_state:
-    st.session_state.trade_logger = TradeLogger()
+    st.session_state.trade_logger = get_trade_logger()
 
 # Initialize market data provider (only if broker is available)
 if 'market_data_provider' not in st.session_state:
@@ -1799,32 +2343,21 @@ if 'market_data_provider' not in st.session_state:
             logger.warning(f"Unable to load historical SmartAPI credentials: {cred_error}")
             historical_app_config = None
         try:
-            st.session_state.market_data_provider = MarketDataProvider(
+            st.session_state.market_data_provider = get_market_data_provider(
+                st.session_state.get('_broker_cache_key'),
                 st.session_state.broker,
-                historical_app_config=historical_app_config,
+                tuple(sorted(historical_app_config.items())) if historical_app_config else None,
             )
-        except TypeError as type_err:
-            logger.warning(
-                "MarketDataProvider does not support historical_app_config parameter (%s). Falling back to legacy initialization.",
-                type_err,
-            )
-            try:
-                st.session_state.market_data_provider = MarketDataProvider(st.session_state.broker)
-            except Exception as legacy_err:
-                st.session_state.market_data_provider = None
-                st.warning(f"Market data provider initialization warning: {legacy_err}")
         except Exception as e:
             st.session_state.market_data_provider = None
             st.warning(f"Market data provider initialization warning: {e}")
     else:
         st.session_state.market_data_provider = None
 
-if 'tick_streamer' not in st.session_state:
-    st.session_state.tick_streamer = None
+st.session_state.setdefault('tick_streamer', None)
 
 if st.session_state.tick_streamer is None and st.session_state.broker is not None:
     try:
-        default_symbols = []
         nifty_token = None
         if st.session_state.market_data_provider is not None:
             nifty_token = getattr(st.session_state.market_data_provider, "nifty_token", None)
@@ -1833,14 +2366,11 @@ if st.session_state.tick_streamer is None and st.session_state.broker is not Non
                 nifty_token = st.session_state.broker._get_symbol_token("NIFTY", "NSE")
             except Exception:
                 nifty_token = "99926000"
-        default_symbols.append({
-            "tradingsymbol": "NIFTY",
-            "exchange": "NSE",
-            "token": str(nifty_token) if nifty_token else None,
-        })
-        streamer = LiveTickStreamer(st.session_state.broker, default_symbols=default_symbols)
-        streamer.start()
-        st.session_state.tick_streamer = streamer
+        st.session_state.tick_streamer = get_tick_streamer(
+            st.session_state.get('_broker_cache_key'),
+            st.session_state.broker,
+            str(nifty_token) if nifty_token else None,
+        )
     except Exception as streamer_error:
         st.session_state.tick_streamer = None
         logger.warning(f"Tick streamer initialization warning: {streamer_error}")
@@ -1848,10 +2378,8 @@ if st.session_state.tick_streamer is None and st.session_state.broker is not Non
 # Initialize live runner (lazy - only when needed)
 if st.session_state.live_runner is None:
     # Load full config (with market_data section)
-    import yaml as yaml_lib
     try:
-        with open('config/config.yaml', 'r') as f:
-            full_config = yaml_lib.safe_load(f)
+        full_config = _strategy_config()
     except Exception as config_error:
         logger.warning(f"Failed to load config.yaml: {config_error}")
         full_config = {}
@@ -1897,47 +2425,32 @@ if st.session_state.live_runner is None:
         logger.debug(f"Live runner not initialized - missing dependencies: {', '.join(missing)}")
         _set_live_runner_runtime(None)
 
-# Ensure auto-refresh session state defaults before usage
-if 'execution_armed' not in st.session_state:
-    st.session_state.execution_armed = False
+# Data sources are settled once the init block above has run; later checks read this flag
+st.session_state._md_or_runner_available = (
+    st.session_state.live_runner is not None
+    or st.session_state.market_data_provider is not None
+)
+
+# Sync the execution arm flag (defaulted above) onto the runner
 if st.session_state.live_runner is not None:
     try:
         st.session_state.live_runner.execution_armed = st.session_state.execution_armed
     except Exception:
         pass
 
-if 'auto_refresh_enabled' not in st.session_state:
-    st.session_state.auto_refresh_enabled = True
-if 'auto_refresh_interval_sec' not in st.session_state:
-    st.session_state.auto_refresh_interval_sec = 30
 if 'next_auto_refresh_ts' not in st.session_state:
-    st.session_state.next_auto_refresh_ts = time.time() + st.session_state.auto_refresh_interval_sec
-if 'auto_refresh_counter' not in st.session_state:
-    st.session_state.auto_refresh_counter = 0
-if 'background_refresh_enabled' not in st.session_state:
-    st.session_state.background_refresh_enabled = True
-if 'background_refresh_interval_sec' not in st.session_state:
-    st.session_state.background_refresh_interval_sec = 10
+    st.session_state.next_auto_refresh_ts = time.monotonic() + st.session_state.auto_refresh_interval_sec
 if 'breakout_alert_audio' not in st.session_state:
     st.session_state.breakout_alert_audio = _generate_breakout_alert_audio()
-if 'last_breakout_alert_key' not in st.session_state:
-    st.session_state.last_breakout_alert_key = None
-if 'last_breakout_alert_timestamp' not in st.session_state:
-    st.session_state.last_breakout_alert_timestamp = None
-if 'last_missed_trade' not in st.session_state:
-    st.session_state.last_missed_trade = None
-if 'last_refresh_error' not in st.session_state:
-    st.session_state.last_refresh_error = None
-if '_last_ui_refresh_trigger' not in st.session_state:
-    st.session_state['_last_ui_refresh_trigger'] = time.time()
+if '_breakout_alert_b64' not in st.session_state:
+    # Encoded once per session; alerts inject it as a data URI
+    st.session_state._breakout_alert_b64 = base64.b64encode(st.session_state.breakout_alert_audio).decode('ascii')
+st.session_state.setdefault('_last_ui_refresh_trigger', time.time())
 previous_ui_render_time = st.session_state.get('_last_ui_render_time')
 current_ui_render_time = datetime.now()
 st.session_state['_last_ui_render_time'] = current_ui_render_time
 
-if 'selected_main_tab' not in st.session_state:
-    st.session_state.selected_main_tab = "Dashboard"
-if '_previous_tab' not in st.session_state:
-    st.session_state['_previous_tab'] = st.session_state.selected_main_tab
+st.session_state.setdefault('_previous_tab', st.session_state.selected_main_tab)
 
 # Sidebar menu with persistent selection (key handles persistence automatically)
 MENU_TABS = [
@@ -1974,8 +2487,7 @@ global_refresh_interval = st.session_state.get(
     st.session_state.auto_refresh_interval_sec
 )
 # Track last user interaction to prevent auto-refresh during interactions
-if '_last_user_interaction' not in st.session_state:
-    st.session_state['_last_user_interaction'] = 0
+st.session_state.setdefault('_last_user_interaction', 0)
 
 # Update interaction timestamp when tab changes (user actively selected a different tab)
 if st.session_state.get('_previous_tab') != current_main_tab:
@@ -1990,8 +2502,7 @@ if st.session_state.get('_websocket_trigger_rerun', False):
 # FALLBACK: Direct polling of tick streamer for NIFTY LTP (works even if WebSocket fails)
 # This ensures NIFTY LTP updates even if WebSocket connection is broken
 if current_main_tab == "Dashboard":
-    if 'last_nifty_direct_poll_ts' not in st.session_state:
-        st.session_state.last_nifty_direct_poll_ts = 0
+    st.session_state.setdefault('last_nifty_direct_poll_ts', 0)
     
     now = time.time()
     poll_interval = 2.0  # Poll every 2 seconds
@@ -2033,63 +2544,331 @@ if (st.session_state.get('auto_refresh_enabled', True) and
         st.rerun()
 
 
-def _trigger_market_data_refresh(reason: str) -> bool:
+@st.cache_resource(show_spinner=False)
+def _get_refresh_executor() -> ThreadPoolExecutor:
+    """Process-wide pool that runs provider refreshes off the script thread."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="md-refresh")
+
+
+@st.cache_resource(show_spinner=False)
+def _get_provider_refresh_lock(provider_id: int) -> threading.Lock:
+    """One lock per provider instance so concurrent sessions never overlap refreshes."""
+    return threading.Lock()
+
+
+def _run_provider_refresh(provider, lock: threading.Lock) -> None:
+    with lock:
+        provider.refresh_data()
+
+
+# Server-side formatting for trade-log tables; configs for absent columns are ignored
+_PNL_COLUMN_CONFIG = {
+    'pnl': st.column_config.NumberColumn('P&L', format='₹%.2f'),
+}
+_JOURNAL_COLUMN_CONFIG = {
+    **_PNL_COLUMN_CONFIG,
+    'timestamp': st.column_config.DatetimeColumn('Time', format='YYYY-MM-DD HH:mm'),
+}
+
+# Preferred display columns (in order) for the broker tables; only those present are shown
+_GREEKS_COLS = pd.Index([
+    'name', 'expiry', 'strikePrice', 'optionType', 'delta', 'gamma', 'theta', 'vega',
+    'impliedVolatility', 'tradeVolume',
+])
+_ORDER_COLS = pd.Index([
+    'orderid', 'tradingsymbol', 'symboltoken', 'exchange', 'transactiontype', 'producttype',
+    'ordertype', 'status', 'price', 'triggerprice', 'quantity', 'filledshares', 'unfilledshares',
+    'createdtime', 'updatetime',
+])
+_TRADE_COLS = pd.Index([
+    'orderid', 'tradingsymbol', 'symboltoken', 'exchange', 'transactiontype', 'producttype',
+    'price', 'quantity', 'filltime', 'tradetime',
+])
+
+# Static sample payloads, built once at import: the Backtest CSV template and the empty-journal example
+_SAMPLE_CSV_BYTES = pd.DataFrame({
+    'Date': pd.date_range('2024-01-01', periods=10, freq='1h').strftime('%Y-%m-%d %H:%M:%S'),
+    'Open': [24000.0, 24050.0, 24030.0, 24060.0, 24080.0, 24100.0, 24090.0, 24120.0, 24140.0, 24160.0],
+    'High': [24080.0, 24090.0, 24070.0, 24090.0, 24110.0, 24130.0, 24120.0, 24150.0, 24170.0, 24190.0],
+    'Low': [23980.0, 24020.0, 24000.0, 24030.0, 24050.0, 24070.0, 24060.0, 24090.0, 24110.0, 24130.0],
+    'Close': [24050.0, 24040.0, 24050.0, 24070.0, 24090.0, 24110.0, 24100.0, 24130.0, 24150.0, 24170.0],
+    'Volume': [1000000, 1100000, 950000, 1200000, 1050000, 1300000, 1150000, 1250000, 1400000, 1350000],
+}).to_csv(index=False).encode('utf-8')
+_EMPTY_STATE_SAMPLE_DF = pd.DataFrame({
+    'timestamp': ['2024-01-01 10:15:00'],
+    'symbol': ['NIFTY 25000 CE'],
+    'type': ['CE'],
+    'entry_price': [150.50],
+    'exit_price': [180.75],
+    'quantity': [150],
+    'pnl': [4537.50],
+})
+
+
+def _broker_account_key(broker) -> tuple:
+    """Hashable account identity for ``broker``; keys the process-wide st.cache_data broker reads."""
+    return (type(broker).__name__, getattr(broker, 'client_id', None) or id(broker))
+
+
+@lru_cache(maxsize=None)
+def _broker_capabilities(broker_cls: type) -> Dict[str, bool]:
+    """Optional book endpoints a broker class implements, probed once per class."""
+    return {
+        'positions_book': callable(getattr(broker_cls, 'get_positions_book', None)),
+        'order_book': callable(getattr(broker_cls, 'get_order_book', None)),
+        'trade_book': callable(getattr(broker_cls, 'get_trade_book', None)),
+    }
+
+
+# Angel One's portfolio and book endpoints allow roughly one request per second.
+_BROKER_READ_ENDPOINTS = ('holdings', 'all_holdings', 'positions_book', 'order_book', 'trade_book')
+
+
+@st.cache_resource(show_spinner=False)
+def _broker_read_limiters() -> Dict[str, TokenBucket]:
+    """Process-wide token bucket per broker read endpoint."""
+    return {name: TokenBucket(rate_per_sec=1.0, burst=1) for name in _BROKER_READ_ENDPOINTS}
+
+
+class _BrokerReadThrottled(RuntimeError):
+    """Raised when a broker read is over budget and no earlier payload can stand in."""
+
+
+@st.cache_resource(show_spinner=False)
+def _broker_last_good() -> "weakref.WeakKeyDictionary":
+    """Last successful payload per endpoint, held per broker and dropped with it."""
+    return weakref.WeakKeyDictionary()
+
+
+def _rate_limited_broker_read(name: str, broker, call, default):
+    """
+    Run one broker read under the endpoint's token bucket.
+    
+    When the call raises, the last good payload for this broker is returned
+    (or ``default``) instead of sleeping and retrying. When the bucket is
+    empty the last good payload is served as well; with none to serve,
+    _BrokerReadThrottled is raised so the caller's st.cache_data does not
+    pin an empty result for its whole TTL.
+    """
+    last_good = _broker_last_good().setdefault(broker, {})
+    if not _broker_read_limiters()[name].try_acquire():
+        if name in last_good:
+            logger.debug(f"Broker read '{name}' throttled; serving last good payload")
+            return last_good[name]
+        raise _BrokerReadThrottled(name)
+    try:
+        payload = call()
+    except Exception as e:
+        logger.exception(e)
+        return last_good.get(name, default)
+    last_good[name] = payload
+    return payload
+
+
+def _unless_throttled(future):
+    """Result of a broker-read future, or None if it was throttled with nothing cached."""
+    try:
+        return future.result()
+    except _BrokerReadThrottled as e:
+        logger.debug(f"Broker read '{e}' throttled before any payload was cached")
+        return None
+
+
+def _records_to_frame(records, label: str) -> pd.DataFrame:
+    """
+    Build the display frame for a broker record list.
+    
+    Missing payloads give an empty frame. A malformed payload gives an empty
+    frame whose ``attrs['build_error']`` carries the reason, so the tab can
+    warn about it (the frame is built on a pool thread, away from st.*).
+    """
+    if not records:
+        return pd.DataFrame()
+    try:
+        return pd.DataFrame(records)
+    except Exception as e:
+        logger.warning(f"Failed to build {label} frame: {e}")
+        frame = pd.DataFrame()
+        frame.attrs['build_error'] = str(e)
+        return frame
+
+
+@st.cache_resource(show_spinner=False)
+def _get_broker_io_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide pool for overlapping blocking broker reads.
+    
+    Shared by the Dashboard, Portfolio and Orders & Trades tabs across all
+    sessions, so it is sized for a few concurrent bundles rather than one.
+    """
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="broker-io")
+
+
+def _fetch_broker_bundle(broker, market_data_provider, include_margin: bool = True) -> Dict[str, Any]:
+    """
+    Fetch margin, NIFTY option greeks and the NIFTY LTP quote concurrently.
+    
+    Each value is the call's result, the exception it raised, or None when the
+    source is unavailable, so callers keep their own per-call fallbacks.
+    """
+    executor = _get_broker_io_executor()
+    futures = {}
+    if broker is not None:
+        if include_margin:
+            futures["margin"] = executor.submit(broker.get_available_margin)
+        futures["greeks"] = executor.submit(broker.get_option_greeks, "NIFTY")
+        if market_data_provider is not None:
+            futures["ltp_quote"] = executor.submit(market_data_provider.fetch_ohlc, mode="LTP")
+    bundle: Dict[str, Any] = {"margin": None, "greeks": None, "ltp_quote": None}
+    for name, future in futures.items():
+        try:
+            bundle[name] = future.result()
+        except Exception as err:
+            bundle[name] = err
+    return bundle
+
+
+def _collect_market_data_refresh() -> Optional[bool]:
+    """
+    Harvest a finished background refresh into session telemetry.
+    
+    Returns:
+        Optional[bool]: None while nothing has finished, else whether it succeeded.
+    """
+    future = st.session_state.get('_refresh_future')
+    if future is None or not future.done():
+        return None
+    reason = st.session_state.get('_refresh_future_reason', 'background')
+    st.session_state._refresh_future = None
+    try:
+        future.result()
+    except Exception as err:
+        # Tracebacks only when DEBUG is on; a flapping broker API hits this every tick
+        logger.error(
+            "Market data refresh failed (%s): %s", reason, err,
+            exc_info=logger.isEnabledFor(logging.DEBUG),
+        )
+        st.session_state.last_refresh_error = str(err)
+        return False
+    provider = st.session_state.get('market_data_provider')
+    fingerprint_fn = getattr(provider, 'data_fingerprint', None)
+    data_hash = fingerprint_fn() if callable(fingerprint_fn) else None
+    if data_hash is not None and data_hash == st.session_state.get('_last_data_hash'):
+        # Nothing changed: keep last_refresh_time stable so downstream caches stay warm
+        st.session_state.last_refresh_error = None
+        logger.debug(f"Market data refresh ({reason}) returned unchanged data")
+        return True
+    now_dt = datetime.now()
+    st.session_state.update({
+        'last_refresh_error': None,
+        '_last_data_hash': data_hash,
+        'last_refresh_time': now_dt,
+        'last_refresh_reason': reason,
+    })
+    # %-style args: the timestamp is only formatted if INFO is actually emitted
+    logger.info("Market data refresh completed (%s) at %s", reason, now_dt)
+    return True
+
+
+def _trigger_market_data_refresh(reason: str, wait: bool = True) -> bool:
     """
     Refresh market data and capture telemetry.
     
+    The provider call runs on a shared executor. With ``wait=False`` the UI keeps
+    rendering the last good data and the outcome is collected on a later rerun.
+    
     Args:
         reason: Label for refresh trigger (auto/manual/background).
+        wait: Block until the refresh finishes (manual refresh buttons).
     
     Returns:
-        bool: True when refresh succeeds, else False.
+        bool: True when refresh succeeds (or was queued), else False.
     """
     provider = st.session_state.get('market_data_provider')
     if provider is None:
         logger.warning(f"Market data refresh skipped ({reason}) — provider unavailable")
         st.session_state.last_refresh_error = "Market data provider unavailable"
         return False
-    try:
-        provider.refresh_data()
-        now_dt = datetime.now()
-        st.session_state.last_refresh_time = now_dt
-        st.session_state.last_refresh_reason = reason
-        st.session_state.last_refresh_error = None
-        logger.info(f"Market data refresh completed ({reason}) at {now_dt.isoformat()}")
+    future = st.session_state.get('_refresh_future')
+    if future is None or future.done():
+        if future is not None:
+            _collect_market_data_refresh()
+        try:
+            future = _get_refresh_executor().submit(
+                _run_provider_refresh, provider, _get_provider_refresh_lock(id(provider))
+            )
+        except Exception as err:
+            logger.error(
+                "Market data refresh failed (%s): %s", reason, err,
+                exc_info=logger.isEnabledFor(logging.DEBUG),
+            )
+            st.session_state.last_refresh_error = str(err)
+            return False
+        st.session_state.update({'_refresh_future': future, '_refresh_future_reason': reason})
+    if not wait:
         return True
-    except Exception as err:
-        logger.exception(f"Market data refresh failed ({reason}): {err}")
-        st.session_state.last_refresh_error = str(err)
-        return False
+    try:
+        future.result()
+    except Exception:
+        pass  # surfaced by _collect_market_data_refresh below
+    # Manual refreshes should show what was just fetched, not the per-bar cache
+    _cached_1h_candles.clear()
+    _cached_15m_candles.clear()
+    return bool(_collect_market_data_refresh())
 
 # Auto-refresh dashboard when algo is running (ONLY on Dashboard tab)
 # Note: Tab selection is now processed above, so we can check current_main_tab
 # Also check if user recently interacted to prevent interrupting actions
-time_since_last_interaction = time.time() - st.session_state.get('_last_user_interaction', 0)
+_ss = st.session_state
+# Scheduler runs on the monotonic clock so wall-clock jumps cannot skip or stack refreshes
+now_ts = time.monotonic()
+auto_refresh_interval = _ss.auto_refresh_interval_sec
+next_auto_refresh_ts = _ss.next_auto_refresh_ts
+auto_refresh_counter = _ss.auto_refresh_counter
+time_since_last_interaction = time.time() - _ss.get('_last_user_interaction', 0)
 auto_refresh_active = (
-    st.session_state.auto_refresh_enabled
+    _ss.auto_refresh_enabled
     and current_main_tab == "Dashboard"  # Only auto-refresh on Dashboard tab
     and time_since_last_interaction > 3.0  # Wait 3 seconds after user interaction
-    and (
-        st.session_state.get('live_runner') is not None
-        or st.session_state.get('market_data_provider') is not None
-    )
+    and _ss._md_or_runner_available
 )
 
+if _collect_market_data_refresh() is False:
+    _ss.market_refresh_feedback = (
+        "warning",
+        "⚠️ Auto refresh failed — check broker connectivity."
+    )
+
 if auto_refresh_active:
-    now_ts = time.time()
-    if now_ts >= st.session_state.next_auto_refresh_ts:
-        refresh_success = _trigger_market_data_refresh("auto")
-        if not refresh_success:
-            st.session_state.market_refresh_feedback = (
-                "warning",
-                "⚠️ Auto refresh failed — check broker connectivity."
-            )
-        st.session_state.next_auto_refresh_ts = now_ts + st.session_state.auto_refresh_interval_sec
-        st.session_state.auto_refresh_counter = st.session_state.get('auto_refresh_counter', 0) + 1
-        st.rerun()
+    if now_ts >= next_auto_refresh_ts:
+        # Only pull fresh candles when the runner has moved on (new cycle/fetch) or a
+        # new minute bar has started; otherwise the last refresh is still current.
+        _runner = _ss.get('live_runner')
+        change_key = (
+            (getattr(_runner, 'cycle_count', None), getattr(_runner, 'last_fetch_time', None))
+            if _runner is not None else None
+        )
+        minute_key = int(time.time() // 60)
+        if change_key != _ss._last_change_key or minute_key != _ss._last_refresh_minute:
+            refresh_success = _trigger_market_data_refresh("auto", wait=False)
+            if not refresh_success:
+                _ss.market_refresh_feedback = (
+                    "warning",
+                    "⚠️ Auto refresh failed — check broker connectivity."
+                )
+            _ss.update({
+                '_last_change_key': change_key,
+                '_last_refresh_minute': minute_key,
+                'auto_refresh_counter': auto_refresh_counter + 1,
+            })
+        _ss.next_auto_refresh_ts = now_ts + auto_refresh_interval
+        # No st.rerun() here: this block runs before any tab renders, so the current
+        # pass already draws whatever _collect_market_data_refresh() picked up above,
+        # and the job just submitted lands on a later pass. A rerun would only repeat
+        # the same render.
 else:
     # Reset the next refresh timestamp so the timer starts fresh when re-enabled or when returning to Dashboard
-    st.session_state.next_auto_refresh_ts = time.time() + st.session_state.auto_refresh_interval_sec
+    _ss.next_auto_refresh_ts = now_ts + auto_refresh_interval
 
 # ===================================================================
 # BACKGROUND API REFRESH - Non-blocking refresh to prevent UI flicker
@@ -2097,17 +2876,7 @@ else:
 # Purpose: Refresh AngelOne API data in background thread without blocking UI
 # ===================================================================
 
-# Initialize background refresh tracking in session state
-if 'background_refresh_thread' not in st.session_state:
-    st.session_state.background_refresh_thread = None
-if 'last_refresh_time' not in st.session_state:
-    st.session_state.last_refresh_time = None
-if 'refresh_in_progress' not in st.session_state:
-    st.session_state.refresh_in_progress = False
-if 'last_refresh_reason' not in st.session_state:
-    st.session_state.last_refresh_reason = None
-if 'last_refresh_error' not in st.session_state:
-    st.session_state.last_refresh_error = None
+# Background refresh tracking keys are seeded by _SESSION_DEFAULTS above
 
 def background_api_refresh(market_data_provider, broker):
     """
@@ -2123,7 +2892,10 @@ def background_api_refresh(market_data_provider, broker):
         # Refresh market data if available
         if market_data_provider is not None:
             try:
-                market_data_provider.refresh_data()
+                # Same per-provider lock as the auto-refresh executor, so the two never overlap
+                _run_provider_refresh(
+                    market_data_provider, _get_provider_refresh_lock(id(market_data_provider))
+                )
                 logger.debug("Background market data refresh completed")
             except Exception as e:
                 logger.warning(f"Background market data refresh failed: {e}")
@@ -2142,63 +2914,258 @@ def background_api_refresh(market_data_provider, broker):
     except Exception as e:
         logger.error(f"Background API refresh error: {e}")
 
+@st.cache_resource(show_spinner=False)
+def _get_background_refresher() -> Dict[str, Any]:
+    """Process-wide state for the single background refresh loop."""
+    return {
+        "thread": None,
+        "lock": threading.Lock(),
+        "done": threading.Event(),
+        "exited": threading.Event(),
+        "interval": 10,
+        "market_data_provider": None,
+        "broker": None,
+        "last_run": None,
+        "last_request": 0.0,
+    }
+
+_REFRESH_SINGLETON = _get_background_refresher()
+# Set once the loop thread has returned; cleared again when a new one starts.
+_REFRESH_DONE = _REFRESH_SINGLETON["exited"]
+
+
+async def _refresh_forever():
+    """Refresh on a fixed cadence until no session has asked for it in a while."""
+    loop = asyncio.get_running_loop()
+    state = _REFRESH_SINGLETON
+    while True:
+        idle_limit = max(60.0, 3 * state["interval"])
+        if time.monotonic() - state["last_request"] > idle_limit:
+            logger.debug("Background refresh loop idle - stopping")
+            return
+        state["done"].clear()
+        await loop.run_in_executor(
+            None, background_api_refresh, state["market_data_provider"], state["broker"]
+        )
+        state["last_run"] = datetime.now()
+        state["done"].set()
+        await asyncio.sleep(state["interval"])
+
+
+def _run_refresh_loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_until_complete(_refresh_forever())
+    finally:
+        loop.close()
+        _REFRESH_DONE.set()
+
+
 def start_background_refresh_if_needed(interval_seconds=10):
     """
-    Start background refresh thread if not already running and enough time has passed.
-    Thread-safe approach compatible with Streamlit Cloud and local dev.
+    Keep the shared background refresh loop alive and pull its latest result.
+    
+    One daemon thread runs an asyncio loop for the whole process; reruns only
+    update its settings and check the loop's exit Event instead of polling is_alive().
     
     Args:
-        interval_seconds: Minimum seconds between refreshes (default: 10)
+        interval_seconds: Seconds between refresh cycles (default: 10)
     """
-    # Check if we should refresh
-    should_refresh = False
-    if st.session_state.last_refresh_time is None:
-        # First refresh
-        should_refresh = True
-    else:
-        # Check if enough time has passed
-        time_since_last = (datetime.now() - st.session_state.last_refresh_time).total_seconds()
-        if time_since_last >= interval_seconds:
-            should_refresh = True
+    state = _REFRESH_SINGLETON
+    state["interval"] = interval_seconds
+    state["market_data_provider"] = st.session_state.get('market_data_provider')
+    state["broker"] = st.session_state.get('broker')
+    state["last_request"] = time.monotonic()
     
-    # Start refresh thread if needed and not already in progress
-    if should_refresh and not st.session_state.refresh_in_progress:
-        # Check if previous thread is still running (it shouldn't be, but check anyway)
-        if st.session_state.background_refresh_thread is not None:
-            if st.session_state.background_refresh_thread.is_alive():
-                # Thread still running, wait a bit
+    with state["lock"]:
+        thread = state["thread"]
+        if thread is None or _REFRESH_DONE.is_set():
+            try:
+                thread = threading.Thread(
+                    target=_run_refresh_loop,
+                    name="background-refresh",
+                    daemon=True,
+                )
+                _REFRESH_DONE.clear()
+                thread.start()
+                state["thread"] = thread
+                logger.debug("Background API refresh loop started")
+            except Exception as e:
+                logger.error(f"Failed to start background refresh thread: {e}")
                 return
-        
-        # Start new background thread with references passed directly (thread-safe)
+    
+    last_run = state["last_run"]
+    last_seen = st.session_state.last_refresh_time
+    if state["done"].is_set() and last_run is not None and (last_seen is None or last_run > last_seen):
+        st.session_state.update({
+            'last_refresh_time': last_run,
+            'last_refresh_reason': "background",
+            'last_refresh_error': None,
+        })
+
+
+def _stop_algo() -> None:
+    """Stop-button callback: stop the live runner and record the outcome for the next render."""
+    if st.session_state.live_runner is None:
+        _set_algo_running_runtime(False)
+        st.session_state.strategy_settings_feedback = (
+            "warning",
+            "⚠️ Algo state reset – live runner unavailable.",
+        )
+    else:
         try:
-            # Get references before starting thread (thread-safe)
-            market_data_provider = st.session_state.get('market_data_provider')
-            broker = st.session_state.get('broker')
-            
-            # Start thread with references passed as arguments
-            refresh_thread = threading.Thread(
-                target=background_api_refresh,
-                args=(market_data_provider, broker),
-                daemon=True
-            )
-            refresh_thread.start()
-            st.session_state.background_refresh_thread = refresh_thread
-            # Update last refresh time (thread-safe - only writing, not reading from thread)
-            st.session_state.last_refresh_time = datetime.now()
-            st.session_state.last_refresh_reason = "background"
-            st.session_state.last_refresh_error = None
-            st.session_state.refresh_in_progress = True
-            logger.debug("Background API refresh thread started")
+            logger.info("Stopping live algorithm...")
+            success = st.session_state.live_runner.stop()
+            if success:
+                _set_algo_running_runtime(False)
+                st.session_state.strategy_settings_feedback = ("warning", "⏸️ Algorithm stopped.")
+                logger.info("Algorithm stopped successfully")
+            else:
+                # Check if it's actually stopped
+                if hasattr(st.session_state.live_runner, 'is_running'):
+                    if not st.session_state.live_runner.is_running():
+                        logger.warning("Algorithm stop() returned False but is_running() is False - syncing state")
+                        _set_algo_running_runtime(False)
+                        st.session_state.strategy_settings_feedback = ("info", "ℹ️ Algorithm is already stopped. State synced.")
+                    else:
+                        st.session_state.strategy_settings_feedback = ("error", "❌ Failed to stop algorithm. Check logs for details.")
+                        logger.error("Algorithm stop() returned False but is still running")
+                else:
+                    st.session_state.strategy_settings_feedback = ("error", "❌ Failed to stop algorithm. Check logs for details.")
+                    logger.error("Algorithm stop() returned False")
         except Exception as e:
-            logger.error(f"Failed to start background refresh thread: {e}")
-            st.session_state.refresh_in_progress = False
+            logger.exception(f"Exception during algorithm stop: {e}")
+            st.session_state.strategy_settings_feedback = ("error", f"❌ Error stopping algorithm: {e}")
+
+
+def _start_algo() -> None:
+    """Start-button callback: (re)initialise the live runner if needed and start it."""
+    if st.session_state.live_runner is None:
+        # Diagnose why live runner is not initialized
+        missing_deps = []
+        if st.session_state.get('broker') is None:
+            missing_deps.append("broker")
+        if st.session_state.get('market_data_provider') is None:
+            missing_deps.append("market_data_provider")
+        if st.session_state.get('signal_handler') is None:
+            missing_deps.append("signal_handler")
+        if st.session_state.get('trade_logger') is None:
+            missing_deps.append("trade_logger")
+
+        if missing_deps:
+            error_msg = f"❌ Live runner not initialized. Missing dependencies: {', '.join(missing_deps)}. Check broker configuration."
+        else:
+            error_msg = "❌ Live runner not initialized. Check broker configuration and try refreshing the page."
+
+        logger.error(f"Live runner unavailable. Missing: {missing_deps}")
+        st.session_state.strategy_settings_feedback = ("error", error_msg)
+
+        # Try to re-initialize live runner
+        try:
+            full_config = _strategy_config()
+
+            if (st.session_state.get('broker') is not None and 
+                st.session_state.get('market_data_provider') is not None and
+                st.session_state.get('signal_handler') is not None and
+                st.session_state.get('trade_logger') is not None):
+                logger.info("Attempting to re-initialize live runner...")
+                runner = LiveStrategyRunner(
+                    market_data_provider=st.session_state.market_data_provider,
+                    signal_handler=st.session_state.signal_handler,
+                    broker=st.session_state.broker,
+                    trade_logger=st.session_state.trade_logger,
+                    config=full_config,
+                    tick_streamer=st.session_state.get('tick_streamer'),
+                )
+                _set_live_runner_runtime(runner)
+                st.session_state.live_runner = runner
+                logger.info("Live runner re-initialized successfully")
+                st.session_state.strategy_settings_feedback = (
+                    "success",
+                    "✅ Live runner initialized. Click 'Start Algo' again to begin.",
+                )
+        except Exception as init_error:
+            logger.exception(f"Failed to re-initialize live runner: {init_error}")
+            st.session_state.strategy_settings_feedback = (
+                "error",
+                f"❌ Failed to initialize live runner: {str(init_error)}",
+            )
     else:
-        # If refresh is in progress, check if thread completed
-        if st.session_state.refresh_in_progress:
-            if st.session_state.background_refresh_thread is not None:
-                if not st.session_state.background_refresh_thread.is_alive():
-                    # Thread completed, mark as not in progress
-                    st.session_state.refresh_in_progress = False
+        try:
+            # Check if already running (double-check before attempting to start)
+            if hasattr(st.session_state.live_runner, 'is_running') and st.session_state.live_runner.is_running():
+                logger.warning("Algorithm is already running (detected via is_running()). Syncing state...")
+                _set_algo_running_runtime(True)
+                st.session_state.strategy_settings_feedback = (
+                    "info",
+                    "ℹ️ Algorithm is already running. State synced.",
+                )
+            else:
+                # Validate broker credentials before starting
+                broker = st.session_state.get('broker')
+                if broker and hasattr(broker, 'validate_credentials'):
+                    is_valid, error_msg = broker.validate_credentials()
+                    if not is_valid:
+                        st.session_state.strategy_settings_feedback = (
+                            "error",
+                            f"❌ {error_msg}. Please check broker configuration in Railway environment variables.",
+                        )
+                        logger.error(f"Broker credentials validation failed: {error_msg}")
+                        return
+
+                logger.info("Starting live algorithm...")
+                try:
+                    # Check market hours before starting (informational only - algo can start outside hours)
+                    market_hours_info = ""
+                    if hasattr(st.session_state.live_runner, '_is_market_open'):
+                        try:
+                            is_market_open = st.session_state.live_runner._is_market_open()
+                            if not is_market_open:
+                                market_hours_info = " Market is currently closed - algorithm will wait for next market open."
+                        except Exception:
+                            pass
+
+                    success = st.session_state.live_runner.start()
+                    if success:
+                        _set_algo_running_runtime(True)
+                        message = "✅ Algorithm started – monitoring live market data."
+                        if market_hours_info:
+                            message += market_hours_info
+                        st.session_state.strategy_settings_feedback = (
+                            "success",
+                            message,
+                        )
+                        logger.info(f"Algorithm started successfully{market_hours_info}")
+                    else:
+                        # Check if it's already running
+                        if hasattr(st.session_state.live_runner, 'is_running') and st.session_state.live_runner.is_running():
+                            logger.warning("Algorithm start() returned False but is_running() is True - syncing state")
+                            _set_algo_running_runtime(True)
+                            st.session_state.strategy_settings_feedback = (
+                                "info",
+                                "ℹ️ Algorithm is already running. State synced.",
+                            )
+                        else:
+                            st.session_state.strategy_settings_feedback = (
+                                "error",
+                                "❌ Failed to start algorithm. The runner may already be running or encountered an error. Check logs for details.",
+                            )
+                            logger.error("Algorithm start() returned False")
+                except Exception as start_error:
+                    logger.exception(f"Exception during algorithm start: {start_error}")
+                    st.session_state.strategy_settings_feedback = (
+                        "error",
+                        f"❌ Error starting algorithm: {str(start_error)}. Check logs for details.",
+                    )
+        except Exception as e:
+            error_detail = str(e)
+            st.session_state.strategy_settings_feedback = (
+                "error",
+                f"❌ Error starting algorithm: {error_detail}",
+            )
+            logger.exception(f"Exception while starting algorithm: {e}")
+
 
 # Tab selection is already processed earlier (before auto-refresh checks)
 # This ensures tab state is preserved when auto-refresh triggers
@@ -2213,44 +3180,23 @@ if tab == "Dashboard":
     st.header("📈 Live Algo Status")
     
     # Debug: Show that we've reached dashboard rendering
-    if 'dashboard_render_count' not in st.session_state:
-        st.session_state.dashboard_render_count = 0
-    st.session_state.dashboard_render_count += 1
+    st.session_state.dashboard_render_count = st.session_state.get('dashboard_render_count', 0) + 1
     st.caption(f"Dashboard render count: {st.session_state.dashboard_render_count}")
     
     st.markdown('<div class="dashboard-shell">', unsafe_allow_html=True)
     
-    # Safe access to session state variables with defaults
-    engine_status = st.session_state.get('algo_running', False)
-    broker_connected = st.session_state.get('broker') is not None
-    broker_config = config.get('broker', {})
-    if not isinstance(broker_config, dict) and config.get('_from_streamlit_secrets') and hasattr(st, 'secrets'):
-        try:
-            broker_secrets = getattr(st.secrets, 'broker', None)
-            broker_type = getattr(broker_secrets, 'type', 'Not Configured') if broker_secrets else 'Not Configured'
-        except Exception:
-            broker_type = 'Not Configured'
-    else:
-        broker_type = broker_config.get('type', 'Not Configured') if broker_config else 'Not Configured'
-    broker_type = (broker_type or 'Not Configured').capitalize()
+    if st.session_state.auto_refresh_enabled:
+        _render_auto_refresh_timer(st.session_state.auto_refresh_interval_sec)
     
-    market_open = False
-    if st.session_state.get('live_runner') is not None and hasattr(st.session_state.live_runner, '_is_market_open'):
-        try:
-            market_open = st.session_state.live_runner._is_market_open()
-        except Exception:
-            market_open = False
+    broker_type = _get_broker_type()
     
     active_pnl_snapshot = None
-    streamer_health = None
     if st.session_state.get('live_runner') is not None:
         try:
             active_pnl_snapshot = st.session_state.live_runner.get_active_pnl_snapshot()
-            streamer_health = active_pnl_snapshot.get("streamer") if isinstance(active_pnl_snapshot, dict) else None
         except Exception as snapshot_err:
             logger.debug(f"Active P&L snapshot unavailable: {snapshot_err}")
             active_pnl_snapshot = None
-            streamer_health = None
 
     active_trade = None
     active_trade_unrealized_value = None
@@ -2260,19 +3206,12 @@ if tab == "Dashboard":
     active_snapshot_age = None
     if st.session_state.get('trade_logger') is not None:
         try:
-            open_trades = st.session_state.trade_logger.get_open_trades()
-            if not open_trades.empty:
-                open_trades = open_trades.copy()
-                open_trades['__ts__'] = pd.to_datetime(open_trades.get('timestamp', None), errors='coerce')
-                open_trades = open_trades.sort_values('__ts__')
-                latest_trade = open_trades.iloc[-1]
+            latest_trade = _cached_latest_open_trade(
+                _trades_file_mtime(st.session_state.trade_logger),
+                st.session_state.trade_logger,
+            )
+            if latest_trade:
                 
-                def _to_float(value):
-                    try:
-                        return float(value)
-                    except (TypeError, ValueError):
-                        return None
-
                 def _clean_symbol(value: Any) -> str:
                     if value is None:
                         return ""
@@ -2286,21 +3225,17 @@ if tab == "Dashboard":
                         return ""
                     return text
                 
-                entry_price = _to_float(latest_trade.get('entry'))
-                sl_price = _to_float(latest_trade.get('sl'))
-                tp_price = _to_float(latest_trade.get('tp'))
-                strike_value = _to_float(latest_trade.get('strike'))
-                if strike_value is not None:
-                    try:
-                        strike_value = int(round(strike_value))
-                    except Exception:
-                        strike_value = None
+                numeric_fields = ('entry', 'sl', 'tp', 'strike', 'quantity')
+                nums = pd.to_numeric(
+                    pd.Series([latest_trade.get(field) for field in numeric_fields], index=numeric_fields, dtype=object),
+                    errors='coerce',
+                )
+                entry_price = float(nums['entry']) if pd.notna(nums['entry']) else None
+                sl_price = float(nums['sl']) if pd.notna(nums['sl']) else None
+                tp_price = float(nums['tp']) if pd.notna(nums['tp']) else None
+                strike_value = int(round(nums['strike'])) if pd.notna(nums['strike']) else None
                 target_points = (tp_price - entry_price) if (tp_price is not None and entry_price is not None) else None
-                qty_raw = latest_trade.get('quantity', 0)
-                try:
-                    qty_lots = int(float(qty_raw))
-                except (TypeError, ValueError):
-                    qty_lots = 0
+                qty_lots = int(nums['quantity']) if pd.notna(nums['quantity']) else 0
                 
                 raw_tradingsymbol = latest_trade.get('tradingsymbol', '')
                 tradingsymbol = canonicalize_tradingsymbol(_clean_symbol(raw_tradingsymbol))
@@ -2422,40 +3357,10 @@ if tab == "Dashboard":
                 except Exception as opt_exc:
                     logger.debug(f"Fallback option LTP fetch failed: {opt_exc}")
     
-    algo_chip_state = "success" if engine_status else "danger"
-    broker_chip_state = "info" if broker_connected else "danger"
-    market_chip_state = "warning" if market_open else "danger"
-    status_chips = [
-        _build_status_chip_html(
-            "Algo",
-            "Running" if engine_status else "Stopped",
-            state=algo_chip_state,
-            subtitle="Execution armed" if st.session_state.get('execution_armed') else "Execution disarmed",
-        ),
-        _build_status_chip_html(
-            "Broker",
-            "Connected" if broker_connected else "Not Connected",
-            state=broker_chip_state,
-            subtitle=broker_type if broker_connected else "Re-auth required",
-        ),
-        _build_status_chip_html(
-            "Market",
-            "Open" if market_open else "Closed",
-            state=market_chip_state,
-            subtitle="Live session" if market_open else "Outside NSE hours",
-        ),
-    ]
     st.markdown('<div class="status-ribbon">', unsafe_allow_html=True)
     ribbon_cols = st.columns([3, 2], gap="large")
     with ribbon_cols[0]:
-        st.markdown(f"<div class='status-chip-row'>{''.join(status_chips)}</div>", unsafe_allow_html=True)
-        if streamer_health:
-            tick_status_icon = "🟢" if streamer_health.get("connected") else "🔴"
-            last_tick_age = streamer_health.get("last_tick_age_sec")
-            if isinstance(last_tick_age, (int, float)):
-                st.caption(f"{tick_status_icon} Tick stream age: {last_tick_age:.1f}s")
-            else:
-                st.caption(f"{tick_status_icon} Tick stream {'connected' if streamer_health.get('connected') else 'idle'}")
+        _render_status_chip_row(broker_type)
     with ribbon_cols[1]:
         ui_ctrl_col, backend_ctrl_col, manual_col = st.columns([1.1, 1.1, 0.5], gap="small")
         with ui_ctrl_col:
@@ -2467,7 +3372,7 @@ if tab == "Dashboard":
             )
             if ui_auto_toggle != st.session_state.auto_refresh_enabled:
                 st.session_state.auto_refresh_enabled = ui_auto_toggle
-                st.session_state.next_auto_refresh_ts = time.time() + st.session_state.auto_refresh_interval_sec
+                st.session_state.next_auto_refresh_ts = time.monotonic() + st.session_state.auto_refresh_interval_sec
             st.caption(f"{int(st.session_state.auto_refresh_interval_sec)}s interval")
             with st.popover("⏱", help="Click to adjust UI auto-refresh interval."):
                 interval_value = st.number_input(
@@ -2479,7 +3384,7 @@ if tab == "Dashboard":
                 )
                 if interval_value != st.session_state.auto_refresh_interval_sec:
                     st.session_state.auto_refresh_interval_sec = interval_value
-                    st.session_state.next_auto_refresh_ts = time.time() + interval_value
+                    st.session_state.next_auto_refresh_ts = time.monotonic() + interval_value
         with backend_ctrl_col:
             backend_toggle = st.toggle(
                 "Backend",
@@ -2541,194 +3446,43 @@ if tab == "Dashboard":
             st.warning("⚠️ Live runner not initialized. Starting may not work. Check broker configuration.")
         
         if actual_running:
-            if st.button("⏹ Stop Algo", use_container_width=True, type="secondary", disabled=stop_disabled):
-                if st.session_state.live_runner is None:
-                    _set_algo_running_runtime(False)
-                    st.session_state.strategy_settings_feedback = (
-                        "warning",
-                        "⚠️ Algo state reset – live runner unavailable.",
-                    )
-                else:
-                    try:
-                        logger.info("Stopping live algorithm...")
-                        success = st.session_state.live_runner.stop()
-                        if success:
-                            _set_algo_running_runtime(False)
-                            st.session_state.strategy_settings_feedback = ("warning", "⏸️ Algorithm stopped.")
-                            logger.info("Algorithm stopped successfully")
-                        else:
-                            # Check if it's actually stopped
-                            if hasattr(st.session_state.live_runner, 'is_running'):
-                                if not st.session_state.live_runner.is_running():
-                                    logger.warning("Algorithm stop() returned False but is_running() is False - syncing state")
-                                    _set_algo_running_runtime(False)
-                                    st.session_state.strategy_settings_feedback = ("info", "ℹ️ Algorithm is already stopped. State synced.")
-                                else:
-                                    st.session_state.strategy_settings_feedback = ("error", "❌ Failed to stop algorithm. Check logs for details.")
-                                    logger.error("Algorithm stop() returned False but is still running")
-                            else:
-                                st.session_state.strategy_settings_feedback = ("error", "❌ Failed to stop algorithm. Check logs for details.")
-                                logger.error("Algorithm stop() returned False")
-                    except Exception as e:
-                        logger.exception(f"Exception during algorithm stop: {e}")
-                        st.session_state.strategy_settings_feedback = ("error", f"❌ Error stopping algorithm: {e}")
-                st.rerun()
+            control_label, control_type, control_action, control_disabled = (
+                "⏹ Stop Algo", "secondary", _stop_algo, stop_disabled
+            )
         else:
             # Check market hours for user feedback
-            market_open_check = False
-            if live_runner_available and hasattr(st.session_state.live_runner, '_is_market_open'):
-                try:
-                    market_open_check = st.session_state.live_runner._is_market_open()
-                except Exception:
-                    market_open_check = False
+            market_open_check = _market_open_now(st.session_state.get('live_runner'))
             
             # Show market status message if market is closed
             # Note: Algorithm CAN start outside market hours - it will just wait for market to open
             if not market_open_check and not start_disabled:
-                ist_tz = pytz.timezone('Asia/Kolkata')
-                now_ist = datetime.now(ist_tz)
+                now_ist = datetime.now(_IST)
                 market_open_time = now_ist.replace(hour=9, minute=15, second=0, microsecond=0)
-                market_close_time = now_ist.replace(hour=15, minute=30, second=0, microsecond=0)
-                
-                if now_ist.weekday() >= 5:  # Weekend
-                    st.info("ℹ️ **Market is closed (weekend).** Algorithm can start but will wait for next trading day (Monday 9:15 AM IST).")
-                elif now_ist < market_open_time:
-                    time_until_open = market_open_time - now_ist
-                    hours = int(time_until_open.total_seconds() // 3600)
-                    minutes = int((time_until_open.total_seconds() % 3600) // 60)
-                    st.info(f"ℹ️ **Market is closed.** Opens in **{hours}h {minutes}m** (9:15 AM IST). Algorithm can start but will wait for market to open before trading.")
-                elif now_ist > market_close_time:
-                    st.info("ℹ️ **Market is closed** (closed at 3:30 PM IST). Algorithm can start but will wait for next trading day.")
-            
-            if st.button("▶ Start Algo", use_container_width=True, type="primary", disabled=start_disabled):
-                if st.session_state.live_runner is None:
-                    # Diagnose why live runner is not initialized
-                    missing_deps = []
-                    if st.session_state.get('broker') is None:
-                        missing_deps.append("broker")
-                    if st.session_state.get('market_data_provider') is None:
-                        missing_deps.append("market_data_provider")
-                    if st.session_state.get('signal_handler') is None:
-                        missing_deps.append("signal_handler")
-                    if st.session_state.get('trade_logger') is None:
-                        missing_deps.append("trade_logger")
-                    
-                    if missing_deps:
-                        error_msg = f"❌ Live runner not initialized. Missing dependencies: {', '.join(missing_deps)}. Check broker configuration."
-                    else:
-                        error_msg = "❌ Live runner not initialized. Check broker configuration and try refreshing the page."
-                    
-                    logger.error(f"Live runner unavailable. Missing: {missing_deps}")
-                    st.session_state.strategy_settings_feedback = ("error", error_msg)
-                    
-                    # Try to re-initialize live runner
-                    try:
-                        import yaml as yaml_lib
-                        with open('config/config.yaml', 'r') as f:
-                            full_config = yaml_lib.safe_load(f)
-                        
-                        if (st.session_state.get('broker') is not None and 
-                            st.session_state.get('market_data_provider') is not None and
-                            st.session_state.get('signal_handler') is not None and
-                            st.session_state.get('trade_logger') is not None):
-                            logger.info("Attempting to re-initialize live runner...")
-                            from engine.live_runner import LiveStrategyRunner
-                            runner = LiveStrategyRunner(
-                                market_data_provider=st.session_state.market_data_provider,
-                                signal_handler=st.session_state.signal_handler,
-                                broker=st.session_state.broker,
-                                trade_logger=st.session_state.trade_logger,
-                                config=full_config,
-                                tick_streamer=st.session_state.get('tick_streamer'),
-                            )
-                            _set_live_runner_runtime(runner)
-                            st.session_state.live_runner = runner
-                            logger.info("Live runner re-initialized successfully")
-                            st.session_state.strategy_settings_feedback = (
-                                "success",
-                                "✅ Live runner initialized. Click 'Start Algo' again to begin.",
-                            )
-                    except Exception as init_error:
-                        logger.exception(f"Failed to re-initialize live runner: {init_error}")
-                        st.session_state.strategy_settings_feedback = (
-                            "error",
-                            f"❌ Failed to initialize live runner: {str(init_error)}",
-                        )
-                else:
-                    try:
-                        # Check if already running (double-check before attempting to start)
-                        if hasattr(st.session_state.live_runner, 'is_running') and st.session_state.live_runner.is_running():
-                            logger.warning("Algorithm is already running (detected via is_running()). Syncing state...")
-                            _set_algo_running_runtime(True)
-                            st.session_state.strategy_settings_feedback = (
-                                "info",
-                                "ℹ️ Algorithm is already running. State synced.",
-                            )
-                        else:
-                            # Validate broker credentials before starting
-                            broker = st.session_state.get('broker')
-                            if broker and hasattr(broker, 'validate_credentials'):
-                                is_valid, error_msg = broker.validate_credentials()
-                                if not is_valid:
-                                    st.session_state.strategy_settings_feedback = (
-                                        "error",
-                                        f"❌ {error_msg}. Please check broker configuration in Railway environment variables.",
-                                    )
-                                    logger.error(f"Broker credentials validation failed: {error_msg}")
-                                    st.rerun()
-                            
-                            logger.info("Starting live algorithm...")
-                            try:
-                                # Check market hours before starting (informational only - algo can start outside hours)
-                                market_hours_info = ""
-                                if hasattr(st.session_state.live_runner, '_is_market_open'):
-                                    try:
-                                        is_market_open = st.session_state.live_runner._is_market_open()
-                                        if not is_market_open:
-                                            market_hours_info = " Market is currently closed - algorithm will wait for next market open."
-                                    except Exception:
-                                        pass
-                                
-                                success = st.session_state.live_runner.start()
-                                if success:
-                                    _set_algo_running_runtime(True)
-                                    message = "✅ Algorithm started – monitoring live market data."
-                                    if market_hours_info:
-                                        message += market_hours_info
-                                    st.session_state.strategy_settings_feedback = (
-                                        "success",
-                                        message,
-                                    )
-                                    logger.info(f"Algorithm started successfully{market_hours_info}")
-                                else:
-                                    # Check if it's already running
-                                    if hasattr(st.session_state.live_runner, 'is_running') and st.session_state.live_runner.is_running():
-                                        logger.warning("Algorithm start() returned False but is_running() is True - syncing state")
-                                        _set_algo_running_runtime(True)
-                                        st.session_state.strategy_settings_feedback = (
-                                            "info",
-                                            "ℹ️ Algorithm is already running. State synced.",
-                                        )
-                                    else:
-                                        st.session_state.strategy_settings_feedback = (
-                                            "error",
-                                            "❌ Failed to start algorithm. The runner may already be running or encountered an error. Check logs for details.",
-                                        )
-                                        logger.error("Algorithm start() returned False")
-                            except Exception as start_error:
-                                logger.exception(f"Exception during algorithm start: {start_error}")
-                                st.session_state.strategy_settings_feedback = (
-                                    "error",
-                                    f"❌ Error starting algorithm: {str(start_error)}. Check logs for details.",
-                                )
-                    except Exception as e:
-                        error_detail = str(e)
-                        st.session_state.strategy_settings_feedback = (
-                            "error",
-                            f"❌ Error starting algorithm: {error_detail}",
-                        )
-                        logger.exception(f"Exception while starting algorithm: {e}")
-                st.rerun()
+                market_close_time = now_ist.replace(hour=15, minute=30, second=0, microsecond=0)
+                
+                if now_ist.weekday() >= 5:  # Weekend
+                    st.info("ℹ️ **Market is closed (weekend).** Algorithm can start but will wait for next trading day (Monday 9:15 AM IST).")
+                elif now_ist < market_open_time:
+                    time_until_open = market_open_time - now_ist
+                    hours = int(time_until_open.total_seconds() // 3600)
+                    minutes = int((time_until_open.total_seconds() % 3600) // 60)
+                    st.info(f"ℹ️ **Market is closed.** Opens in **{hours}h {minutes}m** (9:15 AM IST). Algorithm can start but will wait for market to open before trading.")
+                elif now_ist > market_close_time:
+                    st.info("ℹ️ **Market is closed** (closed at 3:30 PM IST). Algorithm can start but will wait for next trading day.")
+            
+            control_label, control_type, control_action, control_disabled = (
+                "▶ Start Algo", "primary", _start_algo, start_disabled
+            )
+        # One button slot dispatching through on_click: the callback runs before the
+        # next script pass, so the page renders the new state without an extra st.rerun().
+        st.button(
+            control_label,
+            key="algo_control_button",
+            use_container_width=True,
+            type=control_type,
+            disabled=control_disabled,
+            on_click=control_action,
+        )
         if st.session_state.live_runner is None:
             st.caption("Live runner not initialized.")
         elif actual_running:
@@ -2736,27 +3490,22 @@ if tab == "Dashboard":
         else:
             st.caption("Algo idle – ready to start.")
     with control_cols[1]:
-        if 'execution_armed' not in st.session_state:
-            st.session_state.execution_armed = False
         exec_toggle = st.toggle(
             "Arm execution",
             value=st.session_state.execution_armed,
             help="Disarm to prevent new orders while keeping analytics live.",
         )
         if exec_toggle != st.session_state.execution_armed:
-            st.session_state.execution_armed = exec_toggle
+            st.session_state.update({
+                'execution_armed': exec_toggle,
+                'strategy_settings_feedback': (
+                    ("success", "🔓 Live execution ARMED - real trades will be placed on next signal!")
+                    if exec_toggle
+                    else ("warning", "🛑 Live execution DISARMED - trades will be simulated only")
+                ),
+            })
             if st.session_state.live_runner is not None:
                 st.session_state.live_runner.execution_armed = exec_toggle
-            if exec_toggle:
-                st.session_state.strategy_settings_feedback = (
-                    "success",
-                    "🔓 Live execution ARMED - real trades will be placed on next signal!",
-                )
-            else:
-                st.session_state.strategy_settings_feedback = (
-                    "warning",
-                    "🛑 Live execution DISARMED - trades will be simulated only",
-                )
             st.rerun()
         badge_class = "badge-green" if st.session_state.execution_armed else "badge-red"
         badge_label = "Armed" if st.session_state.execution_armed else "Disarmed"
@@ -2779,7 +3528,7 @@ if tab == "Dashboard":
             st.error(message)
         st.session_state.strategy_settings_feedback = None
 
-    active_signals = st.session_state.signal_handler.get_active_signals()
+    active_signals_count = st.session_state.signal_handler.active_signals_count
     
     # Get NIFTY LTP - prioritize latest cached value from tick_update events for instant display
     nifty_ltp_value = None
@@ -2808,37 +3557,25 @@ if tab == "Dashboard":
                 except (TypeError, ValueError):
                     nifty_ltp_value = None
         
-        # Final fallback to market data provider (slower REST API)
+        # Final fallback to the LTP cached by the provider's background refresh
+        # (no REST round-trip on the render path)
         if nifty_ltp_value is None:
-            try:
-                if st.session_state.market_data_provider is not None:
-                    ohlc = st.session_state.market_data_provider.fetch_ohlc(mode="LTP")
-                    if isinstance(ohlc, dict):
-                        ltp_val = ohlc.get('ltp') or ohlc.get('close')
-                        if ltp_val is not None:
-                            nifty_ltp_value = float(ltp_val)
-                            nifty_source = "Market data provider"
-            except Exception:
-                pass
+            provider = st.session_state.market_data_provider
+            get_last_ltp = getattr(provider, 'get_last_ltp', None)
+            if callable(get_last_ltp):
+                nifty_ltp_value = get_last_ltp()
+                if nifty_ltp_value is not None:
+                    nifty_source = "Market data provider"
     
     nifty_ltp_display = f"₹{nifty_ltp_value:,.2f}" if nifty_ltp_value is not None else "—"
 
     realized_pnl = 0.0
     csv_pnl_used = False
     try:
-        from engine.pnl_service import compute_realized_pnl
-        from engine.db import init_database
-        from sqlalchemy.exc import OperationalError
-        init_database(create_all=True)
         org_id = config.get('tenant', {}).get('org_id', 'demo-org')
         user_id = config.get('tenant', {}).get('user_id', 'admin')
-        try:
-            pnl_snapshot = compute_realized_pnl(org_id, user_id)
-            realized_pnl = pnl_snapshot.get('realized_pnl', 0.0)
-        except OperationalError:
-            init_database(create_all=True)
-            pnl_snapshot = compute_realized_pnl(org_id, user_id)
-            realized_pnl = pnl_snapshot.get('realized_pnl', 0.0)
+        pnl_snapshot = _cached_realized_pnl(org_id, user_id, _trades_version(org_id, user_id))
+        realized_pnl = pnl_snapshot.get('realized_pnl', 0.0)
     except Exception:
         realized_pnl = 0.0
     if realized_pnl == 0.0 and st.session_state.get('trade_logger') is not None:
@@ -2914,7 +3651,7 @@ if tab == "Dashboard":
     with hero_right:
         st.markdown("### 📊 Mission Metrics")
         metric_tiles = [
-            _build_metric_tile_html("Signal Watching", str(len(active_signals)), "Inside Bar scanner"),
+            _build_metric_tile_html("Signal Watching", str(active_signals_count), "Inside Bar scanner"),
             _build_metric_tile_html("NIFTY LTP", nifty_ltp_display, nifty_source),
             _build_metric_tile_html("Realized P&L", realized_pnl_value, realized_pnl_subtitle),
             _build_metric_tile_html("Active P&L", active_pnl_value, active_pnl_subtitle),
@@ -2926,10 +3663,8 @@ if tab == "Dashboard":
     
     # In-app alert: toast when a new trade is logged
     try:
-        if 'last_trade_count' not in st.session_state:
-            st.session_state.last_trade_count = 0
-        current_trades = st.session_state.trade_logger.get_all_trades()
-        current_count = len(current_trades) if not current_trades.empty else 0
+        st.session_state.setdefault('last_trade_count', 0)
+        current_count = st.session_state.trade_logger.get_trade_count()
         if current_count > st.session_state.last_trade_count:
             delta = current_count - st.session_state.last_trade_count
             st.toast(f"✅ {delta} new trade(s) executed", icon="✅")
@@ -2952,19 +3687,6 @@ if tab == "Dashboard":
     inside_section_values = [("Open", "—"), ("High", "—"), ("Low", "—"), ("Close", "—")]
     range_section_values = [("Range Low", "—"), ("Range High", "—"), ("Width", "—"), ("Breakout", breakout_label)]
     
-    ist = pytz.timezone("Asia/Kolkata")
-    
-    def _format_ist(ts_value):
-        try:
-            ts = pd.to_datetime(ts_value)
-            if ts.tzinfo is None:
-                ts = ist.localize(ts)
-            else:
-                ts = ts.astimezone(ist)
-            return ts.strftime("%d-%b %I:%M %p")
-        except Exception:
-            return str(ts_value)
-    
     def _fmt_currency(val):
         try:
             return f"₹{float(val):,.2f}"
@@ -2994,27 +3716,30 @@ if tab == "Dashboard":
         one_hour_data = pd.DataFrame()
     
     if isinstance(one_hour_data, pd.DataFrame) and not one_hour_data.empty:
-        df_ib = one_hour_data.copy()
-        if 'Date' in df_ib.columns:
+        # get_1h_data() hands back its own copy, normally already typed and sorted,
+        # so only coerce/sort (and copy for that) when the frame actually needs it.
+        df_ib = one_hour_data
+        if 'Date' in df_ib.columns and not pd.api.types.is_datetime64_any_dtype(df_ib['Date']):
             try:
+                df_ib = df_ib.copy()
                 df_ib['Date'] = pd.to_datetime(df_ib['Date'])
             except Exception:
                 pass
-        df_ib = df_ib.sort_values('Date').reset_index(drop=True)
+        if not df_ib['Date'].is_monotonic_increasing:
+            df_ib = df_ib.sort_values('Date').reset_index(drop=True)
+        elif not isinstance(df_ib.index, pd.RangeIndex) or df_ib.index.start != 0:
+            df_ib = df_ib.reset_index(drop=True)
         try:
             latest_close_price = float(df_ib['Close'].iloc[-1])
         except Exception:
             latest_close_price = None
         
-        try:
-            inside_indices = detect_inside_bar(df_ib)
-        except Exception as e:
-            logger.warning(f"Inside bar detection failed in snapshot: {e}")
-            inside_indices = []
+        ib_snapshot = _inside_bar_snapshot(_bar_cache_key(df_ib), df_ib)
+        inside_indices = ib_snapshot["inside_indices"]
         
         if inside_indices:
             latest_inside_idx = inside_indices[-1]
-            mother_idx = find_mother_index(df_ib, latest_inside_idx)
+            mother_idx = ib_snapshot["mother_idx"]
             if mother_idx is not None:
                 inside_row = df_ib.iloc[latest_inside_idx]
                 mother_row = df_ib.iloc[mother_idx]
@@ -3043,19 +3768,7 @@ if tab == "Dashboard":
                 
                 breakout_direction = st.session_state.get("last_breakout_direction")
                 if breakout_direction not in ("CE", "PE"):
-                    try:
-                        breakout_direction = confirm_breakout(
-                            df_ib,
-                            range_high,
-                            range_low,
-                            latest_inside_idx,
-                            mother_idx=mother_idx,
-                            volume_threshold_multiplier=1.0,
-                            symbol="NIFTY"
-                        )
-                    except Exception as e:
-                        logger.warning(f"Inside bar snapshot breakout check failed: {e}")
-                        breakout_direction = None
+                    breakout_direction = ib_snapshot["breakout_direction"]
                 
                 if breakout_direction == "CE":
                     breakout_label = "Breakout ↑ CE"
@@ -3069,7 +3782,13 @@ if tab == "Dashboard":
                     if st.session_state.get("last_breakout_alert_key") != alert_key:
                         st.session_state.last_breakout_alert_key = alert_key
                         st.session_state.last_breakout_alert_timestamp = datetime.now().isoformat()
-                        st.audio(st.session_state.breakout_alert_audio, format="audio/wav")
+                        # One-shot autoplay element: rendered only for a new alert_key
+                        components.html(
+                            "<audio autoplay>"
+                            f"<source src=\"data:audio/wav;base64,{st.session_state._breakout_alert_b64}\" type=\"audio/wav\">"
+                            "</audio>",
+                            height=0,
+                        )
                         st.success(
                             "🔔 Breakout confirmed — audio alert triggered for the active inside bar."
                         )
@@ -3157,7 +3876,7 @@ if tab == "Dashboard":
         )
     
     strategy_cfg = config.get('strategy', {}) if isinstance(config, dict) else {}
-    filters_cfg = strategy_cfg.get('filters', {}) if isinstance(strategy_cfg, dict) else {}
+    filter_flags = _filter_flags()
     risk_cfg = config.get('risk_management', {}) if isinstance(config, dict) else {}
     timeframes_cfg = config.get('timeframes', {}) if isinstance(config, dict) else {}
     detection_tf = str(timeframes_cfg.get('detection', '1h')).upper()
@@ -3170,8 +3889,8 @@ if tab == "Dashboard":
         ("Stop Loss", f"{strategy_cfg.get('sl', '—')} pts"),
         ("ATM Offset", str(strategy_cfg.get('atm_offset', 0))),
         ("Lot Size", str(config.get('lot_size', '—'))),
-        ("Volume Spike", "Enabled" if filters_cfg.get('volume_spike') else "Disabled"),
-        ("Avoid Open Range", "Enabled" if filters_cfg.get('avoid_open_range') else "Disabled"),
+        ("Volume Spike", "Enabled" if filter_flags.get('volume_spike') else "Disabled"),
+        ("Avoid Open Range", "Enabled" if filter_flags.get('avoid_open_range') else "Disabled"),
         ("Max Positions", str(max_positions)),
         ("Timeframes", f"{detection_tf} → {confirmation_tf}"),
     ]
@@ -3184,8 +3903,21 @@ if tab == "Dashboard":
     
     footer_last_updated = None
     footer_last_reason = None
+    live_status_visible = st.session_state.get('algo_running', False) and st.session_state.get('live_runner') is not None
+    # Margin (risk panel), greeks and the ATM quote (greeks panel) are independent
+    # broker round-trips; issue them together instead of back to back.
+    broker_bundle = _fetch_broker_bundle(
+        st.session_state.get('broker'),
+        st.session_state.get('market_data_provider'),
+        include_margin=live_status_visible,
+    )
     # Live data status
-    if st.session_state.get('algo_running', False) and st.session_state.get('live_runner') is not None:
+    if live_status_visible:
+        # One clock read for the whole live-status section (expiry countdown,
+        # sync details, refresh progress) so the sections agree with each other.
+        now_wall = datetime.now().astimezone()
+        now_mono = time.monotonic()
+        tz_now = now_wall.tzinfo
         st.divider()
         st.subheader("📡 Live Data Status")
         st.caption(
@@ -3203,18 +3935,10 @@ if tab == "Dashboard":
             st.metric("Cycles Completed", status['cycle_count'])
         
         with col3:
-            if status['last_fetch_time']:
-                fetch_time = datetime.fromisoformat(status['last_fetch_time'])
-                st.metric("Last Data Fetch", fetch_time.strftime("%I:%M:%S %p"))
-            else:
-                st.metric("Last Data Fetch", "Never")
+            st.metric("Last Data Fetch", status.get('last_fetch_time_display', "Never"))
         
         with col4:
-            if status['last_signal_time']:
-                signal_time = datetime.fromisoformat(status['last_signal_time'])
-                st.metric("Last Signal", signal_time.strftime("%I:%M:%S %p"))
-            else:
-                st.metric("Last Signal", "None")
+            st.metric("Last Signal", status.get('last_signal_time_display', "None"))
         
         # Show error count if any
         if status['error_count'] > 0:
@@ -3226,38 +3950,23 @@ if tab == "Dashboard":
         
         # Get risk management status from live runner
         try:
-            # Access risk management attributes
-            daily_pnl = getattr(st.session_state.live_runner, 'daily_pnl', 0.0)
-            daily_loss_limit_pct = getattr(st.session_state.live_runner, 'daily_loss_limit_pct', 5.0)
-            max_positions = getattr(st.session_state.live_runner, 'max_concurrent_positions', 2)
-            signal_cooldown = getattr(st.session_state.live_runner, 'signal_cooldown_seconds', 3600)
-            active_positions = len(getattr(st.session_state.live_runner, 'active_monitors', []))
-            
-            # Get initial capital from config
-            initial_capital = st.session_state.live_runner.config.get('initial_capital', 100000.0)
+            risk_snapshot = st.session_state.live_runner.get_risk_snapshot()
+            daily_pnl = risk_snapshot['daily_pnl']
+            daily_loss_limit_pct = risk_snapshot['daily_loss_limit_pct']
+            max_positions = risk_snapshot['max_positions']
+            signal_cooldown = risk_snapshot['signal_cooldown']
+            active_positions = risk_snapshot['active_positions']
+            initial_capital = risk_snapshot['initial_capital']
+            is_market_open = risk_snapshot['is_market_open']
+            nearest_expiry = risk_snapshot['nearest_expiry']
+            expiry_safe = risk_snapshot['expiry_safe']
             loss_limit_amount = initial_capital * (daily_loss_limit_pct / 100.0)
             
-            # Check market hours
-            is_market_open = st.session_state.live_runner._is_market_open() if hasattr(st.session_state.live_runner, '_is_market_open') else False
-            
             # Get available margin
             available_margin = 0.0
-            try:
-                if st.session_state.broker:
-                    available_margin = st.session_state.broker.get_available_margin()
-            except:
-                pass
-            
-            # Get nearest expiry
-            nearest_expiry = None
-            expiry_safe = False
-            try:
-                if hasattr(st.session_state.live_runner, '_get_nearest_expiry'):
-                    nearest_expiry = st.session_state.live_runner._get_nearest_expiry()
-                    if nearest_expiry and hasattr(st.session_state.live_runner, '_is_safe_to_trade_expiry'):
-                        expiry_safe = st.session_state.live_runner._is_safe_to_trade_expiry(nearest_expiry)
-            except:
-                pass
+            margin_result = broker_bundle["margin"]
+            if margin_result is not None and not isinstance(margin_result, Exception):
+                available_margin = margin_result
             
             # Prefer expiry derived from live Option Greeks (if fresher)
             greeks_expiry_dt = st.session_state.get("option_greeks_expiry_dt")
@@ -3270,100 +3979,89 @@ if tab == "Dashboard":
                     pass
                 if nearest_expiry is None or normalized_expiry < nearest_expiry:
                     nearest_expiry = normalized_expiry
-                    if hasattr(st.session_state.live_runner, '_is_safe_to_trade_expiry'):
-                        expiry_safe = st.session_state.live_runner._is_safe_to_trade_expiry(nearest_expiry)
+                    expiry_safe = st.session_state.live_runner._is_safe_to_trade_expiry(nearest_expiry)
+            # Format the merged expiry once for the safety checks below
+            expiry_label = None
+            if nearest_expiry:
+                try:
+                    expiry_label = nearest_expiry.strftime("%d %b %Y (%A)")
+                except Exception:
+                    expiry_label = str(nearest_expiry)
             
             # Display safety metrics in columns
-            safety_col1, safety_col2, safety_col3, safety_col4 = st.columns(4)
-            
-            with safety_col1:
-                # Daily P&L and loss limit
-                pnl_color = "normal" if daily_pnl >= -loss_limit_amount else "inverse"
-                st.metric("Daily P&L", f"₹{daily_pnl:,.2f}", 
-                         delta=f"Limit: ₹{-loss_limit_amount:,.2f}", 
-                         delta_color=pnl_color)
-                if daily_pnl <= -loss_limit_amount:
-                    st.error(f"🚨 Daily loss limit hit! ({daily_loss_limit_pct}% of capital)")
-                elif daily_pnl <= -loss_limit_amount * 0.8:
-                    st.warning("⚠️ Approaching daily loss limit")
-                else:
-                    st.success("✅ Within daily loss limit")
-            
-            with safety_col2:
-                # Position limits
-                pos_color = "normal" if active_positions < max_positions else "inverse"
-                st.metric("Active Positions", f"{active_positions}/{max_positions}", 
-                         delta="Limit reached" if active_positions >= max_positions else "Available",
-                         delta_color=pos_color)
-                if active_positions >= max_positions:
-                    st.error("🚨 Position limit reached!")
-                else:
-                    st.success("✅ Position limit OK")
-            
-            with safety_col3:
-                # Available margin
-                st.metric("Available Margin", f"₹{available_margin:,.2f}")
-                if available_margin < 10000:
-                    st.warning("⚠️ Low margin available")
-                elif available_margin == 0:
-                    st.error("🚨 No margin data available")
-                else:
-                    st.success("✅ Margin sufficient")
+            # Currency labels formatted once and reused by the table and capital notes
+            pnl_str = f"₹{daily_pnl:,.2f}"
+            limit_str = f"₹{-loss_limit_amount:,.2f}"
+            margin_str = f"₹{available_margin:,.2f}"
+            capital_str = f"₹{initial_capital:,.2f}"
             
-            with safety_col4:
-                # Market hours status
-                market_status = "🟢 Open" if is_market_open else "🔴 Closed"
-                st.metric("Market Status", market_status)
-                if not is_market_open:
-                    st.info("⏰ Market closed - trades will not execute")
-                else:
-                    st.success("✅ Market open - ready for trading")
+            # One table instead of four metric columns with a status box under each
+            if daily_pnl <= -loss_limit_amount:
+                pnl_status = f"🚨 Daily loss limit hit! ({daily_loss_limit_pct}% of capital)"
+            elif daily_pnl <= -loss_limit_amount * 0.8:
+                pnl_status = "⚠️ Approaching daily loss limit"
+            else:
+                pnl_status = "✅ Within daily loss limit"
+            if available_margin < 10000:
+                margin_status = "⚠️ Low margin available"
+            elif available_margin == 0:
+                margin_status = "🚨 No margin data available"
+            else:
+                margin_status = "✅ Margin sufficient"
+            positions_full = active_positions >= max_positions
+            safety_rows = [
+                {
+                    "Check": "Daily P&L",
+                    "Value": pnl_str,
+                    "Detail": f"Limit: {limit_str}",
+                    "Status": pnl_status,
+                },
+                {
+                    "Check": "Active Positions",
+                    "Value": f"{active_positions}/{max_positions}",
+                    "Detail": "Limit reached" if positions_full else "Available",
+                    "Status": "🚨 Position limit reached!" if positions_full else "✅ Position limit OK",
+                },
+                {
+                    "Check": "Available Margin",
+                    "Value": margin_str,
+                    "Detail": "",
+                    "Status": margin_status,
+                },
+                {
+                    "Check": "Market Status",
+                    "Value": "🟢 Open" if is_market_open else "🔴 Closed",
+                    "Detail": "",
+                    "Status": (
+                        "✅ Market open - ready for trading" if is_market_open
+                        else "⏰ Market closed - trades will not execute"
+                    ),
+                },
+            ]
+            st.dataframe(pd.DataFrame(safety_rows), hide_index=True, use_container_width=True)
             
             # Additional safety checks
             st.write("**Safety Check Status:**")
-            check_col1, check_col2, check_col3 = st.columns(3)
-            
-            with check_col1:
-                # Expiry validation
-                if nearest_expiry:
-                    expiry_label = st.session_state.get("option_greeks_expiry_str")
-                    if not expiry_label:
-                        try:
-                            expiry_label = nearest_expiry.strftime("%d %b %Y (%A)")
-                        except Exception:
-                            expiry_label = str(nearest_expiry)
-                    now_ts = datetime.now(nearest_expiry.tzinfo) if getattr(nearest_expiry, "tzinfo", None) else datetime.now()
-                    time_remaining = nearest_expiry - now_ts
-                    remaining_seconds = time_remaining.total_seconds()
-                    if remaining_seconds <= 0:
-                        st.error(f"🚨 Expiry has passed · {expiry_label}")
-                    else:
-                        days = int(remaining_seconds // 86400)
-                        hours = int((remaining_seconds % 86400) // 3600)
-                        minutes = int((remaining_seconds % 3600) // 60)
-                        countdown_parts = []
-                        if days > 0:
-                            countdown_parts.append(f"{days} day{'s' if days != 1 else ''}")
-                        if hours > 0:
-                            countdown_parts.append(f"{hours} h")
-                        if days == 0 and minutes > 0:
-                            countdown_parts.append(f"{minutes} min")
-                        countdown = ", ".join(countdown_parts) if countdown_parts else "< 1 min"
-                    if expiry_safe:
-                            st.success(f"✅ Expiry OK: {countdown} remaining · {expiry_label}")
-                    else:
-                            st.error(f"🚨 Expiry too close: {countdown} · {expiry_label}")
+            if nearest_expiry:
+                expiry_tz = getattr(nearest_expiry, "tzinfo", None)
+                expiry_now = now_wall.astimezone(expiry_tz) if expiry_tz else now_wall.replace(tzinfo=None)
+                remaining_seconds = (nearest_expiry - expiry_now).total_seconds()
+                if remaining_seconds <= 0:
+                    expiry_row = f"🚨 Expiry has passed · {expiry_label}"
+                elif expiry_safe:
+                    expiry_row = f"✅ Expiry OK: {_format_countdown(remaining_seconds)} remaining · {expiry_label}"
                 else:
-                    st.warning("⚠️ Expiry data not available")
-            
-            with check_col2:
-                # Signal cooldown
-                cooldown_minutes = signal_cooldown / 60
-                st.info(f"📊 Signal cooldown: {cooldown_minutes:.0f} minutes")
-            
-            with check_col3:
-                # Initial capital
-                st.info(f"💰 Initial Capital: ₹{initial_capital:,.2f}")
+                    expiry_row = f"🚨 Expiry too close: {_format_countdown(remaining_seconds)} · {expiry_label}"
+            else:
+                expiry_row = "⚠️ Expiry data not available"
+            cooldown_minutes = signal_cooldown / 60
+            st.markdown(
+                "| Check | Status |\n"
+                "|---|---|\n"
+                f"| Expiry | {expiry_row} |\n"
+                f"| Cooldown | 📊 Signal cooldown: {cooldown_minutes:.0f} minutes |\n"
+                f"| Capital | 💰 Initial Capital: {capital_str} |"
+            )
             
             # Configuration section (read-only display for now)
             with st.expander("⚙️ Risk Management Configuration (Read from config.yaml)"):
@@ -3371,12 +4069,16 @@ if tab == "Dashboard":
                 st.write(f"- Daily Loss Limit: {daily_loss_limit_pct}% of capital")
                 st.write(f"- Max Concurrent Positions: {max_positions}")
                 st.write(f"- Signal Cooldown: {cooldown_minutes:.0f} minutes ({signal_cooldown} seconds)")
-                st.write(f"- Initial Capital: ₹{initial_capital:,.2f}")
+                st.write(f"- Initial Capital: {capital_str}")
                 st.caption("💡 To change these settings, edit config/config.yaml and restart the algorithm")
         
-        except Exception as e:
+        except Exception as e:  # Display-only panel: any data failure degrades to a warning
             st.warning(f"⚠️ Could not load risk management status: {e}")
-            logger.exception(e)
+            # This panel re-renders on every refresh; log at most once a minute and
+            # without a formatted traceback.
+            if time.time() - st.session_state.get('_last_risk_warn_ts', 0) > 60:
+                logger.warning(f"Risk management status unavailable: {e}")
+                st.session_state._last_risk_warn_ts = time.time()
         
         # Market data refresh feedback
         refresh_feedback = st.session_state.market_refresh_feedback
@@ -3431,13 +4133,20 @@ if tab == "Dashboard":
         elif st.session_state.get('last_refresh_error'):
             st.warning(f"⚠️ Last refresh error: {st.session_state.last_refresh_error}")
         
-        with st.expander("🔄 Backend Sync Details", expanded=False):
+        # An expander still builds its body while collapsed, so gate the sync
+        # details behind a toggle and only render them when asked for.
+        show_sync_details = st.toggle(
+            "🔄 Backend Sync Details",
+            key="backend_sync_open",
+            help="Show UI vs backend refresh timing.",
+        )
+        if show_sync_details:
             st.write(f"• UI render time: {current_ui_render_time.strftime('%d-%b %I:%M:%S %p')}")
             if display_time is not None:
                 normalized_display = display_time
                 if isinstance(display_time, datetime) and display_time.tzinfo is not None:
                     try:
-                        normalized_display = display_time.astimezone(datetime.now().astimezone().tzinfo).replace(tzinfo=None)
+                        normalized_display = display_time.astimezone(tz_now).replace(tzinfo=None)
                     except Exception:
                         normalized_display = display_time.replace(tzinfo=None)
                 st.write(f"• Backend refresh time: {display_time.strftime('%d-%b %I:%M:%S %p')} ({display_reason or 'auto'})")
@@ -3452,7 +4161,7 @@ if tab == "Dashboard":
                 st.write(f"• Previous UI render: {previous_ui_render_time.strftime('%d-%b %I:%M:%S %p')}")
             if st.session_state.auto_refresh_enabled:
                 interval = float(st.session_state.auto_refresh_interval_sec)
-                seconds_until = max(0.0, st.session_state.next_auto_refresh_ts - time.time())
+                seconds_until = max(0.0, st.session_state.next_auto_refresh_ts - now_mono)
                 completion = 0.0
                 if interval > 0:
                     completion = min(1.0, max(0.0, (interval - seconds_until) / interval))
@@ -3473,38 +4182,49 @@ if tab == "Dashboard":
         st.markdown(f"**Configured strike bias:** {bias_text} points from ATM.")
         try:
             if st.session_state.broker is not None:
-                greeks = st.session_state.broker.get_option_greeks("NIFTY")
+                greeks = broker_bundle["greeks"]
+                if isinstance(greeks, Exception):
+                    raise greeks
                 if greeks:
                     greeks_df = pd.DataFrame(greeks)
-                    expiry_candidates = []
+                    earliest_expiry = None
                     for expiry_col in ("expiry", "expiryDate", "expiry_date"):
                         if expiry_col in greeks_df.columns:
                             try:
-                                unique_values = greeks_df[expiry_col].dropna().unique()
+                                raw_expiries = greeks_df[expiry_col].dropna()
+                                # Angel returns e.g. "25NOV2025": parse the whole column in one
+                                # pass, then fall back per value only for other shapes.
+                                parsed = pd.to_datetime(
+                                    raw_expiries.astype(str).str.strip().str.upper(),
+                                    format="%d%b%Y",
+                                    errors="coerce",
+                                )
+                                unparsed = parsed.isna()
+                                if unparsed.any():
+                                    parsed = parsed.astype(object)
+                                    parsed[unparsed] = raw_expiries[unparsed].map(_parse_expiry_to_datetime)
+                                    parsed = pd.to_datetime(parsed, errors="coerce")
+                                at_midnight = (parsed.dt.hour == 0) & (parsed.dt.minute == 0)
+                                parsed = parsed.where(~at_midnight, parsed + pd.Timedelta(hours=15, minutes=30))
+                                earliest = parsed.min()
                             except Exception:
-                                unique_values = []
-                            for raw_expiry in unique_values:
-                                parsed_expiry = _parse_expiry_to_datetime(raw_expiry)
-                                if parsed_expiry:
-                                    if parsed_expiry.hour == 0 and parsed_expiry.minute == 0:
-                                        parsed_expiry = parsed_expiry.replace(hour=15, minute=30)
-                                    expiry_candidates.append(parsed_expiry)
-                            if expiry_candidates:
+                                earliest = pd.NaT
+                            if pd.notna(earliest):
+                                earliest_expiry = earliest.to_pydatetime()
                                 break
-                    if expiry_candidates:
-                        earliest_expiry = min(expiry_candidates)
+                    if earliest_expiry is not None:
                         st.session_state.option_greeks_expiry_dt = earliest_expiry
-                        st.session_state.option_greeks_expiry_str = earliest_expiry.strftime("%d %b %Y (%A)")
-                    keep_cols = [c for c in [
-                        'name','expiry','strikePrice','optionType','delta','gamma','theta','vega','impliedVolatility','tradeVolume'
-                    ] if c in greeks_df.columns]
+                        greeks_expiry_label = earliest_expiry.strftime("%d %b %Y (%A)")
+                        st.session_state.option_greeks_expiry_str = greeks_expiry_label
+                        st.caption(f"Nearest expiry: {greeks_expiry_label}")
+                    keep_cols = _GREEKS_COLS.intersection(greeks_df.columns, sort=False).tolist()
 
                     atm_val = None
                     try:
-                        if st.session_state.market_data_provider is not None:
-                            o = st.session_state.market_data_provider.fetch_ohlc(mode="LTP")
-                            lv = o.get('ltp') if isinstance(o, dict) else None
-                            if lv is None and isinstance(o, dict):
+                        o = broker_bundle["ltp_quote"]
+                        if isinstance(o, dict):
+                            lv = o.get('ltp')
+                            if lv is None:
                                 lv = o.get('close')
                             if lv is not None:
                                 atm_val = float(lv)
@@ -3513,12 +4233,21 @@ if tab == "Dashboard":
 
                     if atm_val is not None and 'strikePrice' in greeks_df.columns:
                         try:
-                            greeks_df['__dist__'] = (greeks_df['strikePrice'].astype(float) - atm_val).abs()
-                            greeks_df = greeks_df.sort_values('__dist__')
-                            greeks_df = greeks_df.head(20)
+                            strike_dist = (pd.to_numeric(greeks_df['strikePrice'], errors='coerce') - atm_val).abs()
+                            # Partial selection of the 20 nearest strikes instead of a full sort
+                            greeks_df = greeks_df.assign(__dist__=strike_dist).nsmallest(20, '__dist__')
                         except Exception:
                             pass
-                    st.dataframe(greeks_df[keep_cols] if keep_cols else greeks_df, width='stretch', height=300)
+                    greeks_view = (greeks_df[keep_cols] if keep_cols else greeks_df).copy()
+                    # Smaller Arrow payload: float32 greeks and a categorical option type
+                    for num_col in ('delta', 'gamma', 'theta', 'vega', 'impliedVolatility', 'tradeVolume'):
+                        if num_col in greeks_view.columns:
+                            numeric = pd.to_numeric(greeks_view[num_col], errors='coerce')
+                            if numeric.notna().sum() == greeks_view[num_col].notna().sum():
+                                greeks_view[num_col] = numeric.astype('float32')
+                    if 'optionType' in greeks_view.columns:
+                        greeks_view['optionType'] = greeks_view['optionType'].astype('category')
+                    st.dataframe(_to_arrow_frame(greeks_view), width='stretch', height=300)
                 else:
                     st.info("No Greeks data returned.")
             else:
@@ -3532,14 +4261,21 @@ if tab == "Dashboard":
     def _render_inside_bar_debug_section() -> None:
         if st.session_state.market_data_provider is not None and st.session_state.live_runner is not None:
             try:
-                data_1h = st.session_state.market_data_provider.get_1h_data(
-                    window_hours=st.session_state.live_runner.config.get('market_data', {}).get('data_window_hours_1h', 48)
+                md_cfg = st.session_state.live_runner.config.get('market_data', {})
+                provider = st.session_state.market_data_provider
+                # Closed bars only change at bar close, so intra-bar reruns reuse the last fetch
+                data_1h = _cached_1h_candles(
+                    str(provider.get_last_closed_hour_end()),
+                    id(provider),
+                    md_cfg.get('data_window_hours_1h', 48),
+                    provider,
                 )
-                data_15m = st.session_state.market_data_provider.get_15m_data(
-                    window_hours=st.session_state.live_runner.config.get('market_data', {}).get('data_window_hours_15m', 12)
+                data_15m = _cached_15m_candles(
+                    int(time.time() // 900),
+                    id(provider),
+                    md_cfg.get('data_window_hours_15m', 12),
+                    provider,
                 )
-                raw_data_1h = data_1h.copy() if isinstance(data_1h, pd.DataFrame) else pd.DataFrame()
-                raw_data_15m = data_15m.copy() if isinstance(data_15m, pd.DataFrame) else pd.DataFrame()
                 data_1h = align_dataframe_to_ist(data_1h)
                 data_15m = align_dataframe_to_ist(data_15m)
                 if not data_1h.empty and not data_15m.empty:
@@ -3548,70 +4284,72 @@ if tab == "Dashboard":
                         st.metric("1H Candles Available", len(data_1h))
                     with col2:
                         st.metric("15m Candles Available", len(data_15m))
-                    inside_bars = detect_inside_bar(data_1h)
+                    # Same cached pipeline as the hero snapshot, keyed on this frame's last bar
+                    debug_snapshot = _inside_bar_snapshot(_bar_cache_key(data_1h), data_1h)
+                    inside_bars = debug_snapshot["inside_indices"]
                     inside_bar_set = set(inside_bars)
                     st.write("**Recent 1H Candles Check (Last 10 - Most Recent First):**")
                     recent_count = min(10, len(data_1h))
                     recent_data = data_1h.tail(recent_count)
-                    display_data = []
-                    for i in range(len(recent_data) - 1, -1, -1):
-                        original_idx = len(data_1h) - recent_count + i
-                        time_val = recent_data.iloc[i]['Date'] if 'Date' in recent_data.columns else f"Row_{original_idx}"
-                        if isinstance(time_val, pd.Timestamp) or hasattr(time_val, 'strftime'):
-                            try:
-                                time_str = format_ist_timestamp(time_val)
-                            except Exception:
-                                time_str = str(time_val)
-                        else:
-                            time_str = str(time_val)
-                        row_data = {
-                            'Row': original_idx,
-                            'Time (IST)': time_str,
-                            'High': f"{recent_data.iloc[i]['High']:.2f}",
-                            'Low': f"{recent_data.iloc[i]['Low']:.2f}",
-                            'Close': f"{recent_data.iloc[i]['Close']:.2f}",
-                        }
-                        is_inside = original_idx in inside_bar_set and original_idx >= 2
-                        if is_inside:
-                            row_data['Status'] = '✅ Inside Bar'
-                            if original_idx > 0:
-                                ref_high = data_1h['High'].iloc[original_idx - 1]
-                                ref_low = data_1h['Low'].iloc[original_idx - 1]
-                                current_high = recent_data.iloc[i]['High']
-                                current_low = recent_data.iloc[i]['Low']
-                                row_data['Reference Range'] = f"{ref_low:.2f} - {ref_high:.2f}"
-                                row_data['Inside Check'] = f"✓ High {current_high:.2f} < {ref_high:.2f} ✓ Low {current_low:.2f} > {ref_low:.2f}"
-                            else:
-                                row_data['Reference Range'] = 'N/A'
-                                row_data['Inside Check'] = 'N/A'
-                        else:
-                            row_data['Status'] = '❌ Not Inside'
-                            if original_idx > 0:
-                                ref_high = data_1h['High'].iloc[original_idx - 1]
-                                ref_low = data_1h['Low'].iloc[original_idx - 1]
-                                current_high = recent_data.iloc[i]['High']
-                                current_low = recent_data.iloc[i]['Low']
-                                if current_high >= ref_high and current_low <= ref_low:
-                                    row_data['Reference Range'] = f"{ref_low:.2f} - {ref_high:.2f}"
-                                    row_data['Inside Check'] = f"✗ High {current_high:.2f} >= {ref_high:.2f} ✗ Low {current_low:.2f} <= {ref_low:.2f}"
-                                elif current_high >= ref_high:
-                                    row_data['Reference Range'] = f"{ref_low:.2f} - {ref_high:.2f}"
-                                    row_data['Inside Check'] = f"✗ High {current_high:.2f} >= {ref_high:.2f} (must be < {ref_high:.2f})"
-                                elif current_low <= ref_low:
-                                    row_data['Reference Range'] = f"{ref_low:.2f} - {ref_high:.2f}"
-                                    row_data['Inside Check'] = f"✗ Low {current_low:.2f} <= {ref_low:.2f} (must be > {ref_low:.2f})"
-                                else:
-                                    row_data['Reference Range'] = f"{ref_low:.2f} - {ref_high:.2f}"
-                                    row_data['Inside Check'] = "✓ High ✓ Low (unexpected - check logic)"
-                            else:
-                                row_data['Reference Range'] = '—'
-                                row_data['Inside Check'] = 'No reference'
-                        display_data.append(row_data)
-                    display_df = pd.DataFrame(display_data)
-                    st.dataframe(display_df, use_container_width=True, hide_index=True)
+                    row_idx = np.arange(len(data_1h) - recent_count, len(data_1h))
+                    cur_high = recent_data['High'].to_numpy(dtype=float)
+                    cur_low = recent_data['Low'].to_numpy(dtype=float)
+                    ref_high = data_1h['High'].shift(1).iloc[-recent_count:].to_numpy(dtype=float)
+                    ref_low = data_1h['Low'].shift(1).iloc[-recent_count:].to_numpy(dtype=float)
+                    fmt2 = np.vectorize("{:.2f}".format, otypes=[object])
+                    high_s, low_s = fmt2(cur_high), fmt2(cur_low)
+                    ref_high_s, ref_low_s = fmt2(ref_high), fmt2(ref_low)
+                    if 'Date' in recent_data.columns and pd.api.types.is_datetime64_any_dtype(recent_data['Date']):
+                        # Same layout as format_ist_timestamp, formatted for the whole column at once
+                        recent_dates = recent_data['Date']
+                        recent_dates = (
+                            recent_dates.dt.tz_localize('Asia/Kolkata')
+                            if recent_dates.dt.tz is None
+                            else recent_dates.dt.tz_convert('Asia/Kolkata')
+                        )
+                        time_s = recent_dates.dt.strftime("%d-%b-%Y %I:%M %p IST").fillna("—").to_numpy(dtype=object)
+                    elif 'Date' in recent_data.columns:
+                        time_s = recent_data['Date'].map(
+                            lambda v: format_ist_timestamp(v) if hasattr(v, 'strftime') else str(v)
+                        ).to_numpy()
+                    else:
+                        time_s = np.array([f"Row_{i}" for i in row_idx], dtype=object)
+                    is_inside = np.isin(row_idx, list(inside_bar_set)) & (row_idx >= 2)
+                    has_ref = row_idx > 0
+                    high_break = cur_high >= ref_high
+                    low_break = cur_low <= ref_low
+                    ref_range = np.where(has_ref, ref_low_s + " - " + ref_high_s, '—')
+                    inside_check = np.select(
+                        [
+                            is_inside,
+                            ~has_ref,
+                            high_break & low_break,
+                            high_break,
+                            low_break,
+                        ],
+                        [
+                            "✓ High " + high_s + " < " + ref_high_s + " ✓ Low " + low_s + " > " + ref_low_s,
+                            'No reference',
+                            "✗ High " + high_s + " >= " + ref_high_s + " ✗ Low " + low_s + " <= " + ref_low_s,
+                            "✗ High " + high_s + " >= " + ref_high_s + " (must be < " + ref_high_s + ")",
+                            "✗ Low " + low_s + " <= " + ref_low_s + " (must be > " + ref_low_s + ")",
+                        ],
+                        default="✓ High ✓ Low (unexpected - check logic)",
+                    )
+                    display_df = pd.DataFrame({
+                        'Row': row_idx,
+                        'Time (IST)': time_s,
+                        'High': high_s,
+                        'Low': low_s,
+                        'Close': fmt2(recent_data['Close'].to_numpy(dtype=float)),
+                        'Status': np.where(is_inside, '✅ Inside Bar', '❌ Not Inside'),
+                        'Reference Range': ref_range,
+                        'Inside Check': inside_check,
+                    }).iloc[::-1]
+                    st.dataframe(_to_arrow_frame(display_df), use_container_width=True, hide_index=True)
                     if inside_bars:
                         latest_idx = inside_bars[-1]
-                        mother_idx = find_mother_index(data_1h, latest_idx)
+                        mother_idx = debug_snapshot["mother_idx"]
                         if mother_idx is None:
                             st.warning("Unable to determine mother candle for the latest inside bar.")
                         else:
@@ -3636,15 +4374,7 @@ if tab == "Dashboard":
                             ui_breakout_direction = st.session_state.get("last_breakout_direction")
                             direction = ui_breakout_direction
                             if direction not in ("CE", "PE"):
-                                direction = confirm_breakout(
-                                    data_1h,
-                                    range_high,
-                                    range_low,
-                                    latest_idx,
-                                    mother_idx=mother_idx,
-                                    volume_threshold_multiplier=1.0,
-                                    symbol="NIFTY"
-                                )
+                                direction = debug_snapshot["breakout_direction"]
                             price_at_last_candle = data_1h['Close'].iloc[-1]
                             within_range = range_low <= price_at_last_candle <= range_high
                             if direction == "CE":
@@ -3804,8 +4534,7 @@ if tab == "Dashboard":
     
     # Fallback: Periodic NIFTY LTP polling if WebSocket not working
     # Poll tick streamer cache directly every 2 seconds for NIFTY updates
-    if 'last_nifty_poll_ts' not in st.session_state:
-        st.session_state.last_nifty_poll_ts = 0
+    st.session_state.setdefault('last_nifty_poll_ts', 0)
     
     now = time.time()
     poll_interval = 2.0  # Poll every 2 seconds
@@ -3836,11 +4565,6 @@ if tab == "Dashboard":
     if st.session_state.get('_websocket_trigger_rerun', False):
         st.session_state._websocket_trigger_rerun = False
         st.rerun()
-    
-    # Auto-refresh fallback (non-blocking) - Only on Dashboard tab
-    # Note: Removed blocking time.sleep() calls that cause blur overlay
-    # The auto-refresh at the top of the script (line 1888-1899) handles this better
-    # This section is kept as a safety net but doesn't block
 
 # ============ TRADE JOURNAL TAB ============
 elif tab == "Portfolio":
@@ -3849,48 +4573,34 @@ elif tab == "Portfolio":
         st.warning("⚠️ Broker not initialized. Please check your broker configuration in Settings.")
     else:
         # Cached fetchers to respect API rate limits
-        @st.cache_data(ttl=0)
-        def _fetch_holdings():
-            import time
-            attempts = 0
-            while attempts < 2:
-                try:
-                    return st.session_state.broker.get_holdings()
-                except Exception as e:
-                    logger.exception(e)
-                    attempts += 1
-                    time.sleep(2)
-            return []
-
-        @st.cache_data(ttl=0)
-        def _fetch_all_holdings():
-            import time
-            attempts = 0
-            while attempts < 2:
-                try:
-                    return st.session_state.broker.get_all_holdings()
-                except Exception as e:
-                    logger.exception(e)
-                    attempts += 1
-                    time.sleep(2)
-            return {}
-
-        @st.cache_data(ttl=0)
-        def _fetch_positions_book():
-            import time
-            attempts = 0
-            while attempts < 2:
-                try:
-                    # Prefer detailed positions book endpoint
-                    if hasattr(st.session_state.broker, 'get_positions_book'):
-                        return st.session_state.broker.get_positions_book()
-                    # Fallback to generic positions
-                    return st.session_state.broker.get_positions()
-                except Exception as e:
-                    logger.exception(e)
-                    attempts += 1
-                    time.sleep(2)
-            return []
+        @st.cache_data(ttl=15, show_spinner=False)
+        def _fetch_holdings_df(account_key, _broker):
+            holdings = _rate_limited_broker_read('holdings', _broker, _broker.get_holdings, [])
+            return _records_to_frame(holdings, 'holdings')
+
+        @st.cache_data(ttl=15, show_spinner=False)
+        def _fetch_all_holdings(account_key, _broker):
+            return _rate_limited_broker_read('all_holdings', _broker, _broker.get_all_holdings, {})
+
+        @st.cache_data(ttl=15, show_spinner=False)
+        def _fetch_positions_df(account_key, _broker):
+            # Prefer detailed positions book endpoint, fall back to generic positions
+            if _broker_capabilities(type(_broker))['positions_book']:
+                call = _broker.get_positions_book
+            else:
+                call = _broker.get_positions
+            positions = _rate_limited_broker_read('positions_book', _broker, call, [])
+            return _records_to_frame(positions, 'positions')
+
+        def _fetch_portfolio_bundle(broker):
+            """All-holdings totals, holdings and positions, fetched concurrently."""
+            executor = _get_broker_io_executor()
+            account_key = _broker_account_key(broker)
+            futures = [
+                executor.submit(fetch, account_key, broker)
+                for fetch in (_fetch_all_holdings, _fetch_holdings_df, _fetch_positions_df)
+            ]
+            return tuple(_unless_throttled(future) for future in futures)
 
         # Controls
         colr1, colr2 = st.columns([1,1])
@@ -3900,33 +4610,25 @@ elif tab == "Portfolio":
             st.caption("💡 Data cached for 15s to avoid API rate limits")
 
         if refresh:
-            _fetch_holdings.clear()
+            _fetch_holdings_df.clear()
             _fetch_all_holdings.clear()
-            _fetch_positions_book.clear()
+            _fetch_positions_df.clear()
+
+        all_hold, hdf, pdf = _fetch_portfolio_bundle(st.session_state.broker)
+
+        # Totals (all holdings): Angel mixes camelCase and lowercase keys, so fold once
+        hold_totals = (
+            {str(k).lower(): v for k, v in all_hold.items()} if isinstance(all_hold, dict) else {}
+        )
+
+        def _fmt_holding_total(value, template: str = "₹{:,.2f}") -> str:
+            return template.format(float(value)) if value else "—"
 
-        # Totals (all holdings)
-        all_hold = _fetch_all_holdings()
         met1, met2, met3, met4 = st.columns(4)
-        with met1:
-            tv = all_hold.get('totalholdingvalue') if isinstance(all_hold, dict) else None
-            if tv is None and isinstance(all_hold, dict):
-                tv = all_hold.get('totalHoldingValue')
-            st.metric("Total Holding Value", f"₹{float(tv):,.2f}" if tv else "—")
-        with met2:
-            iv = all_hold.get('totalinvestmentvalue') if isinstance(all_hold, dict) else None
-            if iv is None and isinstance(all_hold, dict):
-                iv = all_hold.get('totalInvestmentValue')
-            st.metric("Total Investment", f"₹{float(iv):,.2f}" if iv else "—")
-        with met3:
-            pnl = all_hold.get('totalprofitandloss') if isinstance(all_hold, dict) else None
-            if pnl is None and isinstance(all_hold, dict):
-                pnl = all_hold.get('totalProfitAndLoss')
-            st.metric("Total P&L", f"₹{float(pnl):,.2f}" if pnl else "—")
-        with met4:
-            pnlp = all_hold.get('totalprofitandlosspercent') if isinstance(all_hold, dict) else None
-            if pnlp is None and isinstance(all_hold, dict):
-                pnlp = all_hold.get('totalProfitAndLossPercent')
-            st.metric("P&L %", f"{float(pnlp):.2f}%" if pnlp else "—")
+        met1.metric("Total Holding Value", _fmt_holding_total(hold_totals.get('totalholdingvalue')))
+        met2.metric("Total Investment", _fmt_holding_total(hold_totals.get('totalinvestmentvalue')))
+        met3.metric("Total P&L", _fmt_holding_total(hold_totals.get('totalprofitandloss')))
+        met4.metric("P&L %", _fmt_holding_total(hold_totals.get('totalprofitandlosspercent'), "{:.2f}%"))
 
         st.divider()
         
@@ -3935,9 +4637,7 @@ elif tab == "Portfolio":
             st.subheader("📊 Configure Trade Parameters")
             
             # Load current values from config
-            import yaml as yaml_lib
-            with open('config/config.yaml', 'r') as f:
-                strategy_config = yaml_lib.safe_load(f)
+            strategy_config = _strategy_config()
             
             pm_config = strategy_config.get('position_management', {})
             
@@ -3991,35 +4691,29 @@ elif tab == "Portfolio":
                 st.success("✅ Trade parameters saved (Note: Changes require algo restart to take effect)")
         
         st.subheader("📦 Holdings")
-        holdings = _fetch_holdings()
-        if holdings:
-            try:
-                hdf = pd.DataFrame(holdings)
-                st.dataframe(hdf, use_container_width=True, height=300)
-            except Exception as e:
-                st.warning(f"Failed to render holdings: {e}")
+        if hdf is None:
+            st.info("⏳ Broker rate limit reached. Holdings will load on the next refresh.")
+        elif hdf.attrs.get('build_error'):
+            st.warning(f"Failed to render holdings: {hdf.attrs['build_error']}")
+        elif not hdf.empty:
+            st.dataframe(hdf, use_container_width=True, height=300, hide_index=True)
         else:
             st.info("ℹ️ No holdings returned.")
 
         st.divider()
         st.subheader("🧾 Positions (Day/Net)")
-        positions = _fetch_positions_book()
-        if positions:
-            try:
-                pdf = pd.DataFrame(positions)
-                st.dataframe(pdf, width='stretch', height=300)
-            except Exception as e:
-                st.warning(f"Failed to render positions: {e}")
+        if pdf is None:
+            st.info("⏳ Broker rate limit reached. Positions will load on the next refresh.")
+        elif pdf.attrs.get('build_error'):
+            st.warning(f"Failed to render positions: {pdf.attrs['build_error']}")
+        elif not pdf.empty:
+            st.dataframe(pdf, width='stretch', height=300, hide_index=True)
         else:
             st.info("No positions returned.")
 
 elif tab == "P&L":
     st.header("💹 P&L Analysis")
     try:
-        from engine.pnl_service import compute_realized_pnl, pnl_timeseries
-        from engine.db import init_database
-        from sqlalchemy.exc import OperationalError
-        
         # Prepare CSV-based fallback in case database snapshots are empty/unavailable
         csv_total_pnl = None
         csv_series = []
@@ -4056,9 +4750,9 @@ elif tab == "P&L":
                                 if pd.notna(val)
                             ]
         
-        # Ensure database is initialized
+        # Ensure database is initialized (create_all runs once per process)
         try:
-            init_database(create_all=True)
+            _ensure_database()
         except Exception as db_init_error:
             logger.warning(f"Database initialization warning: {db_init_error}")
         
@@ -4068,9 +4762,10 @@ elif tab == "P&L":
 
         # Get P&L data with error handling
         try:
-            res = compute_realized_pnl(org_id, user_id)
+            trades_version = _trades_version(org_id, user_id)
+            res = _cached_realized_pnl(org_id, user_id, trades_version)
             total_pnl = res.get('realized_pnl', 0.0)
-            series = pnl_timeseries(org_id, user_id)
+            series = _cached_pnl_timeseries(org_id, user_id, trades_version)
         except OperationalError as db_error:
             # Database table doesn't exist - initialize and retry
             logger.warning(f"Database table missing, initializing: {db_error}")
@@ -4096,18 +4791,8 @@ elif tab == "P&L":
             series = csv_series
         
         # Cumulative P&L Card
-        pnl_color = "🟢" if total_pnl >= 0 else "🔴"
-        status_bg = "status-green" if total_pnl >= 0 else "status-red"
-        st.markdown(f"""
-        <div class="status-card {status_bg}">
-            <h3 style="margin:0; color: {'#155724' if total_pnl >= 0 else '#721c24'};">
-                📊 Cumulative P&L
-            </h3>
-            <p style="font-size:2rem; margin:0.5rem 0; font-weight:bold;">
-                {pnl_color} ₹{total_pnl:,.2f}
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
+        pnl_card = _PNL_CARD_GREEN if total_pnl >= 0 else _PNL_CARD_RED
+        st.markdown(pnl_card.format(value=f"{total_pnl:,.2f}"), unsafe_allow_html=True)
         
         st.divider()
         
@@ -4117,26 +4802,15 @@ elif tab == "P&L":
         with colp1:
             st.subheader("📈 Realized vs Unrealized P&L")
             try:
-                # Get trade data for unrealized P&L
-                all_trades = st.session_state.trade_logger.get_all_trades()
-                if not all_trades.empty and 'pnl' in all_trades.columns:
-                    realized_pnl = all_trades[all_trades['pnl'].notna()]['pnl'].sum()
+                # Recorded P&L from the log (already NaN-free), summed in one pass
+                trade_logger = st.session_state.trade_logger
+                pnl_values = _cached_pnl_series(trade_logger.get_log_version(), trade_logger)
+                if pnl_values.size:
+                    realized_pnl = float(pnl_values.sum())
                     # For unrealized, estimate from active positions
                     unrealized_pnl = 0.0  # Placeholder - would need position data
                     
-                    # Create bar chart
-                    fig = go.Figure(data=[
-                        go.Bar(name='Realized P&L', x=['P&L'], y=[realized_pnl], marker_color='green' if realized_pnl >= 0 else 'red'),
-                        go.Bar(name='Unrealized P&L', x=['P&L'], y=[unrealized_pnl], marker_color='orange')
-                    ])
-                    fig.update_layout(
-                        title="P&L Breakdown",
-                        xaxis_title="",
-                        yaxis_title="Amount (₹)",
-                        height=400,
-                        showlegend=True
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(_pnl_breakdown_figure(realized_pnl, unrealized_pnl), use_container_width=True)
                 else:
                     st.info("📊 Start Trading to track P&L")
             except Exception as e:
@@ -4146,29 +4820,9 @@ elif tab == "P&L":
             st.subheader("📅 Daily P&L Trend")
             try:
                 if series:
-                    s_df = pd.DataFrame(series)
-                    if 'date' in s_df.columns:
-                        s_df['date'] = pd.to_datetime(s_df['date'])
-                        s_df = s_df.sort_values('date')
-                        
-                        # Create Plotly line chart
-                        fig = go.Figure()
-                        fig.add_trace(go.Scatter(
-                            x=s_df['date'],
-                            y=s_df.get('pnl', s_df.iloc[:, 1]) if 'pnl' in s_df.columns else s_df.iloc[:, 1],
-                            mode='lines+markers',
-                            name='Daily P&L',
-                            line=dict(color='#1f77b4', width=2),
-                            fill='tonexty' if len(s_df.columns) > 1 else None
-                        ))
-                        fig.update_layout(
-                            title="Daily P&L Trend",
-                            xaxis_title="Date",
-                            yaxis_title="P&L (₹)",
-                            height=400,
-                            hovermode='x unified'
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
+                    daily_fig = _daily_pnl_figure(series)
+                    if daily_fig is not None:
+                        st.plotly_chart(daily_fig, use_container_width=True)
                     else:
                         st.info("📊 Start Trading to track P&L")
                 else:
@@ -4196,7 +4850,6 @@ elif tab == "P&L":
 elif tab == "Insights":
     st.header("🧠 Trading Insights")
     try:
-        from engine.ai_analysis import analyze_trades
         org_id = config.get('tenant', {}).get('org_id', 'demo-org')
         user_id = config.get('tenant', {}).get('user_id', 'admin')
         
@@ -4209,19 +4862,20 @@ elif tab == "Insights":
             help="Select the number of days to analyze trades"
         )
         
-        res = analyze_trades(org_id, user_id, lookback_days=lookback)
+        res = _cached_analyze_trades(org_id, user_id, lookback, _trades_version(org_id, user_id))
         
-        # Calculate additional metrics
+        # Execution counts come from the DB; the win/loss KPIs from the journal's per-trade P&L,
+        # both windowed by the same lookback
         total_trades = res.get('total_trades', 0)
-        winning_trades = res.get('winning_trades', 0)
-        losing_trades = res.get('losing_trades', 0)
         realized_pnl = res.get('realized_pnl', 0)
-        avg_win = res.get('avg_win', 0)
-        avg_loss = res.get('avg_loss', 0)
-        
-        # Calculate win rate and risk:reward
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-        risk_reward = (avg_win / abs(avg_loss)) if avg_loss != 0 else 0
+        trade_logger = st.session_state.trade_logger
+        kpis = _cached_pnl_kpis(trade_logger.get_log_version(), lookback, trade_logger)
+        winning_trades = kpis['winning_trades']
+        losing_trades = kpis['losing_trades']
+        avg_win = kpis['avg_win']
+        avg_loss = kpis['avg_loss']
+        win_rate = kpis['win_rate']
+        risk_reward = kpis['risk_reward']
         
         # Check if we have data
         if total_trades == 0:
@@ -4297,46 +4951,18 @@ elif tab == "Insights":
                     win_count = winning_trades if total_trades > 0 else 20
                     loss_count = losing_trades if total_trades > 0 else 10
                     
-                    fig = go.Figure(data=[go.Pie(
-                        labels=['Wins', 'Losses'],
-                        values=[win_count, loss_count],
-                        hole=0.3,
-                        marker_colors=['green', 'red']
-                    )])
-                    fig.update_layout(
-                        title="Win/Loss Distribution",
-                        height=400
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(_win_loss_figure(win_count, loss_count), use_container_width=True)
                 except Exception as e:
                     st.warning(f"⚠️ Could not generate chart: {e}")
             
             with col2:
                 st.subheader("📈 P&L Trend")
                 try:
-                    # Get trade data for trend
-                    all_trades = st.session_state.trade_logger.get_all_trades()
-                    if not all_trades.empty and 'pnl' in all_trades.columns:
-                        # Create cumulative P&L chart
-                        all_trades_sorted = all_trades.sort_values('timestamp' if 'timestamp' in all_trades.columns else all_trades.columns[0])
-                        cumulative_pnl = all_trades_sorted['pnl'].cumsum()
-                        
-                        fig = go.Figure()
-                        fig.add_trace(go.Scatter(
-                            x=list(range(len(cumulative_pnl))),
-                            y=cumulative_pnl,
-                            mode='lines+markers',
-                            name='Cumulative P&L',
-                            line=dict(color='#1f77b4', width=2),
-                            fill='tozeroy'
-                        ))
-                        fig.update_layout(
-                            title="Cumulative P&L Over Time",
-                            xaxis_title="Trade Number",
-                            yaxis_title="Cumulative P&L (₹)",
-                            height=400
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
+                    # Timestamp-ordered P&L straight from the log; cumsum on the raw array
+                    trade_logger = st.session_state.trade_logger
+                    cum_fig = _cumulative_pnl_figure(trade_logger.get_log_version(), trade_logger)
+                    if cum_fig is not None:
+                        st.plotly_chart(cum_fig, use_container_width=True)
                     else:
                         st.info("📊 No trade data available for trend analysis")
                 except Exception as e:
@@ -4348,7 +4974,7 @@ elif tab == "Insights":
         top = res.get('top_symbols', [])
         if top:
             tdf = pd.DataFrame(top, columns=["Symbol", "Trades"])
-            st.dataframe(tdf, use_container_width=True, height=200)
+            st.dataframe(tdf, use_container_width=True, height=200, hide_index=True)
         else:
             st.info("📊 No symbol concentration yet. Start trading to see your top symbols.")
             
@@ -4361,36 +4987,34 @@ elif tab == "Orders & Trades":
     if st.session_state.broker is None:
         st.warning("Broker not initialized.")
     else:
-        @st.cache_data(ttl=0)
-        def _fetch_order_book():
-            import time
-            attempts = 0
-            while attempts < 2:
-                try:
-                    if hasattr(st.session_state.broker, 'get_order_book'):
-                        return st.session_state.broker.get_order_book()
-                    # Fallback via SmartAPI SDK if method absent
-                    return st.session_state.broker.smart_api.orderBook().get('data', [])
-                except Exception as e:
-                    logger.exception(e)
-                    attempts += 1
-                    time.sleep(2)
-            return []
-
-        @st.cache_data(ttl=0)
-        def _fetch_trade_book():
-            import time
-            attempts = 0
-            while attempts < 2:
-                try:
-                    if hasattr(st.session_state.broker, 'get_trade_book'):
-                        return st.session_state.broker.get_trade_book()
-                    return st.session_state.broker.smart_api.tradeBook().get('data', [])
-                except Exception as e:
-                    logger.exception(e)
-                    attempts += 1
-                    time.sleep(2)
-            return []
+        @st.cache_data(ttl=15, show_spinner=False)
+        def _fetch_order_book_df(account_key, _broker):
+            if _broker_capabilities(type(_broker))['order_book']:
+                call = _broker.get_order_book
+            else:
+                # Fallback via SmartAPI SDK if method absent
+                def call():
+                    return _broker.smart_api.orderBook().get('data', [])
+            orders = _rate_limited_broker_read('order_book', _broker, call, [])
+            return _records_to_frame(orders, 'order book')
+
+        @st.cache_data(ttl=15, show_spinner=False)
+        def _fetch_trade_book_df(account_key, _broker):
+            if _broker_capabilities(type(_broker))['trade_book']:
+                call = _broker.get_trade_book
+            else:
+                def call():
+                    return _broker.smart_api.tradeBook().get('data', [])
+            trades = _rate_limited_broker_read('trade_book', _broker, call, [])
+            return _records_to_frame(trades, 'trade book')
+
+        def _fetch_books(broker):
+            """Order book and trade book, fetched concurrently."""
+            executor = _get_broker_io_executor()
+            account_key = _broker_account_key(broker)
+            orders_future = executor.submit(_fetch_order_book_df, account_key, broker)
+            trades_future = executor.submit(_fetch_trade_book_df, account_key, broker)
+            return _unless_throttled(orders_future), _unless_throttled(trades_future)
 
         colb1, colb2 = st.columns([1,1])
         with colb1:
@@ -4399,40 +5023,33 @@ elif tab == "Orders & Trades":
             refresh_tb = st.button("🔄 Refresh Trades", use_container_width=True)
 
         if refresh_ob:
-            _fetch_order_book.clear()
+            _fetch_order_book_df.clear()
         if refresh_tb:
-            _fetch_trade_book.clear()
+            _fetch_trade_book_df.clear()
+
+        odf, tdf = _fetch_books(st.session_state.broker)
 
         st.subheader("🗂️ Order Book")
-        orders = _fetch_order_book()
-        if orders:
-            try:
-                odf = pd.DataFrame(orders)
-                # Common helpful columns if present
-                cols = [c for c in [
-                    'orderid','tradingsymbol','symboltoken','exchange','transactiontype','producttype',
-                    'ordertype','status','price','triggerprice','quantity','filledshares','unfilledshares',
-                    'createdtime','updatetime'
-                ] if c in odf.columns]
-                st.dataframe(odf[cols] if cols else odf, width='stretch', height=300)
-            except Exception as e:
-                st.warning(f"Failed to render order book: {e}")
+        if odf is None:
+            st.info("⏳ Broker rate limit reached. Orders will load on the next refresh.")
+        elif odf.attrs.get('build_error'):
+            st.warning(f"Failed to render order book: {odf.attrs['build_error']}")
+        elif not odf.empty:
+            # Common helpful columns if present
+            cols = _ORDER_COLS.intersection(odf.columns, sort=False).tolist()
+            st.dataframe(odf[cols] if cols else odf, width='stretch', height=300, hide_index=True)
         else:
             st.info("No orders returned.")
 
         st.divider()
         st.subheader("📒 Trade Book (Day Trades)")
-        trades = _fetch_trade_book()
-        if trades:
-            try:
-                tdf = pd.DataFrame(trades)
-                cols = [c for c in [
-                    'orderid','tradingsymbol','symboltoken','exchange','transactiontype','producttype',
-                    'price','quantity','filltime','tradetime'
-                ] if c in tdf.columns]
-                st.dataframe(tdf[cols] if cols else tdf, width='stretch', height=300)
-            except Exception as e:
-                st.warning(f"Failed to render trade book: {e}")
+        if tdf is None:
+            st.info("⏳ Broker rate limit reached. Trades will load on the next refresh.")
+        elif tdf.attrs.get('build_error'):
+            st.warning(f"Failed to render trade book: {tdf.attrs['build_error']}")
+        elif not tdf.empty:
+            cols = _TRADE_COLS.intersection(tdf.columns, sort=False).tolist()
+            st.dataframe(tdf[cols] if cols else tdf, width='stretch', height=300, hide_index=True)
         else:
             st.info("No trades returned.")
 
@@ -4454,19 +5071,14 @@ elif tab == "Trade Journal":
     
     trade_logger = st.session_state.trade_logger
     
-    # Get all trades
-    all_trades = trade_logger.get_all_trades()
+    # Get all trades (timestamps parsed once per log change, not per rerun)
+    all_trades = _cached_journal_trades(trade_logger.get_log_version(), trade_logger)
 
     def _fetch_recent_missed(limit: int = 5):
-        try:
-            from engine.db import get_session, init_database
-            from engine.models import MissedTrade
-        except Exception:
-            return []
         cfg = config if isinstance(config, dict) else {}
         org_id, user_id = resolve_tenant(cfg)
         try:
-            init_database(create_all=True)
+            _ensure_database()
         except Exception:
             pass
         sess_gen = get_session()
@@ -4507,9 +5119,12 @@ elif tab == "Trade Journal":
     snapshot_tabs = st.tabs(["✅ Executed (Last 5)", "⚠️ Missed Trades"])
 
     with snapshot_tabs[0]:
-        if not all_trades.empty:
-            latest_executed = all_trades.tail(5)
-            st.dataframe(latest_executed, use_container_width=True, height=220)
+        latest_executed = _cached_recent_trades(5, trade_logger.get_log_version(), trade_logger)
+        if not latest_executed.empty:
+            st.dataframe(
+                latest_executed, use_container_width=True, height=220,
+                hide_index=True, column_config=_PNL_COLUMN_CONFIG,
+            )
             if 'pnl' in latest_executed.columns:
                 pnl_total = latest_executed['pnl'].sum()
                 st.caption(f"📊 Recent 5 trades P&L: ₹{pnl_total:,.2f}")
@@ -4555,7 +5170,8 @@ elif tab == "Trade Journal":
             # Date filter
             if 'timestamp' in all_trades.columns or 'date' in all_trades.columns:
                 date_col = 'timestamp' if 'timestamp' in all_trades.columns else 'date'
-                all_trades[date_col] = pd.to_datetime(all_trades[date_col], errors='coerce')
+                if not pd.api.types.is_datetime64_any_dtype(all_trades[date_col]):
+                    all_trades[date_col] = pd.to_datetime(all_trades[date_col], errors='coerce')
                 min_date = all_trades[date_col].min().date() if not all_trades[date_col].isna().all() else date.today()
                 max_date = all_trades[date_col].max().date() if not all_trades[date_col].isna().all() else date.today()
                 
@@ -4569,41 +5185,51 @@ elif tab == "Trade Journal":
             else:
                 date_range = None
         
-        # Apply filters
-        filtered_trades = all_trades.copy()
+        # Apply filters as one combined mask, indexed once
+        mask = np.ones(len(all_trades), dtype=bool)
         
-        if selected_type != 'All' and 'type' in filtered_trades.columns:
-            filtered_trades = filtered_trades[filtered_trades['type'] == selected_type]
+        if selected_type != 'All' and 'type' in all_trades.columns:
+            mask &= (all_trades['type'] == selected_type).to_numpy(dtype=bool, na_value=False)
         
-        if selected_result != 'All' and 'pnl' in filtered_trades.columns:
+        if selected_result != 'All' and 'pnl' in all_trades.columns:
             if selected_result == 'Win':
-                filtered_trades = filtered_trades[filtered_trades['pnl'] > 0]
+                mask &= (all_trades['pnl'] > 0).to_numpy(dtype=bool, na_value=False)
             elif selected_result == 'Loss':
-                filtered_trades = filtered_trades[filtered_trades['pnl'] < 0]
+                mask &= (all_trades['pnl'] < 0).to_numpy(dtype=bool, na_value=False)
         
         if date_range and isinstance(date_range, tuple) and len(date_range) == 2:
-            date_col = 'timestamp' if 'timestamp' in filtered_trades.columns else 'date'
-            if date_col in filtered_trades.columns:
-                filtered_trades[date_col] = pd.to_datetime(filtered_trades[date_col], errors='coerce')
-                filtered_trades = filtered_trades[
-                    (filtered_trades[date_col].dt.date >= date_range[0]) &
-                    (filtered_trades[date_col].dt.date <= date_range[1])
-                ]
+            date_col = 'timestamp' if 'timestamp' in all_trades.columns else 'date'
+            if date_col in all_trades.columns:
+                # Already datetime64: parsed at load time or in the date-range filter above.
+                # Compare against Timestamp bounds instead of materialising per-row dates.
+                dates = all_trades[date_col]
+                lo = pd.Timestamp(date_range[0])
+                hi = pd.Timestamp(date_range[1]) + pd.Timedelta(days=1)
+                if dates.dt.tz is not None:
+                    lo, hi = lo.tz_localize(dates.dt.tz), hi.tz_localize(dates.dt.tz)
+                mask &= ((dates >= lo) & (dates < hi)).to_numpy(dtype=bool, na_value=False)
+        
+        # Read-only downstream, so the unfiltered default view reuses the frame as-is
+        filtered_trades = all_trades if mask.all() else all_trades[mask]
         
         st.divider()
         
         # Display last 10 trades
         st.subheader("📊 Recent Trades (Last 10)")
         if len(filtered_trades) > 0:
-            # Get last 10 trades
-            recent_trades = filtered_trades.tail(10).sort_index(ascending=False)
-            st.dataframe(recent_trades, use_container_width=True, height=400)
+            # Last 10 trades, newest first: a reversed positional slice, no index sort
+            recent_trades = filtered_trades.iloc[:-11:-1]
+            st.dataframe(
+                recent_trades, use_container_width=True, height=400,
+                hide_index=True, column_config=_JOURNAL_COLUMN_CONFIG,
+            )
             
             # Show summary
             if 'pnl' in recent_trades.columns:
-                recent_pnl = recent_trades['pnl'].sum()
-                recent_wins = (recent_trades['pnl'] > 0).sum()
-                recent_losses = (recent_trades['pnl'] < 0).sum()
+                recent_pnl_values = recent_trades['pnl'].to_numpy(dtype=np.float64, na_value=np.nan)
+                recent_pnl = float(np.nansum(recent_pnl_values))
+                recent_wins = int(np.count_nonzero(recent_pnl_values > 0))
+                recent_losses = int(np.count_nonzero(recent_pnl_values < 0))
                 st.caption(f"📊 Recent 10 trades: {len(recent_trades)} trades | P&L: ₹{recent_pnl:,.2f} | Wins: {recent_wins} | Losses: {recent_losses}")
         else:
             st.info("📝 No trades match the selected filters.")
@@ -4612,14 +5238,17 @@ elif tab == "Trade Journal":
         if len(filtered_trades) > 10:
             st.divider()
             st.subheader("📋 All Filtered Trades")
-            st.dataframe(filtered_trades, use_container_width=True, height=400)
+            st.dataframe(
+                filtered_trades, use_container_width=True, height=400,
+                hide_index=True, column_config=_JOURNAL_COLUMN_CONFIG,
+            )
         
         # Statistics
         st.divider()
         st.subheader("📊 Trade Statistics")
         
         try:
-            stats = trade_logger.get_trade_stats()
+            stats = _cached_trade_stats(trade_logger.get_log_version(), trade_logger)
             
             col1, col2, col3, col4 = st.columns(4)
             
@@ -4655,7 +5284,13 @@ elif tab == "Trade Journal":
         st.divider()
         st.download_button(
             label="📥 Download Trade Log (CSV)",
-            data=filtered_trades.to_csv(index=False).encode('utf-8'),
+            data=_cached_csv_bytes(
+                (
+                    'journal', trade_logger.get_log_version(), selected_type,
+                    selected_result, date_range, len(filtered_trades),
+                ),
+                filtered_trades,
+            ),
             file_name=f"trades_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
             mime="text/csv",
             help="Download filtered trades as CSV file"
@@ -4675,17 +5310,7 @@ elif tab == "Trade Journal":
         # Show sample entry
         st.divider()
         st.subheader("📋 Sample Entry (Example)")
-        sample_data = {
-            'timestamp': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
-            'symbol': ['NIFTY 25000 CE'],
-            'type': ['CE'],
-            'entry_price': [150.50],
-            'exit_price': [180.75],
-            'quantity': [150],
-            'pnl': [4537.50]
-        }
-        sample_df = pd.DataFrame(sample_data)
-        st.dataframe(sample_df, use_container_width=True)
+        st.dataframe(_EMPTY_STATE_SAMPLE_DF, use_container_width=True)
         st.caption("💡 This is a sample entry. Your actual trades will appear here once you start trading.")
 
 # ============ BACKTEST TAB ============
@@ -4699,6 +5324,7 @@ elif tab == "Backtest":
     st.session_state.setdefault("backtest_trades", None)
     st.session_state.setdefault("backtest_flash", None)
     st.session_state.setdefault("backtest_results_timeframe", None)
+    st.session_state.setdefault("backtest_results_token", None)
     
     def store_backtest_results(results: Dict, source_label: str) -> None:
         st.session_state.backtest_results = results
@@ -4706,6 +5332,8 @@ elif tab == "Backtest":
         st.session_state.backtest_equity_curve = results.get("equity_curve")
         st.session_state.backtest_trades = results.get("trades")
         st.session_state.backtest_results_timeframe = results.get("strategy_timeframe")
+        # Identifies this run's results for cached CSV downloads
+        st.session_state.backtest_results_token = time.time_ns()
     
     def render_backtest_results(results: Optional[Dict]) -> None:
         if not results:
@@ -4797,6 +5425,10 @@ elif tab == "Backtest":
             equity_curve_dates = results.get("equity_curve_dates", [])
             
             if equity_curve:
+                # Typed arrays go straight to Plotly; no intermediate DataFrame per rerun
+                trade_numbers = np.arange(len(equity_curve), dtype=np.int64)
+                capital = np.asarray(equity_curve, dtype=np.float64)
+                
                 # View selector
                 view_mode = st.radio(
                     "View Mode",
@@ -4807,14 +5439,11 @@ elif tab == "Backtest":
                 
                 if view_mode == "By Trade #":
                     # Original view by trade number
-                    equity_df = pd.DataFrame(
-                        {"Trade #": range(len(equity_curve)), "Capital": equity_curve}
-                    )
                     fig = go.Figure(
                         data=[
                             go.Scatter(
-                                x=equity_df["Trade #"],
-                                y=equity_df["Capital"],
+                                x=trade_numbers,
+                                y=capital,
                                 mode="lines",
                                 line=dict(color="#1f77b4", width=2),
                                 fill="tozeroy",
@@ -4910,14 +5539,11 @@ elif tab == "Backtest":
                     
                 else:
                     st.info("Date-based views require equity_curve_dates data. Showing trade number view.")
-                    equity_df = pd.DataFrame(
-                        {"Trade #": range(len(equity_curve)), "Capital": equity_curve}
-                    )
                     fig = go.Figure(
                         data=[
                             go.Scatter(
-                                x=equity_df["Trade #"],
-                                y=equity_df["Capital"],
+                                x=trade_numbers,
+                                y=capital,
                                 mode="lines",
                                 line=dict(color="#1f77b4", width=2),
                                 fill="tozeroy",
@@ -4933,9 +5559,7 @@ elif tab == "Backtest":
                 
                 # Download button
                 if view_mode == "By Trade #":
-                    download_df = pd.DataFrame(
-                        {"Trade #": range(len(equity_curve)), "Capital": equity_curve}
-                    )
+                    download_df = pd.DataFrame({"Trade #": trade_numbers, "Capital": capital})
                 elif view_mode == "By Date" and equity_curve_dates:
                     download_df = pd.DataFrame(equity_curve_dates)
                     download_df['date'] = pd.to_datetime(download_df['date'])
@@ -4945,13 +5569,14 @@ elif tab == "Backtest":
                     download_df['month'] = download_df['date'].dt.to_period('M').astype(str)
                     download_df = download_df.groupby('month').last().reset_index()
                 else:
-                    download_df = pd.DataFrame(
-                        {"Trade #": range(len(equity_curve)), "Capital": equity_curve}
-                    )
+                    download_df = pd.DataFrame({"Trade #": trade_numbers, "Capital": capital})
                 
                 st.download_button(
                     "⬇️ Download Equity Curve CSV",
-                    download_df.to_csv(index=False).encode("utf-8"),
+                    _cached_csv_bytes(
+                        ('backtest_equity', st.session_state.get('backtest_results_token'), view_mode),
+                        download_df,
+                    ),
                     file_name=f"backtest_equity_curve_{view_mode.lower().replace(' ', '_')}.csv",
                     mime="text/csv",
                 )
@@ -5144,7 +5769,10 @@ elif tab == "Backtest":
                 st.dataframe(trades_df, use_container_width=True)
                 st.download_button(
                     "⬇️ Download Trades CSV",
-                    trades_df.to_csv(index=False).encode("utf-8"),
+                    _cached_csv_bytes(
+                        ('backtest_trades', st.session_state.get('backtest_results_token')),
+                        trades_df,
+                    ),
                     file_name="backtest_trades.csv",
                     mime="text/csv",
                 )
@@ -5187,317 +5815,319 @@ elif tab == "Backtest":
                 "Cloud datasource dependencies missing. Install `s3fs>=2024.3.1` and `pyarrow>=15.0.0` to enable."
             )
         
-    import yaml as yaml_lib
-    with open('config/config.yaml', 'r') as f:
-        strategy_config = yaml_lib.safe_load(f)
+    strategy_config = _strategy_config()
     pm_config = strategy_config.get('position_management', {})
     backtesting_settings = strategy_config.get('backtesting', {}) if isinstance(strategy_config, dict) else {}
     angel_smartapi_cfg = backtesting_settings.get('angel_smartapi', {}) if isinstance(backtesting_settings, dict) else {}
     
-    st.subheader("⚙️ Essential Parameters")
-    timeframe_options = ["1h", "4h"]
-    timeframe_default = backtesting_settings.get('strategy_timeframe', '1h')
-    timeframe_index = timeframe_options.index(timeframe_default) if timeframe_default in timeframe_options else 0
-    col1, col2, col3, col4 = st.columns(4, gap="small")
-    with col1:
-        initial_capital = st.number_input(
-            "Initial Capital (₹)",
-            min_value=10000,
-            value=100000,
-            step=10000,
-        )
-    with col2:
-        lot_size_default = strategy_config.get('lot_size', 75)
-        lot_size = st.number_input(
-            "Lot Size",
-            min_value=1,
-            value=lot_size_default,
-            step=lot_size_default,
-            help=f"NIFTY lot size (1 lot = {lot_size_default} units). +/- adjusts by a full lot.",
-        )
-    with col3:
-        sl_pct = st.number_input(
-            "Premium SL %",
-            min_value=10,
-            value=35,
-            max_value=60,
-            step=5,
-            help="Legacy premium stop-loss percentage (used when enhanced features are disabled).",
-        )
-    with col4:
-        strategy_timeframe = st.selectbox(
-            "Strategy timeframe",
-            options=timeframe_options,
-            index=timeframe_index,
-            format_func=lambda x: x.upper(),
-            help="Controls which candle size (1H or 4H) powers inside-bar detection during backtests.",
-            key="backtest_strategy_timeframe_select",
-        )
-    
-    # Estimate capital requirement using option premium (NOT strike price!)
-    # NIFTY options typically trade at ₹100-600 premium depending on volatility and strike selection
-    # Using a realistic estimate: ~₹400-500 for ATM options, or ~0.5-2% of spot price
-    # This matches the backtest engine's synthetic premium calculation
-    estimated_strike_price = 24000  # Typical NIFTY level for estimation
-    estimated_option_premium = max(100.0, 0.015 * estimated_strike_price)  # ~1.5% of spot, min ₹100
-    estimated_capital_required = lot_size * estimated_option_premium
+    # One form so tweaking several parameters costs a single rerun on Apply
+    with st.form("backtest_config", clear_on_submit=False):
+        st.subheader("⚙️ Essential Parameters")
+        timeframe_options = ["1h", "4h"]
+        timeframe_default = backtesting_settings.get('strategy_timeframe', '1h')
+        timeframe_index = timeframe_options.index(timeframe_default) if timeframe_default in timeframe_options else 0
+        col1, col2, col3, col4 = st.columns(4, gap="small")
+        with col1:
+            initial_capital = st.number_input(
+                "Initial Capital (₹)",
+                min_value=10000,
+                value=100000,
+                step=10000,
+            )
+        with col2:
+            lot_size_default = strategy_config.get('lot_size', 75)
+            lot_size = st.number_input(
+                "Lot Size",
+                min_value=1,
+                value=lot_size_default,
+                step=lot_size_default,
+                help=f"NIFTY lot size (1 lot = {lot_size_default} units). +/- adjusts by a full lot.",
+            )
+        with col3:
+            sl_pct = st.number_input(
+                "Premium SL %",
+                min_value=10,
+                value=35,
+                max_value=60,
+                step=5,
+                help="Legacy premium stop-loss percentage (used when enhanced features are disabled).",
+            )
+        with col4:
+            strategy_timeframe = st.selectbox(
+                "Strategy timeframe",
+                options=timeframe_options,
+                index=timeframe_index,
+                format_func=lambda x: x.upper(),
+                help="Controls which candle size (1H or 4H) powers inside-bar detection during backtests.",
+                key="backtest_strategy_timeframe_select",
+            )
     
-    if initial_capital < estimated_capital_required:
-        st.warning(
-            f"⚠️ Available capital (₹{initial_capital:,.0f}) is below an estimated requirement "
-            f"of ₹{estimated_capital_required:,.0f} (based on ₹{estimated_option_premium:.0f} premium × {lot_size} qty)."
-        )
-        st.caption(
-            "💡 Note: This is an estimate. Actual capital required depends on option premium at entry, "
-            "which varies with market conditions and strike selection (ATM/ITM/OTM)."
-        )
+        # Estimate capital requirement using option premium (NOT strike price!)
+        # NIFTY options typically trade at ₹100-600 premium depending on volatility and strike selection
+        # Using a realistic estimate: ~₹400-500 for ATM options, or ~0.5-2% of spot price
+        # This matches the backtest engine's synthetic premium calculation
+        estimated_strike_price = 24000  # Typical NIFTY level for estimation
+        estimated_option_premium = max(100.0, 0.015 * estimated_strike_price)  # ~1.5% of spot, min ₹100
+        estimated_capital_required = lot_size * estimated_option_premium
     
-    st.divider()
+        if initial_capital < estimated_capital_required:
+            st.warning(
+                f"⚠️ Available capital (₹{initial_capital:,.0f}) is below an estimated requirement "
+                f"of ₹{estimated_capital_required:,.0f} (based on ₹{estimated_option_premium:.0f} premium × {lot_size} qty)."
+            )
+            st.caption(
+                "💡 Note: This is an estimate. Actual capital required depends on option premium at entry, "
+                "which varies with market conditions and strike selection (ATM/ITM/OTM)."
+            )
     
-    st.markdown("### 🧱 Strategy & Risk Controls")
-    strike_selection = st.selectbox(
-        "Strike selection preset",
-        options=["ATM 0", "ITM 1", "ITM 2", "ITM 3", "OTM 1", "OTM 2", "OTM 3"],
-        index=0,
-    )
+        st.divider()
     
-    col_pm = st.columns(4, gap="small")
-    with col_pm[0]:
-        sl_points_main = st.number_input(
-            "SL Points",
-            min_value=10,
-            max_value=100,
-            value=int(pm_config.get('sl_points', 30)),
-            step=5,
+        st.markdown("### 🧱 Strategy & Risk Controls")
+        strike_selection = st.selectbox(
+            "Strike selection preset",
+            options=["ATM 0", "ITM 1", "ITM 2", "ITM 3", "OTM 1", "OTM 2", "OTM 3"],
+            index=0,
         )
-    with col_pm[1]:
-        trail_points_main = st.number_input(
-            "Trail Points",
-            min_value=5,
-            max_value=50,
-            value=int(pm_config.get('trail_points', 10)),
-            step=5,
-        )
-    with col_pm[2]:
-        book1_points_main = st.number_input(
-            "Book 1 Points",
-            min_value=10,
-            max_value=100,
-            value=int(pm_config.get('book1_points', 40)),
-            step=5,
-        )
-    with col_pm[3]:
-        book2_points_main = st.number_input(
-            "Book 2 Points",
-            min_value=20,
-            max_value=150,
-            value=int(pm_config.get('book2_points', 54)),
-            step=5,
-        )
-    
-    st.divider()
-    
-    st.markdown("### 🧩 Advanced Parameters")
-    with st.expander("📊 Strategy Filters & Controls", expanded=False):
-        use_atr_filter = False
-        use_regime_filter = False
-        use_distance_guard = False
-        use_tiered_exits = False
-        use_expiry_protocol = False
-        use_directional_sizing = False
-        atr_floor_pct = 0.5
-        ema_slope_len = 20
-        distance_guard_atr = 0.6
-        vol_band_low = 0.40
-        vol_band_high = 0.75
-        sl_pct_low = 22
-        sl_pct_norm = 28
-        sl_pct_high = 35
-        be_at_r = 0.6
-        t1_r = 1.2
-        t1_book_pct = 0.50
-        t2_r = 2.0
-        t2_book_pct = 0.25
-        trail_lookback = 6
-        trail_mult = 2.0
-        no_new_after = "14:30"
-        force_partial_by = "13:00"
-        tighten_days = 1.5
-        risk_per_trade_pct = 0.6
-        pe_size_cap_vs_ce = 0.7
-        max_concurrent = 2
-        sl_points_config = sl_points_main
-        trail_points_config = trail_points_main
-        book1_points_config = book1_points_main
-        book2_points_config = book2_points_main
-        book1_ratio_config = float(pm_config.get('book1_ratio', 0.5))
     
-        flag_cols = st.columns(2)
-        with flag_cols[0]:
-            use_atr_filter = st.checkbox("ATR Filter", value=use_atr_filter)
-            use_regime_filter = st.checkbox("Regime Filter", value=use_regime_filter)
-            use_distance_guard = st.checkbox("Distance Guard", value=use_distance_guard)
-        with flag_cols[1]:
-            use_tiered_exits = st.checkbox("Tiered Exits", value=use_tiered_exits)
-            use_expiry_protocol = st.checkbox("Expiry Protocol", value=use_expiry_protocol)
-            use_directional_sizing = st.checkbox("Directional Sizing", value=use_directional_sizing)
-    
-        st.markdown("##### Filters")
-        filters_row = st.columns(3)
-        with filters_row[0]:
-            atr_floor_pct = st.number_input(
-                "ATR Floor % (1h)",
-                min_value=0.0,
-                value=atr_floor_pct,
-                step=0.1,
-                format="%.1f",
+        col_pm = st.columns(4, gap="small")
+        with col_pm[0]:
+            sl_points_main = st.number_input(
+                "SL Points",
+                min_value=10,
+                max_value=100,
+                value=int(pm_config.get('sl_points', 30)),
+                step=5,
             )
-        with filters_row[1]:
-            ema_slope_len = st.number_input(
-                "EMA Slope Lookback",
+        with col_pm[1]:
+            trail_points_main = st.number_input(
+                "Trail Points",
                 min_value=5,
-                value=ema_slope_len,
+                max_value=50,
+                value=int(pm_config.get('trail_points', 10)),
                 step=5,
             )
-        with filters_row[2]:
-            distance_guard_atr = st.number_input(
-                "Distance Guard (ATR)",
-                min_value=0.1,
-                value=distance_guard_atr,
-                step=0.1,
-                format="%.1f",
-            )
-        
-        st.markdown("##### Volatility-based SL")
-        vol_cols = st.columns(4)
-        with vol_cols[0]:
-            vol_band_low = st.number_input(
-                "Vol Band Low %",
-                min_value=0.0,
-                value=vol_band_low,
-                step=0.05,
-                format="%.2f",
-            )
-        with vol_cols[1]:
-            vol_band_high = st.number_input(
-                "Vol Band High %",
-                min_value=0.0,
-                value=vol_band_high,
-                step=0.05,
-                format="%.2f",
-            )
-        with vol_cols[2]:
-            sl_pct_low = st.number_input(
-                "SL % (Low Vol)",
+        with col_pm[2]:
+            book1_points_main = st.number_input(
+                "Book 1 Points",
                 min_value=10,
-                value=sl_pct_low,
-                step=1,
+                max_value=100,
+                value=int(pm_config.get('book1_points', 40)),
+                step=5,
             )
-        with vol_cols[3]:
-            sl_pct_high = st.number_input(
-                "SL % (High Vol)",
+        with col_pm[3]:
+            book2_points_main = st.number_input(
+                "Book 2 Points",
                 min_value=20,
-                value=sl_pct_high,
-                step=1,
+                max_value=150,
+                value=int(pm_config.get('book2_points', 54)),
+                step=5,
             )
-        sl_pct_norm = st.number_input(
-            "SL % (Normal Vol)",
-            min_value=15,
-            value=sl_pct_norm,
-            step=1,
-        )
+    
+        st.divider()
+    
+        st.markdown("### 🧩 Advanced Parameters")
+        with st.expander("📊 Strategy Filters & Controls", expanded=False):
+            use_atr_filter = False
+            use_regime_filter = False
+            use_distance_guard = False
+            use_tiered_exits = False
+            use_expiry_protocol = False
+            use_directional_sizing = False
+            atr_floor_pct = 0.5
+            ema_slope_len = 20
+            distance_guard_atr = 0.6
+            vol_band_low = 0.40
+            vol_band_high = 0.75
+            sl_pct_low = 22
+            sl_pct_norm = 28
+            sl_pct_high = 35
+            be_at_r = 0.6
+            t1_r = 1.2
+            t1_book_pct = 0.50
+            t2_r = 2.0
+            t2_book_pct = 0.25
+            trail_lookback = 6
+            trail_mult = 2.0
+            no_new_after = dt_time(14, 30)
+            force_partial_by = dt_time(13, 0)
+            tighten_days = 1.5
+            risk_per_trade_pct = 0.6
+            pe_size_cap_vs_ce = 0.7
+            max_concurrent = 2
+            sl_points_config = sl_points_main
+            trail_points_config = trail_points_main
+            book1_points_config = book1_points_main
+            book2_points_config = book2_points_main
+            book1_ratio_config = float(pm_config.get('book1_ratio', 0.5))
+    
+            flag_cols = st.columns(2)
+            with flag_cols[0]:
+                use_atr_filter = st.checkbox("ATR Filter", value=use_atr_filter)
+                use_regime_filter = st.checkbox("Regime Filter", value=use_regime_filter)
+                use_distance_guard = st.checkbox("Distance Guard", value=use_distance_guard)
+            with flag_cols[1]:
+                use_tiered_exits = st.checkbox("Tiered Exits", value=use_tiered_exits)
+                use_expiry_protocol = st.checkbox("Expiry Protocol", value=use_expiry_protocol)
+                use_directional_sizing = st.checkbox("Directional Sizing", value=use_directional_sizing)
+    
+            st.markdown("##### Filters")
+            filters_row = st.columns(3)
+            with filters_row[0]:
+                atr_floor_pct = st.number_input(
+                    "ATR Floor % (1h)",
+                    min_value=0.0,
+                    value=atr_floor_pct,
+                    step=0.1,
+                    format="%.1f",
+                )
+            with filters_row[1]:
+                ema_slope_len = st.number_input(
+                    "EMA Slope Lookback",
+                    min_value=5,
+                    value=ema_slope_len,
+                    step=5,
+                )
+            with filters_row[2]:
+                distance_guard_atr = st.number_input(
+                    "Distance Guard (ATR)",
+                    min_value=0.1,
+                    value=distance_guard_atr,
+                    step=0.1,
+                    format="%.1f",
+                )
         
-        st.markdown("##### Tiered Exits")
-        tier_cols = st.columns(4)
-        with tier_cols[0]:
-            be_at_r = st.number_input(
-                "Breakeven @ R",
-                min_value=0.0,
-                value=be_at_r,
-                step=0.1,
-                format="%.1f",
-            )
-        with tier_cols[1]:
-            t1_r = st.number_input(
-                "T1 Target (R)",
-                min_value=0.0,
-                value=t1_r,
-                step=0.1,
-                format="%.1f",
-            )
-            t1_book_pct = st.number_input(
-                "T1 Book %",
-                min_value=0.0,
-                max_value=1.0,
-                value=t1_book_pct,
-                step=0.05,
-                format="%.2f",
-            )
-        with tier_cols[2]:
-            t2_r = st.number_input(
-                "T2 Target (R)",
-                min_value=0.0,
-                value=t2_r,
-                step=0.1,
-                format="%.1f",
-            )
-            t2_book_pct = st.number_input(
-                "T2 Book %",
-                min_value=0.0,
-                max_value=1.0,
-                value=t2_book_pct,
-                step=0.05,
-                format="%.2f",
-            )
-        with tier_cols[3]:
-            trail_lookback = st.number_input(
-                "Trail Lookback",
-                min_value=1,
-                value=trail_lookback,
+            st.markdown("##### Volatility-based SL")
+            vol_cols = st.columns(4)
+            with vol_cols[0]:
+                vol_band_low = st.number_input(
+                    "Vol Band Low %",
+                    min_value=0.0,
+                    value=vol_band_low,
+                    step=0.05,
+                    format="%.2f",
+                )
+            with vol_cols[1]:
+                vol_band_high = st.number_input(
+                    "Vol Band High %",
+                    min_value=0.0,
+                    value=vol_band_high,
+                    step=0.05,
+                    format="%.2f",
+                )
+            with vol_cols[2]:
+                sl_pct_low = st.number_input(
+                    "SL % (Low Vol)",
+                    min_value=10,
+                    value=sl_pct_low,
+                    step=1,
+                )
+            with vol_cols[3]:
+                sl_pct_high = st.number_input(
+                    "SL % (High Vol)",
+                    min_value=20,
+                    value=sl_pct_high,
+                    step=1,
+                )
+            sl_pct_norm = st.number_input(
+                "SL % (Normal Vol)",
+                min_value=15,
+                value=sl_pct_norm,
                 step=1,
             )
-            trail_mult = st.number_input(
-                "Trail Multiplier",
-                min_value=0.5,
-                value=trail_mult,
-                step=0.1,
-            )
         
-        st.markdown("##### Risk Protocols")
-        risk_cols = st.columns(3)
-        with risk_cols[0]:
-            no_new_after = st.time_input("No new entries after", value=pd.to_datetime(no_new_after).time())
-            tighten_days = st.number_input(
-                "Tighten after (days)",
-                min_value=0.0,
-                value=tighten_days,
-                step=0.5,
-            )
-        with risk_cols[1]:
-            force_partial_by = st.time_input("Force partial booking by", value=pd.to_datetime(force_partial_by).time())
-            risk_per_trade_pct = st.number_input(
-                "Risk per trade %",
-                min_value=0.1,
-                value=risk_per_trade_pct,
-                step=0.1,
-                format="%.1f",
-            )
-        with risk_cols[2]:
-            pe_size_cap_vs_ce = st.number_input(
-                "PE position size cap vs CE",
-                min_value=0.1,
-                max_value=1.0,
-                value=pe_size_cap_vs_ce,
-                step=0.05,
-                format="%.2f",
-            )
-            max_concurrent = st.number_input(
-                "Max concurrent positions",
-                min_value=1,
-                max_value=5,
-                value=max_concurrent,
-                step=1,
-            )
+            st.markdown("##### Tiered Exits")
+            tier_cols = st.columns(4)
+            with tier_cols[0]:
+                be_at_r = st.number_input(
+                    "Breakeven @ R",
+                    min_value=0.0,
+                    value=be_at_r,
+                    step=0.1,
+                    format="%.1f",
+                )
+            with tier_cols[1]:
+                t1_r = st.number_input(
+                    "T1 Target (R)",
+                    min_value=0.0,
+                    value=t1_r,
+                    step=0.1,
+                    format="%.1f",
+                )
+                t1_book_pct = st.number_input(
+                    "T1 Book %",
+                    min_value=0.0,
+                    max_value=1.0,
+                    value=t1_book_pct,
+                    step=0.05,
+                    format="%.2f",
+                )
+            with tier_cols[2]:
+                t2_r = st.number_input(
+                    "T2 Target (R)",
+                    min_value=0.0,
+                    value=t2_r,
+                    step=0.1,
+                    format="%.1f",
+                )
+                t2_book_pct = st.number_input(
+                    "T2 Book %",
+                    min_value=0.0,
+                    max_value=1.0,
+                    value=t2_book_pct,
+                    step=0.05,
+                    format="%.2f",
+                )
+            with tier_cols[3]:
+                trail_lookback = st.number_input(
+                    "Trail Lookback",
+                    min_value=1,
+                    value=trail_lookback,
+                    step=1,
+                )
+                trail_mult = st.number_input(
+                    "Trail Multiplier",
+                    min_value=0.5,
+                    value=trail_mult,
+                    step=0.1,
+                )
+        
+            st.markdown("##### Risk Protocols")
+            risk_cols = st.columns(3)
+            with risk_cols[0]:
+                no_new_after = st.time_input("No new entries after", value=no_new_after)
+                tighten_days = st.number_input(
+                    "Tighten after (days)",
+                    min_value=0.0,
+                    value=tighten_days,
+                    step=0.5,
+                )
+            with risk_cols[1]:
+                force_partial_by = st.time_input("Force partial booking by", value=force_partial_by)
+                risk_per_trade_pct = st.number_input(
+                    "Risk per trade %",
+                    min_value=0.1,
+                    value=risk_per_trade_pct,
+                    step=0.1,
+                    format="%.1f",
+                )
+            with risk_cols[2]:
+                pe_size_cap_vs_ce = st.number_input(
+                    "PE position size cap vs CE",
+                    min_value=0.1,
+                    max_value=1.0,
+                    value=pe_size_cap_vs_ce,
+                    step=0.05,
+                    format="%.2f",
+                )
+                max_concurrent = st.number_input(
+                    "Max concurrent positions",
+                    min_value=1,
+                    max_value=5,
+                    value=max_concurrent,
+                    step=1,
+                )
+        
+        st.form_submit_button("✅ Apply configuration", use_container_width=True)
     
     # strike interpretation
     strike_offset_map = {
@@ -5571,7 +6201,6 @@ elif tab == "Backtest":
         "strike_is_otm": is_otm,
     }
     
-    engine = BacktestEngine(backtest_config_dict)
     st.session_state.backtest_config_dict = backtest_config_dict
     
     # --- DATA & RUN TAB ----------------------------------------------------
@@ -5586,18 +6215,9 @@ elif tab == "Backtest":
             with sample_cols[0]:
                 st.caption("Use a sample file to align your historical OHLC data quickly.")
             with sample_cols[1]:
-                sample_csv_data = {
-                    'Date': pd.date_range('2024-01-01', periods=10, freq='1H').strftime('%Y-%m-%d %H:%M:%S'),
-                    'Open': [24000.0, 24050.0, 24030.0, 24060.0, 24080.0, 24100.0, 24090.0, 24120.0, 24140.0, 24160.0],
-                    'High': [24080.0, 24090.0, 24070.0, 24090.0, 24110.0, 24130.0, 24120.0, 24150.0, 24170.0, 24190.0],
-                    'Low': [23980.0, 24020.0, 24000.0, 24030.0, 24050.0, 24070.0, 24060.0, 24090.0, 24110.0, 24130.0],
-                    'Close': [24050.0, 24040.0, 24050.0, 24070.0, 24090.0, 24110.0, 24100.0, 24130.0, 24150.0, 24170.0],
-                    'Volume': [1000000, 1100000, 950000, 1200000, 1050000, 1300000, 1150000, 1250000, 1400000, 1350000]
-                }
-                sample_df = pd.DataFrame(sample_csv_data)
                 st.download_button(
                     label="📥 Sample CSV",
-                    data=sample_df.to_csv(index=False).encode('utf-8'),
+                    data=_SAMPLE_CSV_BYTES,
                     file_name="sample_historical_data.csv",
                     mime="text/csv",
                 )
@@ -5648,7 +6268,7 @@ elif tab == "Backtest":
             ):
                 with st.spinner("Running backtest..."):
                     try:
-                        results = engine.run_backtest(
+                        results = BacktestEngine(backtest_config_dict).run_backtest(
                             data_1h=data_1h,
                             options_df=None,
                             expiries_df=None,
@@ -5704,7 +6324,7 @@ elif tab == "Backtest":
                                 else:
                                     with st.expander("Preview cloud data", expanded=False):
                                         st.dataframe(spot_df.head(10), use_container_width=True)
-                                    results = engine.run_backtest(
+                                    results = BacktestEngine(backtest_config_dict).run_backtest(
                                         data_1h=spot_df,
                                         data_15m=None,
                                         options_df=options_df if options_df is not None and not options_df.empty else None,
@@ -5780,7 +6400,7 @@ elif tab == "Backtest":
                                         with st.expander("Preview SmartAPI data", expanded=False):
                                             st.dataframe(spot_df.head(10), use_container_width=True)
 
-                                        results = engine.run_backtest(
+                                        results = BacktestEngine(backtest_config_dict).run_backtest(
                                             data_1h=spot_df,
                                             options_df=None,
                                             expiries_df=None,
@@ -5902,9 +6522,7 @@ elif tab == "Settings":
     st.header("⚙️ Settings & Configuration")
     
     # Load current config
-    import yaml as yaml_lib
-    with open('config/config.yaml', 'r') as f:
-        current_config = yaml_lib.safe_load(f)
+    current_config = _strategy_config()
     
     # Strategy Options Section
     with st.expander("📊 Strategy Options", expanded=False):
@@ -5928,10 +6546,10 @@ elif tab == "Settings":
         
         with col2:
             st.markdown("**Filters:**")
-            filters = strategy.get('filters', {})
-            st.text(f"Volume Spike: {'✅ Enabled' if filters.get('volume_spike') else '❌ Disabled'}")
+            filter_flags = _filter_flags()
+            st.text(f"Volume Spike: {'✅ Enabled' if filter_flags.get('volume_spike') else '❌ Disabled'}")
             st.caption("💡 Require volume spike confirmation for breakout")
-            st.text(f"Avoid Open Range: {'✅ Enabled' if filters.get('avoid_open_range') else '❌ Disabled'}")
+            st.text(f"Avoid Open Range: {'✅ Enabled' if filter_flags.get('avoid_open_range') else '❌ Disabled'}")
             st.caption("💡 Avoid trading during open range period")
         
         st.warning("⚠️ To modify configuration, edit `config/config.yaml` file directly and restart the application.")
@@ -6005,22 +6623,14 @@ elif tab == "Settings":
                         # If using Streamlit secrets and broker not in config dict, access directly
                         if not broker_config_for_interface and config.get('_from_streamlit_secrets') and hasattr(st, 'secrets'):
                             try:
-                                broker_secrets = getattr(st.secrets, 'broker', None)
-                                if broker_secrets:
-                                    broker_config_for_interface = {
-                                        'type': getattr(broker_secrets, 'type', 'angel'),
-                                        'api_key': getattr(broker_secrets, 'api_key', ''),
-                                        'client_id': getattr(broker_secrets, 'client_id', ''),
-                                        'username': getattr(broker_secrets, 'username', ''),
-                                        'pwd': getattr(broker_secrets, 'pwd', ''),
-                                        'token': getattr(broker_secrets, 'token', ''),
-                                    }
+                                broker_config_for_interface = getattr(st.secrets, 'broker', None)
                             except Exception as e:
                                 logger.warning(f"Could not access broker from Streamlit secrets: {e}")
                         
                         if broker_config_for_interface:
-                            temp_config = {'broker': broker_config_for_interface}
-                            st.session_state.broker_interface = create_broker_interface(temp_config)
+                            st.session_state.broker_interface = get_broker_interface(
+                                BrokerCfg.from_source(broker_config_for_interface)
+                            )
                         else:
                             st.session_state.broker_interface = None
                     except Exception as e:
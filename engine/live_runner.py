@@ -5,6 +5,7 @@ Live Strategy Runner for real-time market monitoring and trade execution
 import copy
 import threading
 import time
+from functools import lru_cache
 from typing import Dict, Optional, List, Any, Tuple
 from datetime import datetime, timedelta, time as dt_time, timezone as dt_timezone
 from pytz import timezone
@@ -24,6 +25,54 @@ from engine.event_bus import get_event_bus
 from engine.state_store import get_state_store
 
 
+
+def _minute_key() -> int:
+    """Epoch minute used to memoise clock-based checks for the rest of the minute."""
+    return int(time.time() // 60)
+
+
+@lru_cache(maxsize=1)
+def _market_open_at_minute(minute_key: int) -> bool:
+    """Market-hours check (9:15 AM - 3:30 PM IST, Mon-Fri) evaluated once per minute."""
+    ist = timezone('Asia/Kolkata')
+    now = datetime.now(ist)
+    
+    # Check weekday (Monday=0, Friday=4, Saturday=5, Sunday=6)
+    if now.weekday() >= 5:  # Saturday or Sunday
+        return False
+    
+    # Check time (9:15 AM - 3:30 PM IST)
+    market_open = now.replace(hour=9, minute=15, second=0, microsecond=0)
+    market_close = now.replace(hour=15, minute=30, second=0, microsecond=0)
+    
+    is_open = market_open <= now <= market_close
+    if not is_open:
+        logger.debug(f"Market closed: Current time {now.strftime('%H:%M:%S IST')} outside trading hours (9:15-15:30)")
+    
+    return is_open
+
+
+@lru_cache(maxsize=32)
+def _expiry_safe_at_minute(expiry: datetime, minute_key: int) -> bool:
+    """Expiry-distance check for ``expiry``, evaluated once per minute."""
+    now = datetime.now()
+    days_to_exp = (expiry - now).days
+    
+    # Don't trade if expires within 1 day
+    if days_to_exp < 1:
+        logger.warning(f"Expiry too close: {days_to_exp} days remaining - skipping trade")
+        return False
+    
+    # On expiry day, only trade before 2 PM
+    if days_to_exp == 0:
+        now_time = now.time()
+        cutoff_time = dt_time(14, 0)  # 2:00 PM
+        if now_time > cutoff_time:
+            logger.warning(f"Expiry day after 2 PM - skipping trade")
+            return False
+    
+    return True
+
 class LiveStrategyRunner:
     """
     Manages live strategy execution with polling and trade execution.
@@ -101,6 +150,7 @@ class LiveStrategyRunner:
         # Statistics
         self.last_fetch_time = None
         self.last_signal_time = None
+        self._time_display_cache: Dict[str, Tuple[Optional[datetime], str]] = {}
         self.cycle_count = 0
         self.error_count = 0
         self.active_monitors = []
@@ -503,23 +553,8 @@ class LiveStrategyRunner:
             True if market is open, False otherwise
         """
         try:
-            ist = timezone('Asia/Kolkata')
-            now = datetime.now(ist)
-            
-            # Check weekday (Monday=0, Friday=4, Saturday=5, Sunday=6)
-            if now.weekday() >= 5:  # Saturday or Sunday
-                return False
-            
-            # Check time (9:15 AM - 3:30 PM IST)
-            market_open = now.replace(hour=9, minute=15, second=0, microsecond=0)
-            market_close = now.replace(hour=15, minute=30, second=0, microsecond=0)
-            
-            is_open = market_open <= now <= market_close
-            if not is_open:
-                logger.debug(f"Market closed: Current time {now.strftime('%H:%M:%S IST')} outside trading hours (9:15-15:30)")
-            
-            return is_open
-            
+            # Memoised per minute: the UI and polling loop ask many times a minute
+            return _market_open_at_minute(_minute_key())
         except Exception as e:
             logger.exception(f"Error checking market hours: {e}")
             return False  # Fail safe: assume market closed if check fails
@@ -651,23 +686,7 @@ class LiveStrategyRunner:
             logger.warning("Expiry date not available - skipping trade")
             return False
         
-        now = datetime.now()
-        days_to_exp = (expiry - now).days
-        
-        # Don't trade if expires within 1 day
-        if days_to_exp < 1:
-            logger.warning(f"Expiry too close: {days_to_exp} days remaining - skipping trade")
-            return False
-        
-        # On expiry day, only trade before 2 PM
-        if days_to_exp == 0:
-            now_time = now.time()
-            cutoff_time = dt_time(14, 0)  # 2:00 PM
-            if now_time > cutoff_time:
-                logger.warning(f"Expiry day after 2 PM - skipping trade")
-                return False
-        
-        return True
+        return _expiry_safe_at_minute(expiry, _minute_key())
     
     def _check_position_limit(self) -> bool:
         """
@@ -2121,12 +2140,22 @@ class LiveStrategyRunner:
             metadata={'source': 'live_runner', 'count': len(self.active_monitors)}
         )
     
+    def _time_display(self, name: str, value: Optional[datetime], empty: str) -> str:
+        """Clock-style label for a status timestamp, re-formatted only when it changes."""
+        cached = self._time_display_cache.get(name)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        label = value.strftime("%I:%M:%S %p") if value else empty
+        self._time_display_cache[name] = (value, label)
+        return label
+    
     def get_status(self) -> Dict:
         """
         Get current status of the live runner.
         
         Returns:
-            Dictionary with status information
+            Dictionary with status information, including ready-to-show
+            ``*_display`` labels for the fetch/signal timestamps
         """
         return {
             'running': self._running,
@@ -2134,6 +2163,37 @@ class LiveStrategyRunner:
             'error_count': self.error_count,
             'last_fetch_time': self.last_fetch_time.isoformat() if self.last_fetch_time else None,
             'last_signal_time': self.last_signal_time.isoformat() if self.last_signal_time else None,
+            'last_fetch_time_display': self._time_display('last_fetch_time', self.last_fetch_time, "Never"),
+            'last_signal_time_display': self._time_display('last_signal_time', self.last_signal_time, "None"),
             'polling_interval': self.polling_interval
         }
+    
+    def get_risk_snapshot(self) -> Dict[str, Any]:
+        """
+        Get the risk-management figures shown on the dashboard in one call.
+        
+        Returns:
+            Dictionary with P&L, limits, position usage, market state and the
+            nearest expiry (None if it could not be resolved) with its safety flag
+        """
+        nearest_expiry = None
+        expiry_safe = False
+        try:
+            nearest_expiry = self._get_nearest_expiry()
+            if nearest_expiry:
+                expiry_safe = self._is_safe_to_trade_expiry(nearest_expiry)
+        except Exception as e:
+            logger.debug(f"Nearest expiry unavailable for risk snapshot: {e}")
+        
+        return {
+            'daily_pnl': self.daily_pnl,
+            'daily_loss_limit_pct': self.daily_loss_limit_pct,
+            'max_positions': self.max_concurrent_positions,
+            'signal_cooldown': self.signal_cooldown_seconds,
+            'active_positions': len(self.active_monitors),
+            'initial_capital': self.config.get('initial_capital', 100000.0),
+            'is_market_open': self._is_market_open(),
+            'nearest_expiry': nearest_expiry,
+            'expiry_safe': expiry_safe,
+        }
 
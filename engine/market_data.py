@@ -76,6 +76,7 @@ class MarketDataProvider:
         self._raw_data_buffer = []  # Store raw OHLC snapshots
         self._data_1h = pd.DataFrame()
         self._data_15m = pd.DataFrame()
+        self._last_ltp: Optional[float] = None
         self._historical_cache: Dict[str, pd.DataFrame] = {}
         self._last_fetch_meta: Dict[str, Dict] = {}
         
@@ -606,6 +607,8 @@ class MarketDataProvider:
             
             # Return first (and likely only) result
             market_data = fetched[0]
+            if symbol_token == self.nifty_token:
+                self._remember_ltp(market_data)
             
             logger.info(f"Fetched OHLC for {market_data.get('tradingSymbol', 'UNKNOWN')}: "
                        f"O={market_data.get('open')}, H={market_data.get('high')}, "
@@ -1221,7 +1224,8 @@ class MarketDataProvider:
                     self._data_1h = self._data_1h.sort_values('Date').reset_index(drop=True)
         
         # Get all candles and filter to complete ones only (unless include_latest=True for live mode)
-        all_candles = self._data_1h.tail(window_hours).copy() if not self._data_1h.empty else pd.DataFrame(
+        data_1h = self._data_1h  # single read; refresh_data() rebinds rather than mutates
+        all_candles = data_1h.tail(window_hours).copy() if not data_1h.empty else pd.DataFrame(
             columns=['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
         )
         
@@ -1398,7 +1402,8 @@ class MarketDataProvider:
         
         # Get all candles and filter to complete ones only (unless include_latest=True for live mode)
         max_candles = (window_hours * 60) // 15
-        all_candles = self._data_15m.tail(max_candles).copy() if not self._data_15m.empty else pd.DataFrame(
+        data_15m = self._data_15m  # single read; refresh_data() rebinds rather than mutates
+        all_candles = data_15m.tail(max_candles).copy() if not data_15m.empty else pd.DataFrame(
             columns=['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
         )
         
@@ -1479,9 +1484,12 @@ class MarketDataProvider:
                 # This will be filtered out when get_15m_data() or get_1h_data() is called
                 logger.debug("Aggregated from historical data - incomplete candles will be filtered in get methods")
             else:
-                # Fallback: Update with current snapshot
+                # Fallback: Update with current snapshot.
+                # Build each buffer on a private copy and rebind it in one assignment so
+                # readers on other threads never observe a half-updated frame.
                 # Only create new candle if period has changed (new candle started)
-                if self._data_15m.empty or self._data_15m.iloc[-1]['Date'] < rounded_15m:
+                data_15m = self._data_15m.copy()
+                if data_15m.empty or data_15m.iloc[-1]['Date'] < rounded_15m:
                     new_row_15m = pd.DataFrame([{
                         'Date': rounded_15m,
                         'Open': ohlc.get('open', 0),
@@ -1490,27 +1498,27 @@ class MarketDataProvider:
                         'Close': ohlc.get('ltp', ohlc.get('close', 0)),
                         'Volume': ohlc.get('tradeVolume', 0)
                     }])
-                    self._data_15m = pd.concat([self._data_15m, new_row_15m], ignore_index=True)
-                    self._data_15m = self._data_15m.drop_duplicates(subset=['Date'], keep='last')
-                    self._update_market_data_state()
+                    data_15m = pd.concat([data_15m, new_row_15m], ignore_index=True)
+                    data_15m = data_15m.drop_duplicates(subset=['Date'], keep='last')
                 else:
                     # Update existing incomplete candle
-                    last_idx = len(self._data_15m) - 1
-                    self._data_15m.loc[last_idx, 'High'] = max(self._data_15m.loc[last_idx, 'High'], ohlc.get('high', 0))
-                    self._data_15m.loc[last_idx, 'Low'] = min(self._data_15m.loc[last_idx, 'Low'], ohlc.get('low', 0))
-                    self._data_15m.loc[last_idx, 'Close'] = ohlc.get('ltp', ohlc.get('close', 0))
-                    self._data_15m.loc[last_idx, 'Volume'] = ohlc.get('tradeVolume', 0)
-                    self._update_market_data_state()
+                    last_idx = len(data_15m) - 1
+                    data_15m.loc[last_idx, 'High'] = max(data_15m.loc[last_idx, 'High'], ohlc.get('high', 0))
+                    data_15m.loc[last_idx, 'Low'] = min(data_15m.loc[last_idx, 'Low'], ohlc.get('low', 0))
+                    data_15m.loc[last_idx, 'Close'] = ohlc.get('ltp', ohlc.get('close', 0))
+                    data_15m.loc[last_idx, 'Volume'] = ohlc.get('tradeVolume', 0)
+                self._data_15m = data_15m
                 
+                data_1h = self._data_1h.copy()
                 last_1h_date = None
-                if not self._data_1h.empty:
-                    date_series = pd.to_datetime(self._data_1h['Date'])
+                if not data_1h.empty:
+                    date_series = pd.to_datetime(data_1h['Date'])
                     # Normalize existing 1H dates to IST timezone-aware timestamps
                     if getattr(date_series.dt, "tz", None) is None:
                         date_series = date_series.dt.tz_localize(ist)
                     else:
                         date_series = date_series.dt.tz_convert(ist)
-                    self._data_1h['Date'] = date_series
+                    data_1h['Date'] = date_series
                     last_1h_date = date_series.iloc[-1]
                 
                 if last_1h_date is None or last_1h_date < rounded_1h:
@@ -1522,20 +1530,58 @@ class MarketDataProvider:
                         'Close': ohlc.get('ltp', ohlc.get('close', 0)),
                         'Volume': ohlc.get('tradeVolume', 0)
                     }])
-                    self._data_1h = pd.concat([self._data_1h, new_row_1h], ignore_index=True)
-                    self._data_1h = self._data_1h.drop_duplicates(subset=['Date'], keep='last')
-                    self._update_market_data_state()
+                    data_1h = pd.concat([data_1h, new_row_1h], ignore_index=True)
+                    data_1h = data_1h.drop_duplicates(subset=['Date'], keep='last')
                 else:
                     # Update existing incomplete candle
-                    last_idx = len(self._data_1h) - 1
-                    self._data_1h.loc[last_idx, 'High'] = max(self._data_1h.loc[last_idx, 'High'], ohlc.get('high', 0))
-                    self._data_1h.loc[last_idx, 'Low'] = min(self._data_1h.loc[last_idx, 'Low'], ohlc.get('low', 0))
-                    self._data_1h.loc[last_idx, 'Close'] = ohlc.get('ltp', ohlc.get('close', 0))
-                    self._data_1h.loc[last_idx, 'Volume'] = ohlc.get('tradeVolume', 0)
-                    self._update_market_data_state()
+                    last_idx = len(data_1h) - 1
+                    data_1h.loc[last_idx, 'High'] = max(data_1h.loc[last_idx, 'High'], ohlc.get('high', 0))
+                    data_1h.loc[last_idx, 'Low'] = min(data_1h.loc[last_idx, 'Low'], ohlc.get('low', 0))
+                    data_1h.loc[last_idx, 'Close'] = ohlc.get('ltp', ohlc.get('close', 0))
+                    data_1h.loc[last_idx, 'Volume'] = ohlc.get('tradeVolume', 0)
+                self._data_1h = data_1h
+                self._update_market_data_state()
             
             logger.info("Market data refreshed successfully")
     
+    def _remember_ltp(self, quote: Dict) -> None:
+        """Keep the latest NIFTY LTP from a quote so the UI can read it without a fetch."""
+        value = quote.get('ltp') or quote.get('close')
+        try:
+            if value is not None:
+                self._last_ltp = float(value)
+        except (TypeError, ValueError):
+            pass
+
+    def get_last_ltp(self) -> Optional[float]:
+        """
+        Last NIFTY LTP seen by refresh_data()/fetch_ohlc().
+
+        Returns:
+            Cached LTP or None if nothing has been fetched yet
+        """
+        return self._last_ltp
+
+    def data_fingerprint(self) -> Optional[int]:
+        """
+        Cheap content hash of the aggregated 15m/1h buffers.
+
+        Used by the dashboard to tell whether a refresh actually changed anything.
+        Every row (index included) is hashed, so backfilled or corrected
+        earlier candles and length changes are detected, not just the last row.
+        """
+        frames = (self._data_15m, self._data_1h)
+        if all(df.empty for df in frames):
+            return None
+        try:
+            return hash(tuple(
+                (len(df), int(pd.util.hash_pandas_object(df, index=True).to_numpy().sum()))
+                for df in frames
+            ))
+        except Exception as e:
+            logger.debug(f"Could not fingerprint market data: {e}")
+            return None
+
     def get_candle_status(self, timeframe: str = "15m") -> Dict:
         """
         Get status of current candle (complete or incomplete).
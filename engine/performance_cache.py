@@ -2,6 +2,7 @@
 Performance optimizations and caching layer
 """
 
+import threading
 import time
 from typing import Dict, Any, Optional, Callable
 from datetime import datetime, timedelta
@@ -69,6 +70,42 @@ class TTLCache:
             del self._cache[key]
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket for keeping outbound API calls under a posted rate.
+    """
+    
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        """
+        Initialize token bucket.
+        
+        Args:
+            rate_per_sec: Tokens added per second (sustained call rate)
+            burst: Bucket capacity (calls allowed back-to-back)
+        """
+        self.rate = float(rate_per_sec)
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def try_acquire(self) -> bool:
+        """
+        Take one token if available, without blocking.
+        
+        Returns:
+            True if the call may proceed, False if it is over budget
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
 class StateCache:
     """
     Caching layer for StateStore operations.
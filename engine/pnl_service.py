@@ -44,6 +44,26 @@ def _fifo_realized_pnl(trades: List[Trade]) -> Decimal:
     return realized
 
 
+def max_trade_id(org_id: str, user_id: str) -> int:
+    """
+    Highest trade id for a tenant. Trades are insert-only, so this moves exactly
+    when a new execution is written and works as a cheap cache-invalidation token.
+    """
+    sess_gen = get_session()
+    db = next(sess_gen)
+    try:
+        stmt = select(func.max(Trade.id)).where(Trade.org_id == org_id, Trade.user_id == user_id)
+        return int(db.execute(stmt).scalar() or 0)
+    except OperationalError:
+        # Table not created yet - nothing to version
+        return 0
+    finally:
+        try:
+            next(sess_gen)
+        except StopIteration:
+            pass
+
+
 def compute_realized_pnl(org_id: str, user_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Dict:
     """
     Realized P&L for a tenant over optional date range using FIFO per symbol.
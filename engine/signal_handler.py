@@ -376,6 +376,11 @@ class SignalHandler:
         """
         return [s for s in self.active_signals if s.get('status') == 'active']
     
+    @property
+    def active_signals_count(self) -> int:
+        """Number of active signals, counted without building the filtered list."""
+        return sum(1 for s in self.active_signals if s.get('status') == 'active')
+    
     def mark_signal_executed(self, signal: Dict, order_id: str):
         """
         Mark signal as executed with order ID.
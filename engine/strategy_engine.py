@@ -52,24 +52,31 @@ def _find_mother_index(data_1h: pd.DataFrame, inside_bar_idx: int) -> Optional[i
     if inside_bar_idx <= 0 or inside_bar_idx >= len(data_1h):
         return None
 
+    highs = data_1h['High'].to_numpy()
+    lows = data_1h['Low'].to_numpy()
     mother_idx = inside_bar_idx - 1
-    mother_high = data_1h['High'].iloc[mother_idx]
-    mother_low = data_1h['Low'].iloc[mother_idx]
-
-    while mother_idx > 0:
-        prev_idx = mother_idx - 1
-        prev_high = data_1h['High'].iloc[prev_idx]
-        prev_low = data_1h['Low'].iloc[prev_idx]
-        if mother_high <= prev_high and mother_low >= prev_low:
-            mother_idx = prev_idx
-            mother_high = prev_high
-            mother_low = prev_low
-        else:
-            break
+    while mother_idx > 0 and highs[mother_idx] <= highs[mother_idx - 1] and lows[mother_idx] >= lows[mother_idx - 1]:
+        mother_idx -= 1
 
     return mother_idx
 
 
+def inside_bar_mask(data_1h: pd.DataFrame) -> np.ndarray:
+    """
+    Boolean mask of candles strictly inside the previous candle's range.
+
+    ``mask[i]`` is True when High[i] < High[i-1] and Low[i] > Low[i-1]; the first
+    candle has no reference and is always False. This is the raw geometric test,
+    before detect_inside_bar() applies its range-tightening preference.
+    """
+    highs = data_1h['High'].to_numpy()
+    lows = data_1h['Low'].to_numpy()
+    mask = np.zeros(len(highs), dtype=bool)
+    if len(highs) > 1:
+        mask[1:] = (highs[1:] < highs[:-1]) & (lows[1:] > lows[:-1])
+    return mask
+
+
 def find_mother_index(data_1h: pd.DataFrame, inside_bar_idx: int) -> Optional[int]:
     """
     Public wrapper to determine the mother candle index for a given inside bar.
@@ -110,31 +117,41 @@ def detect_inside_bar(data_1h: pd.DataFrame, tighten_signal: bool = True) -> Lis
     latest_inside_bar_idx = None
     latest_inside_bar_range = None
     
+    highs = data_1h['High'].to_numpy()
+    lows = data_1h['Low'].to_numpy()
+    inside_mask = inside_bar_mask(data_1h)
+    
+    # Get timestamps for logging
+    # Handle Date column or Date index
+    if 'Date' in data_1h.columns:
+        times = data_1h['Date']
+    elif data_1h.index.name == 'Date' or isinstance(data_1h.index, pd.DatetimeIndex):
+        times = data_1h.index.to_series()
+    else:
+        times = None
+    
+    def _candle_time(idx: int):
+        return times.iloc[idx] if times is not None else f"Candle_{idx}"
+    
+    # Log reference candle (first candle)
+    logger.info(f"📊 Reference candle: {_candle_time(0)} => High: {highs[0]:.2f}, Low: {lows[0]:.2f}")
+    
     # --- [Enhancement: Fix 1H Inside Bar Live Lag + NSE Candle Alignment - 2025-11-06] ---
     # Changed iteration start from index 2 to index 1 to check latest candle pair immediately
     # This allows detection of inside bars on the most recent candle pair without waiting
-    for i in range(1, len(data_1h)):
+    # The inside test itself is vectorised (inside_mask); unless per-candle DEBUG
+    # logging is on, only the inside candles need the tightening walk below.
+    if logger.isEnabledFor(logging.DEBUG):
+        candidates = range(1, len(data_1h))
+    else:
+        candidates = np.flatnonzero(inside_mask).tolist()
+    for i in candidates:
         # Check if current candle is inside the previous candle (i-1)
-        current_high = data_1h['High'].iloc[i]
-        current_low = data_1h['Low'].iloc[i]
-        prev_high = data_1h['High'].iloc[i-1]
-        prev_low = data_1h['Low'].iloc[i-1]
-        
-        # Get timestamps for logging
-        # Handle Date column or Date index
-        if 'Date' in data_1h.columns:
-            current_time = data_1h['Date'].iloc[i]
-            prev_time = data_1h['Date'].iloc[i-1]
-        elif data_1h.index.name == 'Date' or isinstance(data_1h.index, pd.DatetimeIndex):
-            current_time = data_1h.index[i]
-            prev_time = data_1h.index[i-1]
-        else:
-            current_time = f"Candle_{i}"
-            prev_time = f"Candle_{i-1}"
-        
-        # Log reference candle (previous candle)
-        if i == 1:
-            logger.info(f"📊 Reference candle: {prev_time} => High: {prev_high:.2f}, Low: {prev_low:.2f}")
+        current_high = highs[i]
+        current_low = lows[i]
+        prev_high = highs[i-1]
+        prev_low = lows[i-1]
+        current_time = _candle_time(i)
         
         # Inside bar condition: 
         # The CURRENT candle (i) must be COMPLETELY inside the PREVIOUS candle (i-1)
@@ -145,7 +162,7 @@ def detect_inside_bar(data_1h: pd.DataFrame, tighten_signal: bool = True) -> Lis
         
         high_check = current_high < prev_high  # Strictly less
         low_check = current_low > prev_low     # Strictly greater
-        is_inside = high_check and low_check
+        is_inside = bool(inside_mask[i])
         
         logger.debug(
             f"Candle at {current_time} => "
@@ -164,19 +181,16 @@ def detect_inside_bar(data_1h: pd.DataFrame, tighten_signal: bool = True) -> Lis
             # This ensures we use today's inside bars for live trading, not old ones
             should_add = True
             if tighten_signal and latest_inside_bar_idx is not None:
-                prev_inside_high = data_1h['High'].iloc[latest_inside_bar_idx]
-                prev_inside_low = data_1h['Low'].iloc[latest_inside_bar_idx]
+                prev_inside_high = highs[latest_inside_bar_idx]
+                prev_inside_low = lows[latest_inside_bar_idx]
                 prev_range_width = prev_inside_high - prev_inside_low
                 
                 # Get dates for comparison
                 prev_inside_date = None
                 current_inside_date = None
                 
-                if 'Date' in data_1h.columns:
-                    prev_inside_date = data_1h['Date'].iloc[latest_inside_bar_idx]
-                    current_inside_date = current_time
-                elif isinstance(data_1h.index, pd.DatetimeIndex):
-                    prev_inside_date = data_1h.index[latest_inside_bar_idx]
+                if 'Date' in data_1h.columns or isinstance(data_1h.index, pd.DatetimeIndex):
+                    prev_inside_date = times.iloc[latest_inside_bar_idx]
                     current_inside_date = current_time
                 
                 # Check if dates are available and can be compared
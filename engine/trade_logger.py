@@ -3,11 +3,14 @@ Trade Logger for comprehensive trade logging to CSV
 """
 
 import csv
+import io
 import os
+from collections import deque
 from datetime import datetime
 from typing import Dict, Optional
 from decimal import Decimal, InvalidOperation
 
+import numpy as np
 import pandas as pd
 
 # Optional database imports - only used if SQLAlchemy is available
@@ -266,10 +269,15 @@ class TradeLogger:
             except StopIteration:
                 pass
     
-    def get_all_trades(self) -> pd.DataFrame:
+    def get_all_trades(self, parse_timestamps: bool = False) -> pd.DataFrame:
         """
         Read all trades from CSV file.
         
+        Args:
+            parse_timestamps: Return ``timestamp`` as datetime64 (unparseable
+                values become NaT). Leave off when the frame is written back,
+                so the log keeps its ISO-8601 strings.
+        
         Returns:
             DataFrame with all trade records
         """
@@ -277,12 +285,112 @@ class TradeLogger:
             return pd.DataFrame()
         
         try:
-            df = pd.read_csv(self.trades_file)
-            return self._canonicalize_dataframe(df)
+            df = self._canonicalize_dataframe(pd.read_csv(self.trades_file))
+            if parse_timestamps and 'timestamp' in df.columns:
+                df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', errors='coerce')
+            return df
         except Exception as e:
             print(f"Error reading trades: {e}")
             return pd.DataFrame()
     
+    def get_trade_count(self) -> int:
+        """
+        Count logged trades without loading them into a DataFrame.
+        
+        Returns:
+            Number of trade rows (header and blank lines excluded)
+        """
+        if not os.path.exists(self.trades_file):
+            return 0
+        
+        try:
+            with open(self.trades_file, 'r', newline='') as f:
+                rows = sum(1 for row in csv.reader(f) if row)
+            return max(rows - 1, 0)
+        except Exception as e:
+            print(f"Error counting trades: {e}")
+            return 0
+    
+    def get_recent_trades(self, n: int = 5) -> pd.DataFrame:
+        """
+        Read the last ``n`` trades without building a DataFrame of the whole log.
+        
+        Args:
+            n: Number of trailing trade rows to return
+        
+        Returns:
+            DataFrame with the most recently logged trades, in log order
+        """
+        if n <= 0 or not os.path.exists(self.trades_file):
+            return pd.DataFrame()
+        
+        try:
+            with open(self.trades_file, 'r', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if not header:
+                    return pd.DataFrame()
+                tail_rows = deque((row for row in reader if row), maxlen=n)
+            # Round-trip through read_csv so dtypes match get_all_trades()
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(header)
+            writer.writerows(tail_rows)
+            buffer.seek(0)
+            return self._canonicalize_dataframe(pd.read_csv(buffer))
+        except Exception as e:
+            print(f"Error reading recent trades: {e}")
+            return pd.DataFrame()
+    
+    def get_pnl_series_sorted(self, since: Optional[datetime] = None) -> np.ndarray:
+        """
+        P&L of every trade with a recorded P&L, ordered by timestamp.
+        
+        Only the timestamp and pnl columns are parsed.
+        
+        Args:
+            since: Keep only trades stamped at or after this time (naive times
+                are compared in the log's own clock); None keeps every trade
+        
+        Returns:
+            float64 array of per-trade P&L (empty when nothing is logged)
+        """
+        if not os.path.exists(self.trades_file):
+            return np.empty(0, dtype=np.float64)
+        
+        try:
+            df = pd.read_csv(self.trades_file, usecols=lambda col: col in ('timestamp', 'pnl'))
+        except Exception as e:
+            print(f"Error reading trade P&L: {e}")
+            return np.empty(0, dtype=np.float64)
+        if 'pnl' not in df.columns:
+            return np.empty(0, dtype=np.float64)
+        if since is not None:
+            if 'timestamp' not in df.columns:
+                return np.empty(0, dtype=np.float64)
+            stamps = pd.to_datetime(df['timestamp'], format='ISO8601', errors='coerce')
+            cutoff = pd.Timestamp(since)
+            if stamps.dt.tz is not None and cutoff.tzinfo is None:
+                cutoff = cutoff.tz_localize(stamps.dt.tz)
+            df = df[(stamps >= cutoff).to_numpy(dtype=bool, na_value=False)]
+        if 'timestamp' in df.columns:
+            df = df.sort_values('timestamp', kind='stable')
+        pnl = pd.to_numeric(df['pnl'], errors='coerce').to_numpy(dtype=np.float64)
+        return pnl[~np.isnan(pnl)]
+    
+    def get_log_version(self) -> tuple:
+        """
+        Cheap change token for the trade log, suitable as a cache key.
+        
+        Returns:
+            (mtime_ns, size) of the CSV file, or (0, 0) when it does not exist
+        """
+        try:
+            stat = os.stat(self.trades_file)
+        except OSError:
+            return (0, 0)
+        return (stat.st_mtime_ns, stat.st_size)
+    
     def get_open_trades(self) -> pd.DataFrame:
         """
         Get all open/pending trades.
@@ -297,6 +405,28 @@ class TradeLogger:
         open_statuses = ['open', 'pending']
         return df[df['status'].isin(open_statuses)]
     
+    def get_latest_open_trade(self) -> Optional[Dict]:
+        """
+        Get the most recent open/pending trade.
+        
+        Picks the row with the latest timestamp in a single pass instead of
+        copying and sorting the whole open-trades frame.
+        
+        Returns:
+            Trade record as a dict, or None when nothing is open
+        """
+        open_trades = self.get_open_trades()
+        if open_trades.empty:
+            return None
+        if 'timestamp' in open_trades.columns:
+            timestamps = open_trades['timestamp']
+            if not pd.api.types.is_datetime64_any_dtype(timestamps):
+                # Rows are written as ISO-8601 strings, so the format hint skips inference
+                timestamps = pd.to_datetime(timestamps, format='ISO8601', cache=True, errors='coerce')
+            if timestamps.notna().any():
+                return open_trades.loc[timestamps.idxmax()].to_dict()
+        return open_trades.iloc[-1].to_dict()
+    
     def get_trade_stats(self) -> Dict:
         """
         Calculate trade statistics.
@@ -0,0 +1,21 @@
+from engine import performance_cache
+from engine.performance_cache import TokenBucket
+
+
+def test_token_bucket_throttles_burst_and_refills(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(performance_cache.time, "monotonic", lambda: now[0])
+
+    bucket = TokenBucket(rate_per_sec=2.0, burst=2)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    now[0] += 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    now[0] += 10.0
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
@@ -1,3 +1,6 @@
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
 
 from engine.trade_logger import TradeLogger
@@ -44,3 +47,107 @@ def test_update_trade_exit_handles_numeric_order_id(tmp_path):
     assert updated.loc[0, "status"] == "closed"
     assert updated.loc[0, "post_outcome"] == "manual_exit"
 
+
+
+def test_get_latest_open_trade_picks_newest_open_row(tmp_path):
+    trades_path = tmp_path / "trades.csv"
+    base = {
+        "symbol": "NIFTY",
+        "tradingsymbol": "NIFTY25NOV2526100CE",
+        "strike": 26100,
+        "direction": "CE",
+        "entry": 143.0,
+        "sl": 113.0,
+        "tp": 197.0,
+        "exit": "",
+        "pnl": "",
+        "pre_reason": "",
+        "post_outcome": "",
+        "quantity": 1,
+    }
+    df = pd.DataFrame(
+        [
+            {**base, "timestamp": "2025-11-20T11:00:00", "order_id": 2, "status": "open"},
+            {**base, "timestamp": "2025-11-20T12:00:00", "order_id": 3, "status": "closed"},
+            {**base, "timestamp": "2025-11-20T10:00:00", "order_id": 1, "status": "open"},
+        ]
+    )
+    df.to_csv(trades_path, index=False)
+
+    logger = TradeLogger(trades_file=str(trades_path))
+
+    latest = logger.get_latest_open_trade()
+    assert latest is not None
+    assert int(latest["order_id"]) == 2
+
+    df["status"] = "closed"
+    df.to_csv(trades_path, index=False)
+    assert logger.get_latest_open_trade() is None
+
+
+def test_get_trade_count_matches_logged_rows(tmp_path):
+    trades_path = tmp_path / "trades.csv"
+    logger = TradeLogger(trades_file=str(trades_path))
+    assert logger.get_trade_count() == 0
+
+    pd.DataFrame(
+        [
+            {"timestamp": "2025-11-20T10:18:38", "symbol": "NIFTY", "status": "open",
+             "pre_reason": "Inside Bar 1H breakout,\nCE side"},
+            {"timestamp": "2025-11-20T11:05:00", "symbol": "NIFTY", "status": "closed",
+             "pre_reason": "Inside Bar 1H breakout"},
+        ]
+    ).to_csv(trades_path, index=False)
+
+    assert logger.get_trade_count() == len(logger.get_all_trades()) == 2
+
+
+def test_get_recent_trades_returns_log_tail(tmp_path):
+    trades_path = tmp_path / "trades.csv"
+    logger = TradeLogger(trades_file=str(trades_path))
+    assert logger.get_recent_trades(5).empty
+
+    for i in range(8):
+        logger.log_trade({"timestamp": f"2025-11-20T1{i}:00:00", "order_id": i, "pnl": i * 10.0, "status": "closed"})
+
+    recent = logger.get_recent_trades(5)
+    expected = logger.get_all_trades().tail(5).reset_index(drop=True)
+    pd.testing.assert_frame_equal(recent, expected)
+
+
+def test_get_pnl_series_sorted_orders_by_timestamp_and_skips_blanks(tmp_path):
+    trades_path = tmp_path / "trades.csv"
+    logger = TradeLogger(trades_file=str(trades_path))
+    assert logger.get_pnl_series_sorted().size == 0
+
+    logger.log_trade({"timestamp": "2025-11-20T12:00:00", "pnl": 30.0})
+    logger.log_trade({"timestamp": "2025-11-20T10:00:00", "pnl": -10.0})
+    logger.log_trade({"timestamp": "2025-11-20T11:00:00", "pnl": ""})
+
+    np.testing.assert_array_equal(logger.get_pnl_series_sorted(), np.array([-10.0, 30.0]))
+
+
+def test_get_pnl_series_sorted_windows_by_since(tmp_path):
+    trades_path = tmp_path / "trades.csv"
+    logger = TradeLogger(trades_file=str(trades_path))
+
+    logger.log_trade({"timestamp": "2025-11-01T10:00:00", "pnl": 50.0})
+    logger.log_trade({"timestamp": "2025-11-20T12:00:00", "pnl": 30.0})
+    logger.log_trade({"timestamp": "2025-11-20T10:00:00", "pnl": -10.0})
+
+    windowed = logger.get_pnl_series_sorted(since=datetime(2025, 11, 15))
+    np.testing.assert_array_equal(windowed, np.array([-10.0, 30.0]))
+    assert logger.get_pnl_series_sorted(since=datetime(2025, 12, 1)).size == 0
+
+
+def test_get_all_trades_parses_timestamps_on_request(tmp_path):
+    trades_path = tmp_path / "trades.csv"
+    logger = TradeLogger(trades_file=str(trades_path))
+    logger.log_trade({"timestamp": "2025-11-20T10:18:38.937615", "status": "open"})
+    logger.log_trade({"timestamp": "not-a-time", "status": "open"})
+
+    assert not pd.api.types.is_datetime64_any_dtype(logger.get_all_trades()["timestamp"])
+    parsed = logger.get_all_trades(parse_timestamps=True)["timestamp"]
+    assert pd.api.types.is_datetime64_any_dtype(parsed)
+    assert parsed.iloc[0] == pd.Timestamp("2025-11-20T10:18:38.937615")
+    assert pd.isna(parsed.iloc[1])
@@ -2,7 +2,6 @@
 Utility script to generate password hash for streamlit-authenticator
 """
 
-import streamlit_authenticator as stauth
 import getpass
 
 
@@ -24,6 +23,8 @@ def generate_password_hash(password: str = None) -> str:
             print("❌ Passwords do not match!")
             return None
     
+    import streamlit_authenticator as stauth
+    
     # New API: Hasher() with no args, then call hash() method
     hasher = stauth.Hasher()
     hashed = hasher.hash(password)